@@ -1,6 +1,7 @@
 DB_PATH = 'ncaa.db'
 MIN_YEAR = 2021
 MAX_YEAR = 2025
+EXPORT_DIR = 'exports'
 
 
 
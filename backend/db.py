@@ -1,10 +1,78 @@
+import os
 import sqlite3
+import threading
+from functools import wraps
 from config import DB_PATH
 
+_trace_callback = None
+_data_version_override = None
+
 
 def get_db_connection():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    if _trace_callback is not None:
+        conn.set_trace_callback(_trace_callback)
     return conn
 
 
+def set_trace_callback(callback):
+    """
+    Pass every SQL statement run on connections opened from now on to
+    callback (None to stop), e.g. to collect query plans.
+    """
+    global _trace_callback
+    _trace_callback = callback
+
+
+def set_data_version(version):
+    """
+    Report version from get_data_version() instead of the database's own
+    (None to stop), e.g. to start every request with cold per-data caches.
+    """
+    global _data_version_override
+    _data_version_override = version
+
+
+def get_data_version():
+    """
+    Identify the deployed ncaa.db by its mtime and size. Changes whenever a
+    rebuilt database is swapped in, so it can key per-data caches.
+    """
+    if _data_version_override is not None:
+        return _data_version_override
+    try:
+        stat = os.stat(DB_PATH)
+    except OSError:
+        return 'missing'
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def cached_per_data_version(f):
+    """
+    Memoize f(*args) in process memory until the data version changes.
+    Arguments must be hashable; intended for small, bounded key spaces.
+    """
+    cache = {}
+    state = {'version': None}
+    lock = threading.Lock()
+
+    @wraps(f)
+    def wrapper(*args):
+        version = get_data_version()
+        with lock:
+            if state['version'] != version:
+                cache.clear()
+                state['version'] = version
+            if args in cache:
+                return cache[args]
+
+        value = f(*args)
+
+        with lock:
+            if state['version'] == version:
+                cache[args] = value
+        return value
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
@@ -0,0 +1,549 @@
+"""
+Derived tables built from the raw ncaa.db tables at load time.
+
+Each builder drops and recreates its table (plus indexes) inside the given
+connection, so rerunning after a data refresh is always safe.
+"""
+import hashlib
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+
+from pbp_classifier import classify_descriptions, spray_direction
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+PBP_SPRAY_FLAGS = [
+    'is_ground', 'is_fly', 'is_lined', 'is_popped',
+    'is_single', 'is_double', 'is_triple', 'is_hr',
+    'is_bb', 'is_hbp', 'is_sf',
+]
+
+
+def _hand(value):
+    hand = (value or '').strip().upper()[:1]
+    return hand if hand in ('L', 'R') else None
+
+
+def build_pbp_spray(conn):
+    """
+    One row per classified pbp description with the spray zone, batted-ball
+    and outcome flags, so spray charts can be served from a GROUP BY.
+    """
+    source_select = """
+        SELECT
+            p.batter_id,
+            p.year,
+            p.division,
+            (SELECT r.team_name FROM rosters r
+             WHERE r.player_id = p.batter_id AND r.year = p.year AND r.division = p.division
+             LIMIT 1) AS team_name,
+            (SELECT r.throws FROM rosters r
+             WHERE r.player_id = p.pitcher_id AND r.year = p.year AND r.division = p.division
+             LIMIT 1) AS pitcher_hand,
+            p.woba,
+            (SELECT r.bats FROM rosters r
+             WHERE r.player_id = p.batter_id AND r.year = p.year AND r.division = p.division
+             LIMIT 1) AS bats,
+            p.description
+        FROM pbp p
+        WHERE p.batter_id IS NOT NULL
+    """
+
+    conn.execute("DROP TABLE IF EXISTS pbp_spray")
+    # Clone the id/year/division column types from pbp so lookups compare the
+    # same way they do against the raw table.
+    conn.execute(f"""
+        CREATE TABLE pbp_spray AS
+        SELECT batter_id, year, division, team_name, pitcher_hand, woba
+        FROM ({source_select})
+        WHERE 0
+    """)
+    for column in ['zone_key TEXT', 'field_zone TEXT', 'direction TEXT', 'is_pa INTEGER']:
+        conn.execute(f"ALTER TABLE pbp_spray ADD COLUMN {column}")
+    for flag in PBP_SPRAY_FLAGS:
+        conn.execute(f"ALTER TABLE pbp_spray ADD COLUMN {flag} INTEGER")
+
+    columns = ['batter_id', 'year', 'division', 'team_name', 'pitcher_hand', 'woba',
+               'zone_key', 'field_zone', 'direction', 'is_pa'] + PBP_SPRAY_FLAGS
+    insert = f"INSERT INTO pbp_spray ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    source = conn.cursor()
+    source.execute(source_select)
+    total = 0
+    while True:
+        rows = source.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        classified = classify_descriptions([row[7] for row in rows])
+        batch = []
+        for row, play_class in zip(rows, classified):
+            if play_class is None:
+                continue
+            batter_id, year, division, team_name, pitcher_throws, woba, bats, _ = row
+            batch.append((
+                batter_id, year, division, team_name, _hand(pitcher_throws), woba,
+                play_class['zone_key'], play_class['field_zone'],
+                spray_direction(play_class['zone_key'], bats),
+                int(woba is not None),
+                *(int(play_class[flag]) for flag in PBP_SPRAY_FLAGS),
+            ))
+        conn.executemany(insert, batch)
+        total += len(batch)
+
+    conn.execute("CREATE INDEX idx_pbp_spray_batter_year_div ON pbp_spray(batter_id, year, division)")
+    conn.execute("CREATE INDEX idx_pbp_spray_team_year_div ON pbp_spray(team_name, year, division)")
+    logger.info(f"Built pbp_spray ({total} rows)")
+    return total
+
+
+def build_player_index(conn):
+    """
+    One row per player for /api/players: latest team, position and
+    conference plus every roster year, keyed for name-ordered pagination.
+    Players with no name on any roster row are left out, since the
+    (player_name, player_id) keyset can't page past a NULL name.
+    """
+    conn.execute("DROP TABLE IF EXISTS player_index")
+    conn.execute("""
+        CREATE TABLE player_index AS
+        WITH LatestPlayeryear AS (
+            SELECT
+                player_id,
+                MAX(year) as latest_year
+            FROM rosters
+            GROUP BY player_id
+        )
+        SELECT
+            r1.player_id,
+            COALESCE(r1.player_name, MAX(r1.player_name)) AS player_name,
+            UPPER(r2.position) AS position,
+            r2.team_name,
+            r2.conference,
+            r2.division,
+            MIN(r1.year) as min_year,
+            MAX(r1.year) as max_year,
+            JSON_GROUP_ARRAY(DISTINCT r1.year) as years
+        FROM rosters r1
+        LEFT JOIN (
+            SELECT r.player_id, r.team_name, r.conference, r.division, r.year, r.position
+            FROM rosters r
+            JOIN LatestPlayeryear lpy ON r.player_id = lpy.player_id AND r.year = lpy.latest_year
+        ) r2 ON r1.player_id = r2.player_id
+        GROUP BY r1.player_id
+        HAVING MAX(r1.player_name) IS NOT NULL
+    """)
+    conn.execute("CREATE UNIQUE INDEX idx_player_index_player ON player_index(player_id)")
+    conn.execute("CREATE INDEX idx_player_index_name_player ON player_index(player_name, player_id)")
+    total = conn.execute("SELECT COUNT(*) FROM player_index").fetchone()[0]
+    logger.info(f"Built player_index ({total} rows)")
+    return total
+
+
+def build_player_latest(conn):
+    """
+    One row per player from their latest roster year: team, conference,
+    division, org, bio fields, the newest usable headshot from any year, the
+    org's team colors and whether they ever pitched, so the profile header
+    is a single key read.
+    """
+    conn.execute("DROP TABLE IF EXISTS player_latest")
+    conn.execute("""
+        CREATE TABLE player_latest AS
+        WITH ranked AS (
+            SELECT
+                r.*,
+                r.rowid AS roster_rowid,
+                ROW_NUMBER() OVER (PARTITION BY r.player_id ORDER BY r.year DESC) AS rn
+            FROM rosters r
+            WHERE r.player_id IS NOT NULL
+        ),
+        headshots AS (
+            SELECT
+                player_id,
+                img_url,
+                ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY year DESC) AS rn
+            FROM rosters
+            WHERE img_url IS NOT NULL
+              AND TRIM(img_url) <> ''
+              AND LOWER(TRIM(img_url)) NOT IN ('-', 'nan', 'none', 'null')
+        ),
+        colors AS (
+            SELECT org_id, colors_hex
+            FROM (
+                SELECT org_id, colors_hex, ROW_NUMBER() OVER (PARTITION BY org_id ORDER BY rowid) AS rn
+                FROM team_information
+            )
+            WHERE rn = 1
+        )
+        SELECT
+            r.player_id,
+            r.player_name,
+            r.team_name,
+            r.conference,
+            r.division,
+            r.org_id,
+            r.height,
+            r.bats,
+            r.throws,
+            r.hometown,
+            r.high_school,
+            r.position,
+            r.year,
+            h.img_url AS headshot_url,
+            c.colors_hex,
+            EXISTS (SELECT 1 FROM pitching p WHERE p.player_id = r.player_id) AS is_pitcher
+        FROM ranked r
+        LEFT JOIN headshots h ON h.player_id = r.player_id AND h.rn = 1
+        LEFT JOIN colors c ON c.org_id = r.org_id
+        WHERE r.rn = 1
+        ORDER BY r.roster_rowid
+    """)
+    conn.execute("CREATE UNIQUE INDEX idx_player_latest_player ON player_latest(player_id)")
+    total = conn.execute("SELECT COUNT(*) FROM player_latest").fetchone()[0]
+    logger.info(f"Built player_latest ({total} rows)")
+    return total
+
+
+def build_value_leaderboard(conn):
+    """
+    Combined batting + pitching value per player-season (division, year)
+    with the totals and WAR percentiles precomputed, so the value
+    leaderboard is an index scan and a single player an index probe.
+    """
+    conn.execute("DROP TABLE IF EXISTS value_leaderboard")
+    conn.execute("""
+        CREATE TABLE value_leaderboard AS
+        WITH batting_data AS (
+            SELECT
+                player_id,
+                player_name,
+                team_name,
+                conference,
+                division,
+                year,
+                pa,
+                war as batting_war,
+                wpa as batting_wpa,
+                wpa_li as batting_wpa_li,
+                rea as batting_rea,
+                clutch as batting_clutch
+            FROM batting
+        ),
+        pitching_data AS (
+            SELECT
+                player_id,
+                player_name,
+                team_name,
+                conference,
+                division,
+                year,
+                ip,
+                war as pitching_war,
+                pwpa as pitching_wpa,
+                pwpa_li as pitching_wpa_li,
+                prea as pitching_rea,
+                clutch as pitching_clutch
+            FROM pitching
+        ),
+        combined AS (
+            SELECT
+                COALESCE(b.player_id, p.player_id) as player_id,
+                COALESCE(b.player_name, p.player_name) as player_name,
+                COALESCE(b.team_name, p.team_name) as team_name,
+                COALESCE(b.conference, p.conference) as conference,
+                COALESCE(b.division, p.division) as division,
+                COALESCE(b.year, p.year) as year,
+                COALESCE(b.pa, 0) as pa,
+                COALESCE(p.ip, 0) as ip,
+                COALESCE(b.batting_war, 0) as batting_war,
+                COALESCE(p.pitching_war, 0) as pitching_war,
+                COALESCE(b.batting_wpa, 0) as batting_wpa,
+                COALESCE(p.pitching_wpa, 0) as pitching_wpa,
+                COALESCE(b.batting_wpa_li, 0) as batting_wpa_li,
+                COALESCE(p.pitching_wpa_li, 0) as pitching_wpa_li,
+                COALESCE(b.batting_rea, 0) as batting_rea,
+                COALESCE(p.pitching_rea, 0) as pitching_rea,
+                COALESCE(b.batting_clutch, 0) as batting_clutch,
+                COALESCE(p.pitching_clutch, 0) as pitching_clutch
+            FROM batting_data b
+            FULL OUTER JOIN pitching_data p
+                ON b.player_id = p.player_id
+                AND b.year = p.year
+                AND b.division = p.division
+        )
+        SELECT
+            player_id, player_name, team_name, conference, division, year, pa, ip,
+            batting_war, pitching_war,
+            ROUND(batting_war + pitching_war, 1) as total_war,
+            batting_wpa, pitching_wpa,
+            ROUND(batting_wpa + pitching_wpa, 1) as total_wpa,
+            batting_wpa_li, pitching_wpa_li,
+            ROUND(batting_wpa_li + pitching_wpa_li, 1) as total_wpa_li,
+            batting_rea, pitching_rea,
+            ROUND(batting_rea + pitching_rea, 1) as total_rea,
+            batting_clutch, pitching_clutch,
+            ROUND(batting_clutch + pitching_clutch, 1) as total_clutch,
+            PERCENT_RANK() OVER (PARTITION BY division, year ORDER BY batting_war) * 100
+                as batting_war_percentile,
+            PERCENT_RANK() OVER (PARTITION BY division, year ORDER BY pitching_war) * 100
+                as pitching_war_percentile,
+            PERCENT_RANK() OVER (PARTITION BY division, year ORDER BY ROUND(batting_war + pitching_war, 1)) * 100
+                as total_war_percentile
+        FROM combined
+    """)
+    conn.execute(
+        "CREATE INDEX idx_value_leaderboard_div_year_total_war "
+        "ON value_leaderboard(division, year, total_war DESC)"
+    )
+    conn.execute("CREATE INDEX idx_value_leaderboard_player ON value_leaderboard(player_id, division, year)")
+    total = conn.execute("SELECT COUNT(*) FROM value_leaderboard").fetchone()[0]
+    logger.info(f"Built value_leaderboard ({total} rows)")
+    return total
+
+
+ROLLING_SOURCES = {
+    'batter': 'batting',
+    'pitcher': 'pitching',
+}
+
+
+def rolling_windows(conn, source):
+    """Window sizes present in rolling_{source}, from its "<window>_now" columns."""
+    names = [row[1] for row in conn.execute(f"PRAGMA table_info(rolling_{source})")]
+    return sorted(int(m.group(1)) for m in (re.fullmatch(r'(\d+)_now', name) for name in names) if m)
+
+
+def build_rolling_leaderboard(conn):
+    """
+    Long-format rolling wOBA leaderboard: one row per player type, division,
+    window and player, joined to the player's latest season in that
+    division and its team's org_id. New windows in the wide rolling_*
+    tables show up here without schema changes.
+    """
+    conn.execute("DROP TABLE IF EXISTS rolling_leaderboard")
+    conn.execute("""
+        CREATE TABLE rolling_leaderboard (
+            player_type TEXT,
+            division INTEGER,
+            window INTEGER,
+            player_id TEXT,
+            player_name TEXT,
+            team_name TEXT,
+            conference TEXT,
+            team_org_id INTEGER,
+            woba_now REAL,
+            woba_then REAL,
+            delta REAL
+        )
+    """)
+
+    for player_type, source in ROLLING_SOURCES.items():
+        for window in rolling_windows(conn, source):
+            conn.execute(f"""
+                INSERT INTO rolling_leaderboard
+                WITH latest_stats AS (
+                    SELECT s.*
+                    FROM {source} s
+                    JOIN (
+                        SELECT player_id, division, MAX(year) AS max_year
+                        FROM {source}
+                        GROUP BY player_id, division
+                    ) m ON m.player_id = s.player_id AND m.max_year = s.year AND m.division = s.division
+                ),
+                team_org AS (
+                    SELECT team_name, year, division, MAX(org_id) AS org_id
+                    FROM rosters
+                    GROUP BY team_name, year, division
+                )
+                SELECT
+                    ?, s.division, ?, r.player_id, s.player_name, s.team_name, s.conference, t.org_id,
+                    r."{window}_now", r."{window}_then", r."{window}_delta"
+                FROM rolling_{source} r
+                JOIN latest_stats s ON r.player_id = s.player_id
+                LEFT JOIN team_org t
+                    ON t.team_name = s.team_name
+                    AND t.year = s.year
+                    AND t.division = s.division
+                WHERE r.player_id IS NOT NULL
+                    AND r."{window}_now" IS NOT NULL
+                    AND r."{window}_then" IS NOT NULL
+            """, (player_type, window))
+
+    conn.execute(
+        "CREATE INDEX idx_rolling_leaderboard_type_div_window_delta "
+        "ON rolling_leaderboard(player_type, division, window, delta)"
+    )
+    total = conn.execute("SELECT COUNT(*) FROM rolling_leaderboard").fetchone()[0]
+    logger.info(f"Built rolling_leaderboard ({total} rows)")
+    return total
+
+
+def build_game_summary(conn):
+    """
+    One row per game: teams, final scores, org ids, attendance and date,
+    indexed for the daily scoreboard.
+    """
+    conn.execute("DROP TABLE IF EXISTS game_summary")
+    conn.execute("""
+        CREATE TABLE game_summary AS
+        WITH games AS (
+            SELECT
+                contest_id,
+                year,
+                division,
+                date AS game_date,
+                home_team,
+                away_team,
+                MAX(home_score_after) AS home_score,
+                MAX(away_score_after) AS away_score
+            FROM pbp
+            GROUP BY contest_id, year, division, home_team, away_team, date
+        ),
+        team_orgs AS (
+            SELECT team_name, year, division, MAX(org_id) AS org_id
+            FROM rosters
+            GROUP BY team_name, year, division
+        ),
+        attendance AS (
+            SELECT contest_id, year, division, MAX(attendance) AS attendance
+            FROM schedules
+            GROUP BY contest_id, year, division
+        )
+        SELECT
+            g.*,
+            home.org_id AS home_org_id,
+            away.org_id AS away_org_id,
+            a.attendance
+        FROM games g
+        LEFT JOIN team_orgs home
+            ON home.team_name = g.home_team AND home.year = g.year AND home.division = g.division
+        LEFT JOIN team_orgs away
+            ON away.team_name = g.away_team AND away.year = g.year AND away.division = g.division
+        LEFT JOIN attendance a
+            ON a.contest_id = g.contest_id AND a.year = g.year AND a.division = g.division
+    """)
+    conn.execute(
+        "CREATE INDEX idx_game_summary_date_div_contest ON game_summary(game_date, division, contest_id)"
+    )
+    total = conn.execute("SELECT COUNT(*) FROM game_summary").fetchone()[0]
+    logger.info(f"Built game_summary ({total} rows)")
+    return total
+
+
+def build_game_plays(conn):
+    """
+    Batter and pitcher names for every play, resolved once from rosters, so
+    /api/games/<year>/<id> reads a game's plays from pbp by (contest_id,
+    year) and joins the names by play instead of two roster lookups a row.
+    """
+    conn.execute("DROP TABLE IF EXISTS game_plays")
+    conn.execute("""
+        CREATE TABLE game_plays AS
+        SELECT
+            p.contest_id,
+            p.year,
+            p.play_id,
+            MAX(r_batter.player_name) AS batter_name,
+            MAX(r_pitcher.player_name) AS pitcher_name
+        FROM pbp p
+        LEFT JOIN rosters r_batter
+            ON p.batter_id = r_batter.player_id
+            AND p.year = r_batter.year
+            AND p.division = r_batter.division
+        LEFT JOIN rosters r_pitcher
+            ON p.pitcher_id = r_pitcher.player_id
+            AND p.year = r_pitcher.year
+            AND p.division = r_pitcher.division
+        WHERE p.batter_id IS NOT NULL OR p.pitcher_id IS NOT NULL
+        GROUP BY p.contest_id, p.year, p.play_id
+    """)
+    conn.execute("CREATE INDEX idx_game_plays_contest_year_play ON game_plays(contest_id, year, play_id)")
+    total = conn.execute("SELECT COUNT(*) FROM game_plays").fetchone()[0]
+    logger.info(f"Built game_plays ({total} rows)")
+    return total
+
+
+DERIVED_TABLES = {
+    'pbp_spray': build_pbp_spray,
+    'player_index': build_player_index,
+    'player_latest': build_player_latest,
+    'value_leaderboard': build_value_leaderboard,
+    'rolling_leaderboard': build_rolling_leaderboard,
+    'game_summary': build_game_summary,
+    'game_plays': build_game_plays,
+}
+
+
+# Raw tables the builders read; a change to any of them makes the derived tables stale
+SOURCE_TABLES = [
+    'batting', 'pitching', 'rosters', 'schedules', 'pbp', 'team_information',
+    'rolling_batting', 'rolling_pitching',
+]
+
+
+def _table_checksum(conn, table):
+    """
+    Row count and rowid range plus a per-column total (of the values for
+    numeric columns, of the lengths for the rest). Changes when a refresh
+    adds, removes or rewrites rows, e.g. re-imported rolling tables or pbp
+    with corrected wpa, not just when the row count does.
+    """
+    terms = []
+    for _, column, declared, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        numeric = any(kind in declared.upper() for kind in ('INT', 'REAL', 'FLOA', 'DOUB', 'NUM'))
+        terms.append(f'TOTAL("{column}")' if numeric else f'TOTAL(LENGTH("{column}"))')
+    row = conn.execute(f"SELECT COUNT(*), MIN(rowid), MAX(rowid), {', '.join(terms)} FROM {table}").fetchone()
+    return ':'.join(repr(value) for value in row)
+
+
+def source_fingerprint(conn):
+    """Digest of every source table's checksum."""
+    parts = []
+    for table in SOURCE_TABLES:
+        try:
+            checksum = _table_checksum(conn, table)
+        except sqlite3.OperationalError:
+            checksum = None
+        parts.append(f"{table}:{checksum}")
+    return hashlib.sha1(';'.join(parts).encode()).hexdigest()
+
+
+def built_fingerprint(conn):
+    """Source fingerprint recorded by the last full build, or None."""
+    try:
+        row = conn.execute("SELECT fingerprint FROM derived_source").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def derived_tables_stale(conn):
+    """Whether the source tables changed since the derived tables were last built in full."""
+    return built_fingerprint(conn) != source_fingerprint(conn)
+
+
+def build_derived_tables(conn, tables=None):
+    """
+    Build the requested derived tables (all of them by default) and commit.
+    A full build records the source fingerprint it was built from.
+    """
+    names = tables or list(DERIVED_TABLES.keys())
+    for name in names:
+        if name not in DERIVED_TABLES:
+            raise ValueError(f"Unknown derived table: {name}")
+    for name in names:
+        DERIVED_TABLES[name](conn)
+        conn.commit()
+    if set(names) == set(DERIVED_TABLES):
+        conn.execute("DROP TABLE IF EXISTS derived_source")
+        conn.execute("CREATE TABLE derived_source (fingerprint TEXT NOT NULL, built_at TEXT NOT NULL)")
+        conn.execute(
+            "INSERT INTO derived_source (fingerprint, built_at) VALUES (?, ?)",
+            (source_fingerprint(conn), datetime.now(timezone.utc).isoformat(timespec='seconds')),
+        )
+        conn.commit()
+    return names
@@ -0,0 +1,175 @@
+"""
+On-disk bulk exports of the stats tables as Arrow IPC, Parquet or CSV.
+
+Each file holds one table's division-year. It is written the first time it
+is requested and kept under EXPORT_DIR/<data version>/, so a data refresh
+produces each file once and every later request is served straight from
+disk by send_file (conditional requests and Range included) without
+touching SQLite or re-serializing. Arrow and Parquet need pyarrow; without
+it those formats fall back to CSV.
+"""
+import csv
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+from flask import jsonify, send_file
+
+from config import EXPORT_DIR
+from db import get_db_connection, get_data_version
+from leaderboard_query import (
+    BATTING_PERCENTILES, PITCHING_PERCENTILES, stat_columns, percentile_columns, select_list,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 5000
+
+# format -> (file extension, mimetype)
+EXPORT_FORMATS = {
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'csv': ('csv', 'text/csv'),
+}
+
+# table -> percentile columns added to the export, as on the JSON endpoints
+EXPORT_TABLES = {
+    'batting': BATTING_PERCENTILES,
+    'batting_team': BATTING_PERCENTILES,
+    'pitching': PITCHING_PERCENTILES,
+    'pitching_team': PITCHING_PERCENTILES,
+    'baserunning': {},
+    'batted_ball': {},
+    'situational_batting': {},
+    'situational_pitching': {},
+    'splits_batting': {},
+    'splits_pitching': {},
+}
+
+_build_locks = {}
+_build_locks_guard = threading.Lock()
+
+
+def export_format(fmt):
+    """The format actually written for a requested one (CSV when pyarrow is missing)."""
+    if fmt in ('arrow', 'parquet') and pa is None:
+        return 'csv'
+    return fmt
+
+
+def _version_dir():
+    """EXPORT_DIR/<data version>, removing exports left over from older data."""
+    version = get_data_version()
+    path = os.path.join(EXPORT_DIR, version)
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(EXPORT_DIR):
+            if name != version:
+                shutil.rmtree(os.path.join(EXPORT_DIR, name), ignore_errors=True)
+    return path
+
+
+def _query(conn, table, division, year):
+    columns = stat_columns(table, 't', percentile_columns(table, 't', EXPORT_TABLES[table]))
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(f"""
+        SELECT {select_list(columns)}
+        FROM {table} t
+        WHERE t.division = ? AND t.year = ?
+        ORDER BY t.rowid
+    """, (division, year))
+    return cursor
+
+
+def _arrow_column(values):
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type SQLite column: keep it as text rather than fail the export
+        return pa.array([None if value is None else str(value) for value in values], pa.string())
+
+
+def _write_csv(cursor, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([d[0] for d in cursor.description])
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            writer.writerows(rows)
+
+
+def _write_arrow(cursor, path, fmt):
+    names = [d[0] for d in cursor.description]
+    rows = cursor.fetchall()
+    table = pa.table({name: _arrow_column([row[i] for row in rows]) for i, name in enumerate(names)})
+    if fmt == 'parquet':
+        pq.write_table(table, path)
+        return
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def export_path(table, division, year, fmt):
+    """Path of the export file, building it first if this data version doesn't have it yet."""
+    fmt = export_format(fmt)
+    extension = EXPORT_FORMATS[fmt][0]
+    path = os.path.join(_version_dir(), f"{table}_d{division}_{year}.{extension}")
+    if os.path.exists(path):
+        return path
+
+    with _build_locks_guard:
+        lock = _build_locks.setdefault(path, threading.Lock())
+    with lock:
+        if os.path.exists(path):
+            return path
+        # Write beside the target and rename into place, so a concurrent
+        # reader (or another worker process) never sees a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        conn = get_db_connection()
+        try:
+            cursor = _query(conn, table, division, year)
+            if fmt == 'csv':
+                _write_csv(cursor, tmp_path)
+            else:
+                _write_arrow(cursor, tmp_path, fmt)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        finally:
+            conn.close()
+    logger.info(f"Built export {path}")
+    return path
+
+
+def export_response(table, division, year, fmt):
+    """send_file response for one table's division-year in the requested format."""
+    try:
+        path = export_path(table, division, year, fmt)
+    except sqlite3.Error as e:
+        logger.error(f"Database error exporting {table}: {e}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+
+    extension, mimetype = EXPORT_FORMATS[export_format(fmt)]
+    return send_file(
+        os.path.abspath(path),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=f"{table}_d{division}_{year}.{extension}",
+        conditional=True,
+    )
@@ -0,0 +1,180 @@
+"""
+Per-game analytics derived from a game's plays in one NumPy pass.
+
+Takes the ordered plays of /api/games/<year>/<contest_id> and returns what
+the game page otherwise computes client-side from the full play list: the
+biggest WPA swings, a downsampled win-expectancy curve, the line score,
+batting and pitching box scores with WPA/RE24 per player, lead changes and
+the leverage-weighted excitement index.
+
+WPA and run_expectancy_delta are from the batter's side, so batters are
+credited them and pitchers charged them, as on the game page.
+"""
+import numpy as np
+
+from pbp_classifier import classify_descriptions, normalize_description
+
+TOP_PLAYS = 5
+WIN_EXPECTANCY_POINTS = 60
+ROUND_TO = 4
+
+
+def _numbers(plays, name):
+    return np.array([np.nan if play[name] is None else float(play[name]) for play in plays])
+
+
+def _flags(values):
+    return np.array(values, dtype=bool)
+
+
+def _round(value):
+    return None if value is None or np.isnan(value) else round(float(value), ROUND_TO)
+
+
+def _box_score(ids, names, teams, stats):
+    """Sum per-play stat arrays by player id, players in order of first appearance."""
+    ids = np.asarray(ids, dtype=object)
+    keep = np.array([player_id is not None for player_id in ids], dtype=bool)
+    if not keep.any():
+        return []
+    unique, first, inverse = np.unique(ids[keep].astype(str), return_index=True, return_inverse=True)
+    totals = {stat: np.bincount(inverse, weights=values[keep], minlength=len(unique))
+              for stat, values in stats.items()}
+    kept = np.flatnonzero(keep)
+    rows = []
+    for i in np.argsort(first):
+        play = kept[first[i]]
+        row = {'player_id': ids[play], 'player_name': names[play], 'team': teams[play]}
+        for stat, values in totals.items():
+            row[stat] = _round(values[i]) if stat in ('wpa', 're24') else int(values[i])
+        rows.append(row)
+    return rows
+
+
+def _running_score(plays, name):
+    """
+    Score after each play, carrying the last known score over NULLs (0 before any).
+
+    >>> _running_score([{'s': 1}, {'s': None}, {'s': 2}], 's').tolist()
+    [1.0, 1.0, 2.0]
+    """
+    score = _numbers(plays, name)
+    known = ~np.isnan(score)
+    last = np.maximum.accumulate(np.where(known, np.arange(len(score)), -1))
+    return np.where(last >= 0, score[np.maximum(last, 0)], 0.0)
+
+
+def _lead_changes(home_after, away_after):
+    # Same count as the game page: starts at 1 and bumps whenever a new team takes the lead
+    leader = np.sign(home_after - away_after)
+    leader = leader[leader != 0]
+    return 1 + int(np.count_nonzero(leader[1:] != leader[:-1]))
+
+
+def game_analytics(plays, home_team, away_team):
+    """Analytics for one game from its ordered plays (dicts or sqlite3.Row)."""
+    wpa = np.nan_to_num(_numbers(plays, 'wpa'))
+    re24 = np.nan_to_num(_numbers(plays, 'run_expectancy_delta'))
+    li = _numbers(plays, 'li')
+    top = _flags([bool(play['top_inning']) for play in plays])
+    home_after = _running_score(plays, 'home_score_after')
+    away_after = _running_score(plays, 'away_score_after')
+    # Runs on each play, from the running score
+    home_runs = np.clip(np.diff(home_after, prepend=0), 0, None)
+    away_runs = np.clip(np.diff(away_after, prepend=0), 0, None)
+
+    descriptions = [normalize_description(play['description']) for play in plays]
+    classified = [c or {} for c in classify_descriptions([play['description'] for play in plays])]
+    singles = _flags([c.get('is_single', False) for c in classified])
+    doubles = _flags([c.get('is_double', False) for c in classified])
+    triples = _flags([c.get('is_triple', False) for c in classified])
+    homers = _flags([c.get('is_hr', False) for c in classified])
+    walks = _flags([c.get('is_bb', False) for c in classified])
+    hbp = _flags([c.get('is_hbp', False) for c in classified])
+    strikeouts = _flags(['struck out' in desc for desc in descriptions])
+    hits = singles | doubles | triples | homers
+    pa = ~np.isnan(_numbers(plays, 'woba'))
+
+    innings = _numbers(plays, 'inning')
+    has_inning = ~np.isnan(innings)
+    inning_numbers = np.unique(innings[has_inning]).astype(int)
+    inning_index = np.searchsorted(inning_numbers, innings[has_inning])
+    away_by_inning = np.bincount(inning_index, weights=away_runs[has_inning], minlength=len(inning_numbers))
+    home_by_inning = np.bincount(inning_index, weights=home_runs[has_inning], minlength=len(inning_numbers))
+    line_score = {
+        'innings': [
+            {'inning': int(inning), 'away': int(away), 'home': int(home)}
+            for inning, away, home in zip(inning_numbers, away_by_inning, home_by_inning)
+        ],
+        'away': {'runs': int(away_runs.sum()), 'hits': int(np.count_nonzero(hits & top))},
+        'home': {'runs': int(home_runs.sum()), 'hits': int(np.count_nonzero(hits & ~top))},
+    }
+
+    swing_order = np.argsort(-np.abs(wpa), kind='stable')[:TOP_PLAYS]
+    top_plays = [
+        {
+            'play_index': int(i),
+            'play_id': plays[i]['play_id'],
+            'inning': plays[i]['inning'],
+            'top_inning': plays[i]['top_inning'],
+            'description': plays[i]['description'],
+            'batter_name': plays[i]['batter_name'],
+            'pitcher_name': plays[i]['pitcher_name'],
+            'wpa': _round(wpa[i]),
+            'li': _round(li[i]),
+            'home_win_exp_after': _round(plays[i]['home_win_exp_after']),
+        }
+        for i in swing_order
+    ]
+
+    # Point 0 is the pregame win expectancy, point i the one after play i - 1
+    curve = np.concatenate((_numbers(plays[:1], 'home_win_exp_before'), _numbers(plays, 'home_win_exp_after')))
+    if len(curve) > WIN_EXPECTANCY_POINTS:
+        points = np.linspace(0, len(curve) - 1, WIN_EXPECTANCY_POINTS).round().astype(int)
+        points = np.unique(np.concatenate((points, swing_order + 1)))
+    else:
+        points = np.arange(len(curve))
+    win_expectancy = [
+        {
+            'play_index': int(p) - 1,
+            'inning': plays[max(p - 1, 0)]['inning'],
+            'top_inning': plays[max(p - 1, 0)]['top_inning'],
+            'home_win_exp': _round(curve[p]),
+        }
+        for p in points
+    ]
+
+    batting_team = np.where(top, away_team, home_team)
+    fielding_team = np.where(top, home_team, away_team)
+    runs_on_play = np.where(top, away_runs, home_runs)
+    batting = _box_score(
+        [play['batter_id'] for play in plays],
+        [play['batter_name'] for play in plays],
+        batting_team.tolist(),
+        {
+            'pa': pa.astype(float), 'h': hits.astype(float), 'doubles': doubles.astype(float),
+            'triples': triples.astype(float), 'hr': homers.astype(float), 'bb': walks.astype(float),
+            'hbp': hbp.astype(float), 'k': strikeouts.astype(float), 'wpa': wpa, 're24': re24,
+        },
+    )
+    pitching = _box_score(
+        [play['pitcher_id'] for play in plays],
+        [play['pitcher_name'] for play in plays],
+        fielding_team.tolist(),
+        {
+            'bf': pa.astype(float), 'h': hits.astype(float), 'hr': homers.astype(float),
+            'bb': walks.astype(float), 'k': strikeouts.astype(float), 'r': runs_on_play,
+            'wpa': -wpa, 're24': -re24,
+        },
+    )
+
+    return {
+        'final': {'home': int(np.max(home_after)), 'away': int(np.max(away_after))},
+        'line_score': line_score,
+        'top_plays': top_plays,
+        'win_expectancy': win_expectancy,
+        'batting': batting,
+        'pitching': pitching,
+        'lead_changes': _lead_changes(home_after, away_after),
+        'excitement_index': _round(np.sum(np.abs(wpa) * np.where(np.isnan(li) | (li == 0), 1, li))),
+    }
@@ -0,0 +1,63 @@
+"""
+JSON provider for the Flask app.
+
+Uses orjson when it is installed (several times faster than stdlib json on
+our wide, float-heavy leaderboard payloads) and writes its bytes straight into
+the response. Falls back to Flask's stdlib provider otherwise.
+
+Either way NaN/Infinity are sent as null: the frontend parses responses with
+response.json(), which rejects the bare NaN tokens stdlib json emits.
+"""
+import math
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _finite(obj):
+    """Copy of obj with non-finite floats replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def _orjson_options(self):
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj):
+        """Serialize obj to UTF-8 JSON bytes (no trailing newline)."""
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options())
+        return self.dumps(obj).encode()
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode()
+        kwargs.setdefault('allow_nan', False)
+        try:
+            return super().dumps(obj, **kwargs)
+        except ValueError:
+            return super().dumps(_finite(obj), **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
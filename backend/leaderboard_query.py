@@ -0,0 +1,262 @@
+"""
+Column projection for leaderboard queries.
+
+Each leaderboard describes its output as an ordered list of columns: either a
+plain (optionally table-qualified) column or a (name, SQL expression) pair.
+A fields= request selects a whitelisted subset, so SQLite reads and we
+serialize only the columns a client table actually shows.
+"""
+from db import get_db_connection, cached_per_data_version
+from request_params import encode_cursor, decode_cursor
+from responses import STREAMING_FORMATS, fetch_rows, rows_payload, response_format
+
+
+@cached_per_data_version
+def table_columns(table):
+    """Column names of a stats table, in table order."""
+    conn = get_db_connection()
+    try:
+        return tuple(row['name'] for row in conn.execute(f"PRAGMA table_info({table})"))
+    finally:
+        conn.close()
+
+
+def stat_columns(table, alias, extra=()):
+    """Every column of table plus computed extras, i.e. SELECT *, ... as a column list."""
+    return [f'{alias}."{name}"' for name in table_columns(table)] + list(extra)
+
+
+def _pairs(columns):
+    for column in columns:
+        if isinstance(column, str):
+            yield column.split('.')[-1].strip('"'), column
+        else:
+            yield column
+
+
+def column_names(columns):
+    return [name for name, _ in _pairs(columns)]
+
+
+def sortable_columns(columns):
+    """sort= whitelist mapping each column name to its expression."""
+    return dict(_pairs(columns))
+
+
+def select_list(columns, fields=None):
+    """SELECT list for the requested fields (all columns when fields is None)."""
+    exprs = dict(_pairs(columns))
+    names = fields or column_names(columns)
+    return ',\n'.join(f'{exprs[name]} AS "{name}"' for name in names)
+
+
+MAX_LEADERBOARD_LIMIT = 5000
+
+BATTING_PERCENTILES = {
+    'war_percentile': 'war',
+    'sos_adj_war_percentile': 'sos_adj_war',
+}
+
+PITCHING_PERCENTILES = {
+    'war_percentile': 'war',
+}
+
+
+def window_percentile(column):
+    return f'PERCENT_RANK() OVER (PARTITION BY year ORDER BY {column}) * 100'
+
+
+def correlated_percentile(table, alias, column):
+    """
+    Same value as window_percentile(column) over the row's division-year,
+    computed per returned row from the (division, year, column) index instead
+    of ranking the whole partition, so filtered/paged requests stay small.
+    """
+    same_partition = f'x.division = {alias}.division AND x.year = {alias}.year'
+    below = (
+        f'SELECT COUNT(*) FROM {table} x WHERE {same_partition} '
+        f'AND (x.{column} < {alias}.{column} OR (x.{column} IS NULL AND {alias}.{column} IS NOT NULL))'
+    )
+    size = f'SELECT COUNT(*) FROM {table} x WHERE {same_partition}'
+    return f'COALESCE(({below}) * 1.0 / NULLIF(({size}) - 1, 0) * 100, 0.0)'
+
+
+def stat_sortable(table, alias, percentiles):
+    """sort= whitelist for a stats table; percentiles sort by their ranked column."""
+    sortable = {name: f'{alias}."{name}"' for name in table_columns(table)}
+    sortable.update({name: f'{alias}."{column}"' for name, column in percentiles.items()})
+    return sortable
+
+
+def percentile_columns(table, alias, percentiles, correlated=False):
+    """(name, expression) pairs for {name: ranked column} percentiles."""
+    if correlated:
+        return [(name, correlated_percentile(table, alias, column)) for name, column in percentiles.items()]
+    return [(name, window_percentile(column)) for name, column in percentiles.items()]
+
+
+def parse_leaderboard_args(args, sortable, qualifier=None):
+    """
+    Parse the shared leaderboard filters and paging params.
+
+    sortable maps sort= names to SQL expressions; qualifier names the
+    minimum-playing-time param (e.g. 'min_pa') when the route accepts one
+    here. Raises ValueError for anything invalid.
+    """
+    options = {
+        'conference': args.get('conference') or None,
+        'team': args.get('team') or None,
+        'minimum': None,
+        'sort': None,
+        'descending': True,
+        'limit': None,
+        'offset': 0,
+        'after': None,
+    }
+
+    if qualifier and args.get(qualifier):
+        try:
+            options['minimum'] = float(args[qualifier])
+        except ValueError:
+            raise ValueError(f"{qualifier} must be a number")
+
+    sort = args.get('sort')
+    if sort:
+        if sort not in sortable:
+            raise ValueError(f"Cannot sort by {sort}")
+        options['sort'] = sortable[sort]
+
+    order = args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        raise ValueError("Invalid order. Must be 'asc' or 'desc'.")
+    options['descending'] = order == 'desc'
+
+    limit = args.get('limit')
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_LEADERBOARD_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}")
+        options['limit'] = int(limit)
+
+    offset = args.get('offset')
+    if offset is not None:
+        if not offset.isdigit():
+            raise ValueError("offset must be a non-negative integer")
+        options['offset'] = int(offset)
+        if options['limit'] is None:
+            options['limit'] = MAX_LEADERBOARD_LIMIT
+
+    cursor = args.get('cursor')
+    if cursor:
+        options['after'] = decode_cursor(cursor)
+        if options['limit'] is None:
+            options['limit'] = MAX_LEADERBOARD_LIMIT
+
+    return options
+
+
+def is_filtered(options):
+    """Whether the result is a subset of the division-year (so window functions can't be used as-is)."""
+    return any(options[key] is not None for key in ('conference', 'team', 'minimum', 'limit'))
+
+
+def leaderboard_format(options, formats=STREAMING_FORMATS):
+    """
+    response_format() for a leaderboard; ndjson streams the whole result, so
+    it can't be combined with paging. Raises ValueError.
+    """
+    fmt = response_format(formats)
+    if fmt == 'ndjson' and options['limit'] is not None:
+        raise ValueError("format=ndjson streams the full result and cannot be combined with limit, offset or cursor")
+    return fmt
+
+
+def order_keys(options, default_order, tiebreak):
+    """
+    (expression, descending) sort keys. Paged requests get a unique tiebreak
+    (the table rowid) so the cursor always points at exactly one row.
+    """
+    keys = [(options['sort'], options['descending'])] if options['sort'] else list(default_order)
+    if options['limit'] is not None:
+        keys.append((tiebreak, False))
+    return keys
+
+
+def _after(expr, descending, value):
+    """Rows strictly after value in SQLite's order (NULLs first ascending, last descending)."""
+    if value is None:
+        return ('0', []) if descending else (f'{expr} IS NOT NULL', [])
+    if descending:
+        return f'({expr} < ? OR {expr} IS NULL)', [value]
+    return f'{expr} > ?', [value]
+
+
+def leaderboard_clauses(options, keys, alias=None, qualifier_column=None):
+    """
+    SQL pieces for the shared filters, keyset cursor, ordering and paging:
+
+        SELECT ...{cursor_columns} FROM ... WHERE <route conditions>{where}
+        ORDER BY {order_by} {limit}
+
+    with params (filters, cursor, then LIMIT/OFFSET) appended after the
+    route's own params. Raises ValueError for a cursor that doesn't fit keys.
+    """
+    prefix = f'{alias}.' if alias else ''
+    conditions = []
+    params = []
+    if options['conference']:
+        conditions.append(f'{prefix}conference = ?')
+        params.append(options['conference'])
+    if options['team']:
+        conditions.append(f'{prefix}team_name = ?')
+        params.append(options['team'])
+    if options['minimum'] is not None and qualifier_column:
+        conditions.append(f'{prefix}{qualifier_column} >= ?')
+        params.append(options['minimum'])
+
+    after = options['after']
+    if after is not None:
+        if len(after) != len(keys):
+            raise ValueError("Invalid cursor")
+        branches = []
+        for i, (expr, descending) in enumerate(keys):
+            parts = [f'{keys[j][0]} IS ?' for j in range(i)]
+            params.extend(after[:i])
+            condition, condition_params = _after(expr, descending, after[i])
+            parts.append(condition)
+            params.extend(condition_params)
+            branches.append('(' + ' AND '.join(parts) + ')')
+        conditions.append('(' + ' OR '.join(branches) + ')')
+
+    limit = ''
+    cursor_columns = ''
+    if options['limit'] is not None:
+        limit = 'LIMIT ? OFFSET ?'
+        params.extend([options['limit'], 0 if after is not None else options['offset']])
+        cursor_columns = ''.join(f',\n{expr} AS "_cursor_{i}"' for i, (expr, _) in enumerate(keys))
+
+    return {
+        'where': ''.join(f'\n AND {condition}' for condition in conditions),
+        'order_by': ', '.join(f"{expr} {'DESC' if descending else 'ASC'}" for expr, descending in keys),
+        'limit': limit,
+        'cursor_columns': cursor_columns,
+        'params': params,
+    }
+
+
+def leaderboard_payload(cursor, options, keys, fmt='json'):
+    """
+    Unpaged requests keep the plain list (or columnar) shape; paged requests
+    add next_cursor, as {items, next_cursor} or {columns, rows, next_cursor}.
+    """
+    columns, rows = fetch_rows(cursor)
+    if options['limit'] is None:
+        return rows_payload(columns, rows, fmt)
+
+    width = len(columns) - len(keys)
+    next_cursor = None
+    if len(rows) == options['limit']:
+        next_cursor = encode_cursor(rows[-1][width:])
+    payload = rows_payload(columns, rows, fmt, width)
+    if fmt == 'columnar':
+        return {**payload, 'next_cursor': next_cursor}
+    return {'items': payload, 'next_cursor': next_cursor}
@@ -6,4 +6,4 @@ from .api_auth import (
     hash_key,
 )
 from .rate_limiter import WRITE_LIMITS
-from .cache import cache_response, invalidate_cache
+from .cache import cache_response, cache_key, invalidate_cache
@@ -149,6 +149,12 @@ def require_api_auth(f):
         if request.method == 'OPTIONS':
             return f(*args, **kwargs)
         
+        # Sub-request of /api/batch, which authenticated and rate limited the whole batch
+        batch_user = g.get('batch_user')
+        if batch_user is not None:
+            g.user = batch_user
+            return f(*args, **kwargs)
+        
         user_data = None
         error = None
         
@@ -2,13 +2,34 @@ import logging
 from functools import wraps
 from flask import request, Response, make_response
 
-from .rate_limiter import get_redis_client
+from .rate_limiter import get_redis_client, get_redis_bytes_client
+from db import get_data_version
+from responses import FORMAT_MIMETYPES, accepted_format
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TTL = 300  # 5 minutes
 
 
+def cache_key(prefix: str, args, fmt: str = 'json') -> str:
+    """
+    Redis key for a cached GET response under the current data version.
+
+    Args:
+        prefix: Endpoint path or the route's key_prefix
+        args: Query args (MultiDict or dict)
+        fmt: Response format negotiated via Accept, when format= isn't given
+    """
+    sorted_args = sorted(args.items())
+    args_str = '&'.join(f"{k}={v}" for k, v in sorted_args)
+    key = f"cache:{prefix}:{args_str}"
+    # Same URL, different body when another format is negotiated via Accept
+    if 'format' not in args and fmt != 'json':
+        key += f":{fmt}"
+    # Entries from before a data refresh are never read again (and age out)
+    return f"{key}@{get_data_version()}"
+
+
 def cache_response(ttl: int = DEFAULT_TTL, key_prefix: str = None):
     """
     Cache GET endpoint responses in Redis.
@@ -30,19 +51,16 @@ def cache_response(ttl: int = DEFAULT_TTL, key_prefix: str = None):
             if request.method != 'GET':
                 return f(*args, **kwargs)
             
-            client = get_redis_client()
+            client = get_redis_bytes_client()
             if not client:
                 return f(*args, **kwargs)
             
-            prefix = key_prefix or request.path
-            sorted_args = sorted(request.args.items())
-            args_str = '&'.join(f"{k}={v}" for k, v in sorted_args)
-            cache_key = f"cache:{prefix}:{args_str}"
+            key = cache_key(key_prefix or request.path, request.args, accepted_format(tuple(FORMAT_MIMETYPES)))
             
             try:
-                cached = client.get(cache_key)
+                cached = client.get(key)
                 if cached:
-                    logger.debug(f"Cache hit: {cache_key}")
+                    logger.debug(f"Cache hit: {key}")
                     return Response(
                         cached,
                         mimetype='application/json',
@@ -60,15 +78,18 @@ def cache_response(ttl: int = DEFAULT_TTL, key_prefix: str = None):
                 return resp
 
             try:
-                json_data = resp.get_data(as_text=True)
-                client.setex(cache_key, ttl, json_data)
-                logger.debug(f"Cache set: {cache_key} (TTL: {ttl}s)")
+                # Store the serialized body as-is; a hit replays the same bytes
+                client.setex(key, ttl, resp.get_data())
+                logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
                 resp.headers['X-Cache'] = 'MISS'
             except Exception as e:
                 logger.warning(f"Cache write error: {e}")
 
             return resp
         
+        # Lets /api/batch look the response up without calling the view
+        decorated_function.cache_ttl = ttl
+        decorated_function.cache_key_prefix = key_prefix
         return decorated_function
     return decorator
 
@@ -7,6 +7,7 @@ import threading
 logger = logging.getLogger(__name__)
 
 _redis_client = None
+_redis_bytes_client = None
 _redis_available = None
 
 _memory_store = defaultdict(lambda: {'count': 0, 'window_start': 0})
@@ -54,6 +55,23 @@ def get_redis_client():
         return None
 
 
+def get_redis_bytes_client():
+    """
+    Client on the same Redis as get_redis_client() that leaves values as
+    bytes, so cached response bodies round-trip verbatim.
+    """
+    global _redis_bytes_client
+
+    if _redis_bytes_client is not None:
+        return _redis_bytes_client
+    if get_redis_client() is None:
+        return None
+
+    import redis
+    _redis_bytes_client = redis.from_url(os.getenv('REDIS_URL'))
+    return _redis_bytes_client
+
+
 def check_rate_limit(identifier: str, limit_type: str, limits: dict) -> tuple[bool, dict]:
     """
     Check rate limit. Uses Redis if available, falls back to in-memory.
@@ -3,12 +3,19 @@ CREATE INDEX IF NOT EXISTS idx_batting_div_year_war          ON batting(division
 CREATE INDEX IF NOT EXISTS idx_batting_player_year_div       ON batting(player_id, year, division);
 CREATE INDEX IF NOT EXISTS idx_batting_team_year_div_war     ON batting(team_name, year, division, war DESC);
 CREATE INDEX IF NOT EXISTS idx_batting_div_year_conf_pa      ON batting(division, year, conference, pa);
+CREATE INDEX IF NOT EXISTS idx_batting_div_year_conf_war     ON batting(division, year, conference, war DESC);
+CREATE INDEX IF NOT EXISTS idx_batting_div_year_sos_war      ON batting(division, year, sos_adj_war);
 
 -- pitching
 CREATE INDEX IF NOT EXISTS idx_pitching_div_year_war         ON pitching(division, year, war DESC);
 CREATE INDEX IF NOT EXISTS idx_pitching_player_year_div      ON pitching(player_id, year, division);
 CREATE INDEX IF NOT EXISTS idx_pitching_team_year_div_war    ON pitching(team_name, year, division, war DESC);
 CREATE INDEX IF NOT EXISTS idx_pitching_div_year_conf_ip     ON pitching(division, year, conference, ip);
+CREATE INDEX IF NOT EXISTS idx_pitching_div_year_conf_war    ON pitching(division, year, conference, war DESC);
+
+-- team batting/pitching
+CREATE INDEX IF NOT EXISTS idx_batting_team_div_year_war     ON batting_team(division, year, war DESC);
+CREATE INDEX IF NOT EXISTS idx_pitching_team_div_year_war    ON pitching_team(division, year, war DESC);
 
 -- rosters (search, latest-year joins, team/org lookups, conferences)
 CREATE INDEX IF NOT EXISTS idx_rosters_player_year_div       ON rosters(player_id, year, division);
@@ -22,8 +29,13 @@ CREATE INDEX IF NOT EXISTS idx_pbp_contest_year              ON pbp(contest_id,
 CREATE INDEX IF NOT EXISTS idx_pbp_batter_year               ON pbp(batter_id, year);
 CREATE INDEX IF NOT EXISTS idx_pbp_pitcher_year              ON pbp(pitcher_id, year);
 
--- schedules (games by contest/year/division)
+-- schedules (games by contest/year/division, team and org schedules)
 CREATE INDEX IF NOT EXISTS idx_schedules_contest_year_div    ON schedules(contest_id, year, division);
+CREATE INDEX IF NOT EXISTS idx_schedules_team_div_year       ON schedules(team_id, division, year);
+CREATE INDEX IF NOT EXISTS idx_schedules_opponent_div_year   ON schedules(opponent_team_id, division, year);
+
+-- team history (org -> yearly team ids)
+CREATE INDEX IF NOT EXISTS idx_team_history_org              ON team_history(org_id);
 
 -- expected runs, park factors
 CREATE INDEX IF NOT EXISTS idx_expected_runs_div_year        ON expected_runs(division, year);
@@ -34,20 +46,27 @@ CREATE INDEX IF NOT EXISTS idx_splits_batting_div_year_pa    ON splits_batting(d
 CREATE INDEX IF NOT EXISTS idx_splits_batting_player_year_div ON splits_batting(player_id, year, division);
 CREATE INDEX IF NOT EXISTS idx_splits_pitching_div_year_pa   ON splits_pitching(division, year, pa_overall);
 CREATE INDEX IF NOT EXISTS idx_splits_pitching_player_year_div ON splits_pitching(player_id, year, division);
+CREATE INDEX IF NOT EXISTS idx_splits_batting_div_year_conf  ON splits_batting(division, year, conference);
+CREATE INDEX IF NOT EXISTS idx_splits_pitching_div_year_conf ON splits_pitching(division, year, conference);
 
 -- situational (leaderboards)
 CREATE INDEX IF NOT EXISTS idx_situational_bat_div_year_pa   ON situational_batting(division, year, pa_overall);
 CREATE INDEX IF NOT EXISTS idx_situational_bat_player_year_div ON situational_batting(player_id, year, division);
 CREATE INDEX IF NOT EXISTS idx_situational_pit_div_year_pa   ON situational_pitching(division, year, pa_overall);
 CREATE INDEX IF NOT EXISTS idx_situational_pit_player_year_div ON situational_pitching(player_id, year, division);
+CREATE INDEX IF NOT EXISTS idx_situational_bat_div_year_conf ON situational_batting(division, year, conference);
+CREATE INDEX IF NOT EXISTS idx_situational_pit_div_year_conf ON situational_pitching(division, year, conference);
 
 -- batted ball (leaderboards)
 CREATE INDEX IF NOT EXISTS idx_batted_ball_div_year_cnt      ON batted_ball(division, year, count);
 CREATE INDEX IF NOT EXISTS idx_batted_ball_player_year_div   ON batted_ball(player_id, year, division);
+CREATE INDEX IF NOT EXISTS idx_batted_ball_div_year_conf     ON batted_ball(division, year, conference);
+
+-- baserunning (leaderboards)
+CREATE INDEX IF NOT EXISTS idx_baserunning_div_year_br       ON baserunning(division, year, baserunning DESC);
+CREATE INDEX IF NOT EXISTS idx_baserunning_div_year_conf     ON baserunning(division, year, conference);
+CREATE INDEX IF NOT EXISTS idx_baserunning_player_year_div   ON baserunning(player_id, year, division);
 
 -- rolling tables (leaderboards)
 CREATE INDEX IF NOT EXISTS idx_rolling_batting_player        ON rolling_batting(player_id);
 CREATE INDEX IF NOT EXISTS idx_rolling_pitching_player       ON rolling_pitching(player_id);
-
-ANALYZE;
-PRAGMA optimize;
\ No newline at end of file
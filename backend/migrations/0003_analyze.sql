@@ -0,0 +1,3 @@
+-- refresh planner statistics once indexes and derived tables exist
+ANALYZE;
+PRAGMA optimize;
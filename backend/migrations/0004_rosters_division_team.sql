@@ -0,0 +1,4 @@
+-- rosters: distinct teams of a division across all years (/api/teams without a year)
+CREATE INDEX IF NOT EXISTS idx_rosters_div_team              ON rosters(division, team_name);
+-- 0003's ANALYZE ran before this index existed
+ANALYZE rosters;
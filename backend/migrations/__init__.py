@@ -0,0 +1,133 @@
+"""
+Versioned schema steps for ncaa.db: indexes, derived tables, planner stats.
+
+Every rebuilt database goes through migrate() before it is swapped in
+(scripts/migrate.py). Applied steps are recorded in schema_version, so
+rerunning only applies what is new, and each step is itself safe to repeat.
+Add a step for any new index or derived table rather than editing an
+applied one; already-migrated databases never rerun it.
+
+Derived tables also depend on the data: migrate() rebuilds them (and
+reruns ANALYZE) whenever the source tables changed since their last full
+build, e.g. after an in-place data refresh of an already-migrated database.
+
+At startup the server calls schema_problems() and logs (or, with
+STRICT_SCHEMA=1, refuses to start on) a database that is behind, is missing
+expected indexes or lacks derived tables, or whose derived tables are stale.
+"""
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+
+from derived import DERIVED_TABLES, build_derived_tables, derived_tables_stale
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_INDEX_RE = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE)
+
+
+def _build_derived(conn):
+    build_derived_tables(conn)
+
+
+# (version, name, step): a .sql file in this package or a callable taking the connection
+MIGRATIONS = [
+    (1, 'indexes', '0001_indexes.sql'),
+    (2, 'derived_tables', _build_derived),
+    (3, 'analyze', '0003_analyze.sql'),
+    (4, 'rosters_division_team', '0004_rosters_division_team.sql'),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _read_sql(filename):
+    with open(os.path.join(MIGRATIONS_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+def expected_indexes():
+    """Index names the SQL steps create."""
+    names = []
+    for _, _, step in MIGRATIONS:
+        if isinstance(step, str):
+            names.extend(_INDEX_RE.findall(_read_sql(step)))
+    return names
+
+
+def schema_version(conn):
+    """Highest applied step, or 0 for a database that was never migrated."""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Apply every step newer than the database's schema_version, in order. Returns their names."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+    current = schema_version(conn)
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info(f"Applying migration {version} ({name})")
+        if isinstance(step, str):
+            conn.executescript(_read_sql(step))
+        else:
+            step(conn)
+        conn.execute(
+            "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+            (version, name, datetime.now(timezone.utc).isoformat(timespec='seconds')),
+        )
+        conn.commit()
+        applied.append(name)
+
+    if derived_tables_stale(conn):
+        logger.info("Source data changed since the derived tables were built; rebuilding them")
+        build_derived_tables(conn)
+        conn.executescript(_read_sql('0003_analyze.sql'))
+        applied.append('rebuild_derived_tables')
+    return applied
+
+
+def schema_problems(db_path):
+    """Reasons the database at db_path isn't fully migrated; empty when it is."""
+    if not os.path.exists(db_path):
+        return [f"{db_path} not found"]
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        problems = []
+        version = schema_version(conn)
+        if version < LATEST_VERSION:
+            problems.append(f"schema version {version}, expected {LATEST_VERSION}")
+
+        existing = {
+            row[0]: row[1]
+            for row in conn.execute("SELECT name, type FROM sqlite_master WHERE type IN ('index', 'table')")
+        }
+        missing_indexes = [name for name in expected_indexes() if existing.get(name) != 'index']
+        if missing_indexes:
+            problems.append(f"missing indexes: {', '.join(missing_indexes)}")
+        missing_tables = [name for name in DERIVED_TABLES if existing.get(name) != 'table']
+        if missing_tables:
+            problems.append(f"missing derived tables: {', '.join(missing_tables)}")
+        elif derived_tables_stale(conn):
+            problems.append("derived tables are stale (source data changed since they were built)")
+        return problems
+    finally:
+        conn.close()
@@ -0,0 +1,130 @@
+import re
+
+
+# Zones in priority order. When a description matches patterns from several
+# zones, the zone listed first wins (home run zones outrank plain outfield
+# zones, outfield outranks infield).
+FIELD_PATTERNS = {
+    "to_lf_hr": [r'homered to left', r'homered to lf', r'homers to lf', r'homers to left'],
+    "to_cf_hr": [r'homered to center', r'homered to cf', r'homers to cf', r'homers to center'],
+    "to_rf_hr": [r'homered to right', r'homered to rf', r'homers to rf', r'homers to right'],
+    "to_lf": [r'to left', r'to lf', r'left field', r'lf line', r'by lf'],
+    "to_cf": [r'to center', r'to cf', r'center field', r'by cf'],
+    "to_rf": [r'to right', r'to rf', r'right field', r'rf line', r'by rf'],
+    "to_3b": [r'to 3b', r'to third', r'third base', r'3b line', r'by 3b', r'3b to 2b'],
+    "to_ss": [r'ss to 2b', r'to ss', r'to short', r'shortstop', r'by ss'],
+    "up_middle": [r'up the middle', r'to pitcher', r'to p', r'to c', r'by p', r'by c', r'to catcher'],
+    "to_2b": [r'2b to ss', r'to 2b', r'to second', r'second base', r'by 2b'],
+    "to_1b": [r'to 1b', r'to first', r'first base', r'1b line', r'by 1b', r'1b to ss', r'1b to p', r'1b to 2b'],
+}
+
+ZONE_KEYS = list(FIELD_PATTERNS.keys())
+
+ZONE_DISPLAY = {
+    "to_lf": "left-field",
+    "to_lf_hr": "left-field-hr",
+    "to_cf": "center-field",
+    "to_cf_hr": "center-field-hr",
+    "to_rf": "right-field",
+    "to_rf_hr": "right-field-hr",
+    "to_3b": "third-base",
+    "to_ss": "shortstop",
+    "to_2b": "second-base",
+    "to_1b": "first-base",
+    "up_middle": "up-the-middle",
+}
+
+# Every zone wrapped in a lookahead so each position in the description reports
+# the highest-priority zone starting there without consuming input; overlapping
+# lower-priority matches (e.g. "2b to ss") can't hide a higher-priority one.
+_ZONE_RE = re.compile(
+    '(?=' + '|'.join(
+        f"(?P<{zone}>{'|'.join(patterns)})" for zone, patterns in FIELD_PATTERNS.items()
+    ) + ')'
+)
+_ZONE_PRIORITY = {zone: i for i, zone in enumerate(ZONE_KEYS)}
+
+_GROUND_RE = re.compile(r"ground|fielder's choice|reached on error|through the (left|right) side|down the")
+_FLY_RE = re.compile(r"fly|flied|homered to")
+_LINED_RE = re.compile(r"lined|doubled")
+_POPPED_RE = re.compile(r"popped|fouled out")
+
+
+def normalize_description(description):
+    """Lowercase a pbp description and drop the runner-advance tail."""
+    return (description or '').lower().split('3a')[0]
+
+
+def classify_zone(desc):
+    """Return the highest-priority zone key for a normalized description."""
+    best = None
+    for match in _ZONE_RE.finditer(desc):
+        zone = match.lastgroup
+        if best is None or _ZONE_PRIORITY[zone] < _ZONE_PRIORITY[best]:
+            best = zone
+            if _ZONE_PRIORITY[best] == 0:
+                break
+    return best
+
+
+def classify_description(description):
+    """
+    Classify a single pbp description.
+
+    Returns None for empty descriptions, otherwise a dict with the zone,
+    display zone, batted-ball type flags and plate appearance outcome flags.
+    """
+    desc = normalize_description(description)
+    if not desc:
+        return None
+
+    zone_key = classify_zone(desc)
+    field_zone = ZONE_DISPLAY.get(zone_key)
+
+    is_hr = 'homered' in desc
+    if is_hr and field_zone and not field_zone.endswith("-hr"):
+        field_zone = field_zone + "-hr"
+
+    return {
+        'zone_key': zone_key,
+        'field_zone': field_zone,
+        'is_ground': _GROUND_RE.search(desc) is not None,
+        'is_fly': _FLY_RE.search(desc) is not None,
+        'is_lined': _LINED_RE.search(desc) is not None,
+        'is_popped': _POPPED_RE.search(desc) is not None,
+        'is_single': 'singled' in desc,
+        'is_double': 'doubled' in desc,
+        'is_triple': 'tripled' in desc,
+        'is_hr': is_hr,
+        'is_bb': 'walked' in desc or 'intentional walk' in desc,
+        'is_hbp': 'hit by pitch' in desc,
+        'is_sf': 'sacrifice fly' in desc,
+    }
+
+
+def classify_descriptions(descriptions):
+    """Classify a list of pbp descriptions in one call, preserving order."""
+    return [classify_description(d) for d in descriptions]
+
+
+def spray_direction(zone_key, bats):
+    """
+    Derive pull/middle/oppo from a zone key and the batter's hand.
+    Middle includes both straight-away CF and balls up the middle.
+    """
+    if not zone_key or not bats or bats == '-':
+        return None
+    if zone_key in ("to_cf", "to_cf_hr", "up_middle"):
+        return "middle"
+    hand = bats.lower()[0]
+    if hand == 'r':
+        if zone_key in ("to_lf", "to_lf_hr"):
+            return "pull"
+        if zone_key in ("to_rf", "to_rf_hr"):
+            return "oppo"
+    if hand == 'l':
+        if zone_key in ("to_rf", "to_rf_hr"):
+            return "pull"
+        if zone_key in ("to_lf", "to_lf_hr"):
+            return "oppo"
+    return None
@@ -0,0 +1,164 @@
+"""
+Sorted per-population stat arrays for player percentiles and ranks.
+
+A population is every qualified row for (table, division, year[, conference]).
+Each stat is kept as a sorted NumPy array, so a player's percentile and rank
+come from two searchsorted calls instead of scanning every row.
+"""
+import numpy as np
+
+from db import get_db_connection, cached_per_data_version
+
+EPS = 1e-9
+
+POPULATIONS = {
+    'batting': {
+        'select': '''
+            player_id,
+            ba, ob_pct, slg_pct, woba,
+            (ob_pct + slg_pct) AS ops,
+            batting, baserunning, wpa, war, pa, wrc_plus, rea,
+            k_pct, bb_pct, wpa_li
+        ''',
+        'qualifier': 'pa',
+        'threshold': 25,
+        'stats': [
+            'ba', 'ob_pct', 'slg_pct', 'woba', 'ops',
+            'batting', 'baserunning', 'wpa', 'war', 'wrc_plus', 'rea',
+            'k_pct', 'bb_pct', 'wpa_li'
+        ],
+        'reverse': {'k_pct'},
+    },
+    'pitching': {
+        'select': '''
+            player_id,
+            era, fip, xfip,
+            k_pct, bb_pct, k_minus_bb_pct,
+            hr_div_fb,
+            war, ip, ra9,
+            pwpa, prea, pwpa_li
+        ''',
+        'qualifier': 'ip',
+        'threshold': 10,
+        'stats': [
+            'era', 'fip', 'xfip',
+            'k_pct', 'bb_pct', 'k_minus_bb_pct',
+            'ra9', 'war', 'prea', 'pwpa', 'pwpa_li', 'hr_div_fb'
+        ],
+        'reverse': {'era', 'fip', 'xfip', 'bb_pct', 'ra9', 'hr_div_fb'},
+    },
+}
+
+
+def _to_float(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@cached_per_data_version
+def known_conferences(division, year):
+    """Conferences with a batting or pitching row in the division-year."""
+    conn = get_db_connection()
+    try:
+        return frozenset(row[0] for row in conn.execute(
+            """
+            SELECT conference FROM batting WHERE division = ? AND year = ?
+            UNION
+            SELECT conference FROM pitching WHERE division = ? AND year = ?
+            """,
+            (division, year, division, year),
+        ) if row[0])
+    finally:
+        conn.close()
+
+
+@cached_per_data_version
+def get_population(table, division, year, conference=None):
+    """
+    Load a qualified population once per data version.
+
+    Callers validate division, year and conference first (see
+    known_conferences), so the cache only holds populations that exist.
+
+    Returns a dict with the row count, a sorted float array per stat and each
+    player's own values (so a player can be left out of their own comparison).
+    """
+    spec = POPULATIONS[table]
+    params = [division, year]
+    where = f"{spec['qualifier']} > {spec['threshold']} AND division = ? AND year = ?"
+    if conference:
+        where += " AND conference = ?"
+        params.append(conference)
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {spec['select']} FROM {table} WHERE {where}", params)
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    values = {stat: [] for stat in spec['stats']}
+    own = {}
+    for row in rows:
+        player_values = own.setdefault(row['player_id'], {})
+        for stat in spec['stats']:
+            value = _to_float(row[stat])
+            if value is None:
+                continue
+            values[stat].append(value)
+            player_values.setdefault(stat, []).append(value)
+
+    return {
+        'count': len(rows),
+        'sorted': {stat: np.sort(np.asarray(vals, dtype=np.float64)) for stat, vals in values.items()},
+        'own': own,
+    }
+
+
+def score_player(population, table, player_id, player_row):
+    """
+    Percentile and rank of player_row against the population, excluding the
+    player's own rows. Returns {stat, stat_percentile, stat_rank} entries.
+    """
+    spec = POPULATIONS[table]
+    own = population['own'].get(player_id, {})
+    percentiles = {}
+    rankings = {}
+
+    for stat in spec['stats']:
+        pv = _to_float(player_row.get(stat))
+        vals = population['sorted'][stat]
+        if pv is None or not len(vals):
+            continue
+
+        lo = int(np.searchsorted(vals, pv - EPS, side='left'))
+        hi = int(np.searchsorted(vals, pv + EPS, side='right'))
+        below, equal, above = lo, hi - lo, len(vals) - hi
+
+        for v in own.get(stat, []):
+            if v < pv - EPS:
+                below -= 1
+            elif v > pv + EPS:
+                above -= 1
+            else:
+                equal -= 1
+
+        n = below + equal + above
+        if n <= 0:
+            continue
+
+        if stat in spec['reverse']:
+            worse, better = above, below
+        else:
+            worse, better = below, above
+
+        percentiles[f"{stat}_percentile"] = int(round((worse + 0.5 * equal) / n * 100.0))
+        percentiles[stat] = pv
+        rankings[f"{stat}_rank"] = int(round(1 + better + max(0, (equal - 1)) / 2.0))
+
+    return {**percentiles, **rankings}
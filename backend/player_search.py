@@ -0,0 +1,231 @@
+"""
+In-memory player name search index, rebuilt once per data version.
+
+Holds one entry per player (their latest roster year) sorted by normalized
+name, so typeahead lookups are a bisect for name/word prefixes plus a trigram
+posting-list intersection for infix matches, instead of LIKE '%q%' scans.
+
+Fuzzy lookups use a single-delete (SymSpell-style) map over the distinct name
+tokens, which finds one typo or adjacent transposition per name part without
+comparing the query against every name.
+"""
+import bisect
+import heapq
+import re
+import unicodedata
+
+import numpy as np
+
+from db import get_db_connection, cached_per_data_version
+
+_SEPARATORS = re.compile(r"[-_/.,]+")
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+FUZZY_MIN_TOKEN = 3
+FUZZY_MAX_DISTANCE = 2
+PREFIX_COMPLETION_DISTANCE = 0.5
+PREFIX_COMPLETION_LIMIT = 200
+MISSING_TOKEN_PENALTY = 3
+RECENCY_WEIGHT = 0.1
+TEAM_BONUS = 0.5
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    stripped = _SEPARATORS.sub(' ', stripped)
+    stripped = _NON_ALNUM.sub('', stripped)
+    return _SPACES.sub(' ', stripped).strip()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def single_deletes(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))} | {token}
+
+
+def edit_distance(a, b):
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)."""
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+class PlayerSearchIndex:
+    def __init__(self, players):
+        """players: iterable of dicts with at least player_id and playerName."""
+        keyed = []
+        for player in players:
+            norm = normalize_name(player['playerName'])
+            if norm:
+                keyed.append((norm, player['playerName'] or '', player))
+        keyed.sort(key=lambda item: (item[0], item[1]))
+
+        self.names = [norm for norm, _, _ in keyed]
+        self.players = [player for _, _, player in keyed]
+
+        self.token_players = {}
+        postings = {}
+        for idx, norm in enumerate(self.names):
+            for token in set(norm.split(' ')):
+                self.token_players.setdefault(token, []).append(idx)
+            for gram in trigrams(norm):
+                postings.setdefault(gram, []).append(idx)
+        self.vocab = sorted(self.token_players)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+        self.deletes = {}
+        for token in self.vocab:
+            if len(token) >= FUZZY_MIN_TOKEN:
+                for deleted in single_deletes(token):
+                    self.deletes.setdefault(deleted, []).append(token)
+
+        self.max_year = max((p.get('year') or 0 for p in self.players), default=0)
+
+    def __len__(self):
+        return len(self.players)
+
+    def _prefix_range(self, keys, q):
+        return bisect.bisect_left(keys, q), bisect.bisect_left(keys, q + '\uffff')
+
+    def search(self, query, limit=8):
+        """
+        Match order: exact name, name prefix, word prefix (e.g. last name),
+        then infix (3+ characters); alphabetical by normalized name within each.
+        """
+        q = normalize_name(query)
+        if not q:
+            return []
+
+        results = []
+        seen = set()
+
+        def take(indices):
+            for idx in indices:
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                results.append(idx)
+                if len(results) >= limit:
+                    return True
+            return False
+
+        lo, hi = self._prefix_range(self.names, q)
+        if take(range(lo, min(hi, lo + limit))):
+            return self._players(results)
+
+        lo, hi = self._prefix_range(self.vocab, q)
+        if lo < hi:
+            word_matches = heapq.nsmallest(
+                limit + len(results),
+                {idx for token in self.vocab[lo:hi] for idx in self.token_players[token]},
+            )
+            if take(word_matches):
+                return self._players(results)
+
+        if len(q) >= 3:
+            lists = []
+            for gram in trigrams(q):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    return self._players(results)
+                lists.append(posting)
+            lists.sort(key=len)
+            candidates = lists[0]
+            for posting in lists[1:]:
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+                if not len(candidates):
+                    break
+            take(int(idx) for idx in candidates if q in self.names[idx])
+
+        return self._players(results)
+
+    def _token_matches(self, token, is_last):
+        """Map player index -> best distance from token to one of their name parts."""
+        matches = {}
+        if token in self.token_players:
+            matches[token] = 0
+        if is_last:
+            lo, hi = self._prefix_range(self.vocab, token)
+            for completion in self.vocab[lo:min(hi, lo + PREFIX_COMPLETION_LIMIT)]:
+                matches.setdefault(completion, PREFIX_COMPLETION_DISTANCE)
+        if len(token) >= FUZZY_MIN_TOKEN:
+            for deleted in single_deletes(token):
+                for candidate in self.deletes.get(deleted, ()):
+                    if candidate not in matches:
+                        distance = edit_distance(token, candidate)
+                        if distance <= FUZZY_MAX_DISTANCE:
+                            matches[candidate] = distance
+
+        best = {}
+        for name_token, distance in matches.items():
+            for idx in self.token_players[name_token]:
+                if distance < best.get(idx, MISSING_TOKEN_PENALTY):
+                    best[idx] = distance
+        return best
+
+    def fuzzy_search(self, query, limit=8, team=None):
+        """
+        Typo-tolerant search. Each query word is matched to name parts within
+        one typo (or as a prefix, for the last word); players are scored by
+        summed distance, nudged toward recent seasons and the given team.
+        """
+        tokens = [t for t in normalize_name(query).split(' ') if t]
+        if not tokens:
+            return []
+
+        per_token = [
+            self._token_matches(token, i == len(tokens) - 1)
+            for i, token in enumerate(tokens)
+        ]
+        candidates = set.intersection(*(set(best) for best in per_token))
+        if not candidates:
+            candidates = set().union(*per_token)
+
+        def score(idx):
+            player = self.players[idx]
+            total = sum(best.get(idx, MISSING_TOKEN_PENALTY) for best in per_token)
+            total += (self.max_year - (player.get('year') or self.max_year)) * RECENCY_WEIGHT
+            if team and player.get('team') == team:
+                total -= TEAM_BONUS
+            return (total, idx)
+
+        return self._players(heapq.nsmallest(limit, candidates, key=score))
+
+    def _players(self, indices):
+        return [self.players[idx] for idx in indices]
+
+
+@cached_per_data_version
+def get_player_search_index():
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                player_id,
+                player_name AS playerName,
+                team_name AS team,
+                conference,
+                year
+            FROM player_latest
+        """)
+        players = [dict(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+    return PlayerSearchIndex(players)
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+
+
+def parse_fields(fields_param, allowed):
+    """
+    Parse a comma-separated fields= projection against a whitelist.
+
+    Returns None when no projection was requested; raises ValueError naming
+    any unknown fields.
+    """
+    if not fields_param:
+        return None
+    fields = []
+    for field in fields_param.split(','):
+        field = field.strip()
+        if field and field not in fields:
+            fields.append(field)
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not fields:
+        raise ValueError("fields must name at least one column")
+    return fields
+
+
+def encode_cursor(values):
+    """Opaque keyset cursor from the sort-key values of the last row returned."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, length=None):
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    padded = token + '=' * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or (length is not None and len(values) != length):
+        raise ValueError("Invalid cursor")
+    # Values are bound as SQL parameters, so only scalars are allowed
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,107 @@
+from flask import Response, current_app, request, stream_with_context
+
+STREAM_BATCH_SIZE = 1000
+
+COLUMNAR_MIMETYPE = 'application/vnd.d3dashboard.columnar+json'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+FORMAT_MIMETYPES = {
+    'json': 'application/json',
+    'columnar': COLUMNAR_MIMETYPE,
+    'ndjson': NDJSON_MIMETYPE,
+}
+RESPONSE_FORMATS = ('json', 'columnar')
+STREAMING_FORMATS = RESPONSE_FORMATS + ('ndjson',)
+
+
+def accepted_format(formats=RESPONSE_FORMATS):
+    """The format negotiated from the Accept header among formats ('json' when nothing better matches)."""
+    best = request.accept_mimetypes.best_match([FORMAT_MIMETYPES[fmt] for fmt in formats])
+    for fmt in formats:
+        if FORMAT_MIMETYPES[fmt] == best:
+            return fmt
+    return 'json'
+
+
+def response_format(formats=RESPONSE_FORMATS):
+    """
+    Requested list format: 'json' (array of objects, the default),
+    'columnar' via format=columnar or an Accept of COLUMNAR_MIMETYPE, or
+    'ndjson' (one object per line, streamed) on routes that allow it.
+    Raises ValueError for a format= not in formats.
+    """
+    fmt = request.args.get('format')
+    if fmt:
+        if fmt not in formats:
+            raise ValueError(f"Invalid format. Must be one of: {', '.join(formats)}")
+        return fmt
+    return accepted_format(formats)
+
+
+def fetch_rows(cursor):
+    """Column names and raw row tuples of an executed cursor (no sqlite3.Row wrapping)."""
+    cursor.row_factory = None
+    return [d[0] for d in cursor.description], cursor.fetchall()
+
+
+def rows_payload(columns, rows, fmt='json', width=None):
+    """
+    A list of row objects, or {columns, rows} for the columnar format, which
+    serializes the tuples as-is instead of repeating every key in every row.
+    width drops trailing helper columns.
+    """
+    if width is not None and width < len(columns):
+        columns = columns[:width]
+        rows = [row[:width] for row in rows]
+    if fmt == 'columnar':
+        return {'columns': columns, 'rows': rows}
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _batches(cursor, batch_size, fetched=()):
+    if fetched:
+        yield fetched
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def stream_json_array(conn, cursor, transform=dict, batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream an executed cursor as a JSON array, fetching batch_size rows at a
+    time so the full result is never held in worker memory. Closes conn when
+    the stream ends or the client disconnects.
+    """
+    def generate():
+        try:
+            yield '['
+            first = True
+            for rows in _batches(cursor, batch_size):
+                chunk = ','.join(current_app.json.dumps(transform(row)) for row in rows)
+                yield chunk if first else ',' + chunk
+                first = False
+            yield ']'
+        finally:
+            conn.close()
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def stream_ndjson(conn, cursor, transform=dict, batch_size=STREAM_BATCH_SIZE, header=None, fetched=()):
+    """
+    Stream an executed cursor as newline-delimited JSON, one row per line,
+    batch_size rows at a time. header (if given) is sent as the first line
+    and fetched rows already taken from the cursor go out before the rest.
+    Closes conn when the stream ends or the client disconnects.
+    """
+    def generate():
+        try:
+            if header is not None:
+                yield current_app.json.dumps(header) + '\n'
+            for rows in _batches(cursor, batch_size, fetched):
+                yield ''.join(current_app.json.dumps(transform(row)) + '\n' for row in rows)
+        finally:
+            conn.close()
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+import logging
+
+from flask import Blueprint, Response, current_app, g, jsonify, request
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException
+
+from middleware import require_api_auth, cache_key
+from middleware.rate_limiter import get_redis_bytes_client
+
+bp = Blueprint('batch', __name__, url_prefix='/api')
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_REQUESTS = 20
+BATCH_WORKERS = 4
+
+# File downloads; they never respond with JSON, whatever their format=
+NON_JSON_PREFIXES = ('/api/export/',)
+
+_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch')
+
+
+def _parse_sub_request(item):
+    """(path, args) for one batch entry: a URL string or {path, params}. Raises ValueError."""
+    if isinstance(item, str):
+        item = {'path': item}
+    if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+        raise ValueError("Each request must be a path string or an object with a path")
+    url = urlsplit(item['path'])
+    if not url.path.startswith('/api/'):
+        raise ValueError(f"Not an API path: {url.path}")
+    args = MultiDict(parse_qsl(url.query, keep_blank_values=True))
+    params = item.get('params') or {}
+    if not isinstance(params, dict):
+        raise ValueError("params must be an object")
+    for key, value in params.items():
+        args[key] = str(value)
+    # Reject non-JSON responses before their view runs (e.g. builds an export file).
+    # Sub-requests are sent with Accept: application/json, so only format= can ask for another.
+    if url.path.startswith(NON_JSON_PREFIXES) or args.get('format', 'json') != 'json':
+        raise ValueError("Only JSON responses can be batched")
+    return url.path, args
+
+
+def _match(adapter, path):
+    """(view function, view args), or an error (status, message) when the path isn't a GET route."""
+    try:
+        endpoint, view_args = adapter.match(path, method='GET')
+    except HTTPException as e:
+        return None, (e.code, e.description)
+    return (current_app.view_functions[endpoint], view_args), None
+
+
+def _dispatch(app, user, path, args, view, view_args):
+    """Run one sub-request through its view in a fresh request context; returns (status, JSON bytes)."""
+    with app.app_context():
+        g.batch_user = user
+        with app.test_request_context(path, query_string=args, headers={'Accept': 'application/json'}):
+            try:
+                response = app.make_response(view(**view_args))
+            except HTTPException as e:
+                response = e.get_response()
+            except Exception as e:
+                logger.error(f"Batch sub-request {path} failed: {e}")
+                return 500, app.json.dumps({"error": "Internal server error"}).encode()
+
+            if response.mimetype != 'application/json':
+                response.close()
+                return 400, app.json.dumps({"error": "Only JSON responses can be batched"}).encode()
+            # Read the body here: streamed responses need the request context
+            return response.status_code, response.get_data().rstrip(b'\n')
+
+
+@bp.post('/batch')
+@require_api_auth
+def batch():
+    """
+    Run several GET requests in one call
+    ---
+    tags:
+      - Batch
+    description: |
+      Takes a list of GET requests against other `/api` routes and returns
+      their responses, in order, as one JSON document. The batch is
+      authenticated and rate limited once; cached sub-responses are read
+      from the cache together and the rest run concurrently.
+
+      Each request is either a path with an optional query string or an
+      object `{path, params}`. Sub-responses must be JSON (no file or
+      ndjson formats).
+
+      ```json
+      {"requests": [
+        "/api/player/123",
+        {"path": "/api/player-years/123/3"},
+        {"path": "/api/leaderboards/splits/123", "params": {"start_year": 2024}}
+      ]}
+      ```
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            requests:
+              type: array
+              maxItems: 20
+              items: {}
+    responses:
+      200:
+        description: "{responses: [{status, body, cache}]} in request order"
+      400:
+        description: Invalid batch
+    """
+    payload = request.get_json(silent=True) or {}
+    items = payload.get('requests')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "requests must be a non-empty list"}), 400
+    if len(items) > MAX_BATCH_REQUESTS:
+        return jsonify({"error": f"At most {MAX_BATCH_REQUESTS} requests per batch"}), 400
+
+    adapter = current_app.url_map.bind_to_environ(request.environ)
+    app = current_app._get_current_object()
+    results = [None] * len(items)
+    pending = []
+
+    for i, item in enumerate(items):
+        try:
+            path, args = _parse_sub_request(item)
+        except ValueError as e:
+            results[i] = (400, app.json.dumps({"error": str(e)}).encode(), None)
+            continue
+        match, error = _match(adapter, path)
+        if error:
+            results[i] = (error[0], app.json.dumps({"error": error[1]}).encode(), None)
+            continue
+        view, view_args = match
+        key = None
+        if getattr(view, 'cache_ttl', None) is not None:
+            key = cache_key(view.cache_key_prefix or path, args)
+        pending.append((i, path, args, view, view_args, key))
+
+    client = get_redis_bytes_client()
+    keyed = [entry for entry in pending if entry[5] is not None]
+    if client and keyed:
+        try:
+            cached = client.mget([entry[5] for entry in keyed])
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+            cached = [None] * len(keyed)
+        for entry, body in zip(keyed, cached):
+            if body:
+                results[entry[0]] = (200, body.rstrip(b'\n'), 'HIT')
+
+    misses = [entry for entry in pending if results[entry[0]] is None]
+    futures = [
+        (i, key, _executor.submit(_dispatch, app, g.user, path, args, view, view_args))
+        for i, path, args, view, view_args, key in misses
+    ]
+    for i, key, future in futures:
+        status, body = future.result()
+        results[i] = (status, body, 'MISS' if key else None)
+
+    # Bodies are already serialized JSON; splice them in rather than re-encoding
+    parts = []
+    for status, body, cache in results:
+        meta = app.json.dumps({'status': status, 'cache': cache}).encode()
+        parts.append(meta[:-1] + b',"body":' + body + b'}')
+    return Response(b'{"responses":[' + b','.join(parts) + b']}\n', mimetype='application/json')
@@ -2,6 +2,15 @@ from flask import Blueprint, jsonify, request
 from config import MIN_YEAR, MAX_YEAR
 from db import get_db_connection
 from middleware import require_api_auth, cache_response
+from leaderboard_query import (
+    BATTING_PERCENTILES,
+    stat_columns, stat_sortable, percentile_columns, column_names, select_list,
+    parse_leaderboard_args, is_filtered, leaderboard_format, order_keys, leaderboard_clauses,
+    leaderboard_payload,
+)
+from request_params import parse_fields
+from responses import stream_ndjson
+from exports import EXPORT_FORMATS, export_response
 
 
 bp = Blueprint('batting', __name__, url_prefix='/api')
@@ -77,6 +86,64 @@ def get_batting():
         default: 3
         description: NCAA division (1, 2, or 3)
         example: 3
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+        example: "player_id,player_name,team_name,war,woba"
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar, ndjson, arrow, parquet, csv]
+        default: json
+        description: |
+          columnar returns {columns, rows} instead of one object per row.
+          ndjson streams one object per line (not with limit/offset/cursor).
+          arrow, parquet and csv return the whole division-year as a file
+          (one year only; other filters and paging are ignored)
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: min_pa
+        schema:
+          type: number
+        description: Minimum plate appearances
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by (default war)
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+        description: Rows to skip (paged requests)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
     responses:
       200:
         description: Array of player batting statistics with WAR percentiles
@@ -101,24 +168,42 @@ def get_batting():
     except ValueError:
         return jsonify({"error": "Invalid years format. Use single year or comma-separated list (e.g., '2024' or '2023,2024,MAX_YEAR')"}), 400
 
+    if request.args.get('format') in EXPORT_FORMATS:
+        if len(years) != 1:
+            return jsonify({"error": "File formats export one year at a time."}), 400
+        return export_response('batting', division, years[0], request.args['format'])
+
+    try:
+        options = parse_leaderboard_args(request.args, stat_sortable('batting', 'b', BATTING_PERCENTILES), 'min_pa')
+        percentiles = percentile_columns('batting', 'b', BATTING_PERCENTILES, is_filtered(options))
+        columns = stat_columns('batting', 'b', percentiles)
+        fields = parse_fields(request.args.get('fields'), column_names(columns))
+        keys = order_keys(options, [('b.war', True)], 'b.rowid')
+        fmt = leaderboard_format(options)
+        clauses = leaderboard_clauses(options, keys, 'b', 'pa')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     placeholders = ','.join(['?' for _ in years])
     query = f"""
-        SELECT *,
-               PERCENT_RANK() OVER (PARTITION BY year ORDER BY war) * 100 as war_percentile,
-               PERCENT_RANK() OVER (PARTITION BY year ORDER BY sos_adj_war) * 100 as sos_adj_war_percentile
+        SELECT {select_list(columns, fields)}{clauses['cursor_columns']}
         FROM batting b
-        WHERE b.division = ? AND b.year IN ({placeholders})
-        ORDER BY b.war DESC
+        WHERE b.division = ? AND b.year IN ({placeholders}){clauses['where']}
+        ORDER BY {clauses['order_by']}
+        {clauses['limit']}
     """
 
-    cursor.execute(query, [division] + years)
+    cursor.execute(query, [division] + years + clauses['params'])
+
+    if fmt == 'ndjson':
+        return stream_ndjson(conn, cursor)
 
-    data = [dict(row) for row in cursor.fetchall()]
+    payload = leaderboard_payload(cursor, options, keys, fmt)
     conn.close()
-    return jsonify(data)
+    return jsonify(payload)
 
 
 @bp.get('/batting_team')
@@ -189,6 +274,59 @@ def get_batting_team():
         default: 3
         description: NCAA division (1, 2, or 3)
         example: 3
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+        example: "team_name,conference,war"
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar, ndjson, arrow, parquet, csv]
+        default: json
+        description: |
+          columnar returns {columns, rows} instead of one object per row.
+          ndjson streams one object per line (not with limit/offset/cursor).
+          arrow, parquet and csv return the whole division-year as a file
+          (one year only; other filters and paging are ignored)
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by (default war)
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+        description: Rows to skip (paged requests)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
     responses:
       200:
         description: Array of team batting statistics with WAR percentiles
@@ -216,23 +354,41 @@ def get_batting_team():
                      "(e.g., '2024' or '2023,2024')"
         }), 400
 
+    if request.args.get('format') in EXPORT_FORMATS:
+        if len(years) != 1:
+            return jsonify({"error": "File formats export one year at a time."}), 400
+        return export_response('batting_team', division, years[0], request.args['format'])
+
+    try:
+        options = parse_leaderboard_args(request.args, stat_sortable('batting_team', 'bt', BATTING_PERCENTILES))
+        percentiles = percentile_columns('batting_team', 'bt', BATTING_PERCENTILES, is_filtered(options))
+        columns = stat_columns('batting_team', 'bt', percentiles)
+        fields = parse_fields(request.args.get('fields'), column_names(columns))
+        keys = order_keys(options, [('bt.war', True)], 'bt.rowid')
+        fmt = leaderboard_format(options)
+        clauses = leaderboard_clauses(options, keys, 'bt')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     placeholders = ','.join(['?' for _ in years])
     query = f"""
-        SELECT *,
-               PERCENT_RANK() OVER (PARTITION BY year ORDER BY war) * 100 as war_percentile,
-               PERCENT_RANK() OVER (PARTITION BY year ORDER BY sos_adj_war) * 100 as sos_adj_war_percentile
+        SELECT {select_list(columns, fields)}{clauses['cursor_columns']}
         FROM batting_team bt
-        WHERE bt.division = ? AND bt.year IN ({placeholders})
-        ORDER BY bt.war DESC
+        WHERE bt.division = ? AND bt.year IN ({placeholders}){clauses['where']}
+        ORDER BY {clauses['order_by']}
+        {clauses['limit']}
     """
 
-    cursor.execute(query, [division] + years)
-    data = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    cursor.execute(query, [division] + years + clauses['params'])
 
-    return jsonify(data)
+    if fmt == 'ndjson':
+        return stream_ndjson(conn, cursor)
+
+    payload = leaderboard_payload(cursor, options, keys, fmt)
+    conn.close()
+    return jsonify(payload)
 
 
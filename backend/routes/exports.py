@@ -0,0 +1,90 @@
+from flask import Blueprint, jsonify, request
+from config import MIN_YEAR, MAX_YEAR
+from middleware import require_api_auth
+from exports import EXPORT_FORMATS, EXPORT_TABLES, export_response
+
+
+bp = Blueprint('exports', __name__, url_prefix='/api')
+
+
+@bp.get('/export/<table>')
+@require_api_auth
+def get_export(table):
+    """
+    Download a stats table as a file
+    ---
+    tags:
+      - Exports
+    description: |
+      Returns one division-year of a stats table as an Arrow IPC, Parquet or
+      CSV file, with the same columns as the JSON endpoint. Files are built
+      once per data refresh and support Range requests.
+
+      Arrow and Parquet are served as CSV when the server has no Arrow
+      support; check the Content-Type.
+
+      ### Python Example
+
+      ```python
+      import io
+      import requests
+      import pandas as pd
+
+      API_KEY = "YOUR_API_KEY"
+
+      response = requests.get(
+          "https://d3-dashboard.com/api/export/batting",
+          headers={"X-API-Key": API_KEY},
+          params={"year": 2024, "division": 3, "format": "parquet"}
+      )
+      df = pd.read_parquet(io.BytesIO(response.content))
+      ```
+
+    parameters:
+      - in: path
+        name: table
+        required: true
+        schema:
+          type: string
+          enum: [batting, batting_team, pitching, pitching_team, baserunning, batted_ball,
+                 situational_batting, situational_pitching, splits_batting, splits_pitching]
+      - in: query
+        name: year
+        schema:
+          type: integer
+        example: 2024
+      - in: query
+        name: division
+        schema:
+          type: integer
+          enum: [1, 2, 3]
+        default: 3
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [parquet, arrow, csv]
+        default: parquet
+    responses:
+      200:
+        description: The export file
+      400:
+        description: Invalid parameters
+      404:
+        description: Unknown table
+    """
+    if table not in EXPORT_TABLES:
+        return jsonify({"error": f"Unknown table: {table}"}), 404
+
+    year = request.args.get('year', type=int, default=MAX_YEAR)
+    division = request.args.get('division', type=int, default=3)
+    fmt = request.args.get('format', 'parquet')
+
+    if division not in [1, 2, 3]:
+        return jsonify({"error": "Invalid division. Must be 1, 2, or 3."}), 400
+    if year < MIN_YEAR or year > MAX_YEAR:
+        return jsonify({"error": f"Invalid year. Must be between {MIN_YEAR} and {MAX_YEAR}."}), 400
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    return export_response(table, division, year, fmt)
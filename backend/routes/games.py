@@ -1,14 +1,74 @@
 from flask import Blueprint, jsonify, request
+import logging
 import sqlite3
 from db import get_db_connection
 from config import MIN_YEAR
-from middleware import require_api_auth
+from game_analytics import game_analytics
+from middleware import require_api_auth, cache_response
+from responses import STREAM_BATCH_SIZE, response_format, stream_ndjson
 
 bp = Blueprint('games', __name__, url_prefix='/api')
 
 
+def _game_plays(conn, contest_id, year):
+    """Cursor over a game's plays, in play order, with batter and pitcher names."""
+    return conn.execute(
+        """
+        SELECT DISTINCT
+            p.home_team, p.away_team, p.home_score, p.away_score, p.date as game_date,
+            p.inning, p.top_inning, p.contest_id, p.description,
+            p.home_win_exp_before, p.home_win_exp_after, p.wpa, p.run_expectancy_delta,
+            p.batter_id, p.pitcher_id,
+            p.li, p.home_score_after, p.away_score_after,
+            p.play_id,
+            n.batter_name,
+            n.pitcher_name, p.woba, p.division,
+            g.attendance
+        FROM pbp p
+        LEFT JOIN game_plays n
+            ON n.contest_id = p.contest_id
+            AND n.year = p.year
+            AND n.play_id = p.play_id
+        LEFT JOIN game_summary g
+            ON g.game_date = p.date
+            AND g.division = p.division
+            AND g.contest_id = p.contest_id
+            AND g.year = p.year
+        WHERE p.contest_id = ?
+        AND p.year = ?
+        ORDER BY CAST(p.play_id AS INTEGER) ASC, p.inning ASC, p.top_inning DESC
+        """,
+        (contest_id, year),
+    )
+
+
+def _game_info(conn, first_play, year):
+    """Game header (teams, org ids, date, attendance) from a game's first play and game_summary."""
+    first_play = dict(first_play)
+    summary = conn.execute(
+        """
+        SELECT home_org_id, away_org_id, attendance
+        FROM game_summary
+        WHERE game_date = ? AND division = ? AND contest_id = ? AND year = ?
+        """,
+        (first_play['game_date'], first_play['division'], first_play['contest_id'], year),
+    ).fetchone()
+
+    return {
+        'home_team': first_play['home_team'],
+        'away_team': first_play['away_team'],
+        'game_date': first_play['game_date'],
+        'contest_id': first_play['contest_id'],
+        'division': first_play['division'],
+        'attendance': summary['attendance'] if summary else None,
+        'home_team_id': summary['home_org_id'] if summary else None,
+        'away_team_id': summary['away_org_id'] if summary else None,
+    }
+
+
 @bp.get('/games/<int:year>/<contest_id>')
 @require_api_auth
+@cache_response(ttl=300)
 def get_game(year, contest_id):
     """
     Get detailed game data with play-by-play
@@ -26,96 +86,99 @@ def get_game(year, contest_id):
         schema:
           type: string
         required: true
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, ndjson]
+        default: json
+        description: ndjson streams the game info (without plays) on the first line, then one play per line
     responses:
       200:
         description: Game info with all plays, win expectancy, leverage index
+      400:
+        description: Invalid parameters
       404:
         description: Game not found
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    try:
+        fmt = response_format(('json', 'ndjson'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    cursor.execute(
-        """
-        SELECT DISTINCT
-            p.home_team, p.away_team, p.home_score, p.away_score, p.date as game_date,
-            p.inning, p.top_inning, p.contest_id, p.description,
-            p.home_win_exp_before, p.home_win_exp_after, p.wpa, p.run_expectancy_delta,
-            p.batter_id, p.pitcher_id,
-            p.li, p.home_score_after, p.away_score_after,
-            p.play_id,
-            r_batter.player_name as batter_name,
-            r_pitcher.player_name as pitcher_name, p.woba, p.division,
-            s.attendance as attendance
-        FROM pbp p
-        LEFT JOIN rosters r_batter
-            ON p.batter_id = r_batter.player_id
-            AND p.year = r_batter.year
-            AND p.division = r_batter.division
-        LEFT JOIN rosters r_pitcher
-            ON p.pitcher_id = r_pitcher.player_id
-            AND p.year = r_pitcher.year
-            AND p.division = r_pitcher.division
-        LEFT JOIN schedules s
-            ON s.contest_id = p.contest_id
-            AND s.year = p.year
-            AND s.division = p.division
-        WHERE p.contest_id = ?
-        AND p.year = ?
-        ORDER BY CAST(p.play_id AS INTEGER) ASC, p.inning ASC, p.top_inning DESC
-        """,
-        (contest_id, year),
-    )
+    conn = get_db_connection()
+    cursor = _game_plays(conn, contest_id, year)
 
-    plays = [dict(row) for row in cursor.fetchall()]
+    # Streamed games only hold the first batch here; the rest follows from the cursor
+    plays = cursor.fetchmany(STREAM_BATCH_SIZE) if fmt == 'ndjson' else cursor.fetchall()
 
     if not plays:
+        conn.close()
         return jsonify({"error": "Game not found"}), 404
 
-    home_team = plays[0]['home_team']
-    away_team = plays[0]['away_team']
-    division = plays[0]['division']
+    game_info = _game_info(conn, plays[0], year)
 
-    cursor.execute(
-        """
-        SELECT MAX(org_id) AS org_id
-        FROM rosters
-        WHERE team_name = ? AND year = ? AND division = ?
-        """,
-        (home_team, year, division),
-    )
-    home_row = cursor.fetchone()
-    home_team_id = home_row["org_id"] if home_row and "org_id" in home_row.keys() else None
+    if fmt == 'ndjson':
+        return stream_ndjson(conn, cursor, header=game_info, fetched=plays)
 
-    cursor.execute(
-        """
-        SELECT MAX(org_id) AS org_id
-        FROM rosters
-        WHERE team_name = ? AND year = ? AND division = ?
-        """,
-        (away_team, year, division),
-    )
-    away_row = cursor.fetchone()
-    away_team_id = away_row["org_id"] if away_row and "org_id" in away_row.keys() else None
-
-    game_info = {
-        'home_team': home_team,
-        'away_team': away_team,
-        'game_date': plays[0]['game_date'],
-        'contest_id': plays[0]['contest_id'],
-        'division': division,
-        'attendance': plays[0].get('attendance') if isinstance(plays[0], dict) else None,
-        'home_team_id': home_team_id,
-        'away_team_id': away_team_id,
-        'plays': plays,
-    }
+    game_info['plays'] = [dict(row) for row in plays]
 
     conn.close()
     return jsonify(game_info)
 
 
+@bp.get('/games/<int:year>/<contest_id>/summary')
+@require_api_auth
+@cache_response(ttl=300)
+def get_game_summary(year, contest_id):
+    """
+    Get game analytics without the play-by-play
+    ---
+    tags:
+      - Games
+    description: |
+      Everything the game page derives from the play list, computed once on
+      the server: the game info, final score and line score, the biggest
+      WPA swings, a win-expectancy curve downsampled to at most ~60 points
+      (`play_index` -1 is pregame), batting and pitching box scores with
+      WPA and RE24 per player, lead changes and the leverage-weighted
+      excitement index.
+    parameters:
+      - in: path
+        name: year
+        schema:
+          type: integer
+        required: true
+      - in: path
+        name: contest_id
+        schema:
+          type: string
+        required: true
+    responses:
+      200:
+        description: Game info and analytics
+      404:
+        description: Game not found
+    """
+    conn = get_db_connection()
+    try:
+        plays = _game_plays(conn, contest_id, year).fetchall()
+        if not plays:
+            return jsonify({"error": "Game not found"}), 404
+        game_info = _game_info(conn, plays[0], year)
+    except sqlite3.Error as e:
+        logging.error(f"Database error in get_game_summary: {e}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+    finally:
+        conn.close()
+
+    game_info.update(game_analytics(plays, game_info['home_team'], game_info['away_team']))
+    return jsonify(game_info)
+
+
 @bp.get('/games')
 @require_api_auth
+@cache_response(ttl=300)
 def get_games_by_date():
     """
     Get games by date
@@ -186,46 +249,21 @@ def get_games_by_date():
 
         cursor.execute(
             """
-            WITH team_org AS (
-                SELECT team_name, year, division, MAX(org_id) AS org_id
-                FROM rosters
-                GROUP BY team_name, year, division
-            ),
-            games AS (
-                SELECT 
-                    p.contest_id,
-                    p.year,
-                    p.home_team,
-                    p.away_team,
-                    MAX(p.home_score_after) AS home_score,
-                    MAX(p.away_score_after) AS away_score,
-                    p.date AS game_date
-                FROM pbp p
-                WHERE p.date = ? AND p.division = ?
-                GROUP BY p.contest_id, p.year, p.home_team, p.away_team, p.date
-            )
-            SELECT 
-                g.contest_id,
-                g.year,
-                g.home_team,
-                g.away_team,
-                g.home_score,
-                g.away_score,
-                g.game_date,
-                rh.org_id AS home_org_id,
-                ra.org_id AS away_org_id
-            FROM games g
-            LEFT JOIN team_org rh
-                ON rh.team_name = g.home_team
-                AND rh.year = g.year
-                AND rh.division = ?
-            LEFT JOIN team_org ra
-                ON ra.team_name = g.away_team
-                AND ra.year = g.year
-                AND ra.division = ?
-            ORDER BY g.contest_id
+            SELECT
+                contest_id,
+                year,
+                home_team,
+                away_team,
+                home_score,
+                away_score,
+                game_date,
+                home_org_id,
+                away_org_id
+            FROM game_summary
+            WHERE game_date = ? AND division = ?
+            ORDER BY contest_id
             """,
-            (game_date, division, division, division),
+            (game_date, division),
         )
 
         games = [dict(row) for row in cursor.fetchall()]
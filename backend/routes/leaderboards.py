@@ -1,11 +1,145 @@
 from flask import Blueprint, jsonify, request
 import logging
 import sqlite3
-from db import get_db_connection
+from db import get_db_connection, cached_per_data_version
 from config import MIN_YEAR, MAX_YEAR
 from middleware import require_api_auth, cache_response
+from leaderboard_query import (
+    column_names, sortable_columns, select_list,
+    parse_leaderboard_args, order_keys, leaderboard_clauses, leaderboard_payload,
+)
+from request_params import parse_fields
+from responses import response_format, fetch_rows, rows_payload
 
 bp = Blueprint('leaderboards', __name__, url_prefix='/api/leaderboards')
+player_bp = Blueprint('player_leaderboards', __name__, url_prefix='/api/player')
+
+
+VALUE_COLUMNS = [
+    'player_id', 'player_name', 'team_name', 'conference', 'division', 'year', 'pa', 'ip',
+    'batting_war', 'pitching_war', 'total_war',
+    'batting_wpa', 'pitching_wpa', 'total_wpa',
+    'batting_wpa_li', 'pitching_wpa_li', 'total_wpa_li',
+    'batting_rea', 'pitching_rea', 'total_rea',
+    'batting_clutch', 'pitching_clutch', 'total_clutch',
+    'batting_war_percentile', 'pitching_war_percentile', 'total_war_percentile',
+]
+
+
+BASERUNNING_COLUMNS = [
+    'player_id', 'player_name', 'team_name', 'conference', 'division', 'year',
+    'baserunning', 'wsb', 'wgdp', 'wteb', 'picked', 'sb', 'cs', 'sb_pct',
+    'opportunities', 'outs_ob', 'ebt',
+    ('xbt_pct', 'CASE WHEN opportunities > 0 THEN ROUND((ebt * 100.0 / opportunities), 1) ELSE 0 END'),
+]
+
+
+ROLLING_COLUMNS = [
+    'player_id', 'player_name', 'team_name', 'conference', 'team_org_id',
+    ('woba_now', 'ROUND(woba_now, 3)'),
+    ('woba_then', 'ROUND(woba_then, 3)'),
+    ('woba_change', 'ROUND(delta, 3)'),
+]
+
+
+@cached_per_data_version
+def available_rolling_windows(player_type):
+    """Window sizes built into rolling_leaderboard for a player type."""
+    conn = get_db_connection()
+    try:
+        return [row[0] for row in conn.execute(
+            "SELECT DISTINCT window FROM rolling_leaderboard WHERE player_type = ? ORDER BY window",
+            (player_type,)
+        )]
+    finally:
+        conn.close()
+
+
+SITUATIONAL_BATTING_COLUMNS = [
+    'sb.player_id', 'sb.player_name', 'sb.team_name', 'sb.conference', 'sb.division',
+    'sb.year', 'sb.woba_overall', 'sb.woba_risp', 'sb.woba_high_leverage',
+    'sb.woba_low_leverage', 'sb.pa_overall', 'sb.pa_risp', 'sb.pa_high_leverage',
+    'sb.pa_low_leverage', 'sb.ba_overall', 'sb.ba_high_leverage', 'sb.ba_low_leverage',
+    'sb.ba_risp', 'sb.re24_overall', 'sb.re24_high_leverage', 'sb.re24_low_leverage',
+    'sb.re24_risp', 'sb.clutch', 'b.wpa', 'b.wpa_li', 'b.rea',
+    ('batting_war', 'b.war'),
+    ('pitching_war', 'COALESCE(p.war, 0)'),
+    ('pitching_wpa', 'COALESCE(p.pwpa, 0)'),
+    ('pitching_wpa_li', 'COALESCE(p.pwpa_li, 0)'),
+    ('pitching_rea', 'COALESCE(p.prea, 0)'),
+    ('pitching_clutch', 'COALESCE(p.clutch, 0)'),
+    ('total_war', 'ROUND(b.war + COALESCE(p.war, 0), 1)'),
+    ('total_wpa', 'ROUND(b.wpa + COALESCE(p.pwpa, 0), 1)'),
+    ('total_wpa_li', 'ROUND(b.wpa_li + COALESCE(p.pwpa_li, 0), 1)'),
+    ('total_rea', 'ROUND(b.rea + COALESCE(p.prea, 0), 1)'),
+    ('total_clutch', 'ROUND(sb.clutch + COALESCE(p.clutch, 0), 1)'),
+]
+
+
+SITUATIONAL_BATTING_SOURCE = """situational_batting sb
+    LEFT JOIN batting b ON sb.player_id = b.player_id AND sb.year = b.year AND sb.division = b.division
+    LEFT JOIN pitching p ON sb.player_id = p.player_id AND sb.year = p.year AND sb.division = p.division"""
+
+
+SITUATIONAL_PITCHING_COLUMNS = [
+    'sp.player_id', 'sp.player_name', 'sp.team_name', 'sp.conference', 'sp.division',
+    'sp.year', 'sp.woba_overall', 'sp.woba_risp', 'sp.woba_high_leverage',
+    'sp.woba_low_leverage', 'sp.pa_overall', 'sp.pa_risp', 'sp.pa_high_leverage',
+    'sp.pa_low_leverage', 'sp.ba_overall', 'sp.ba_high_leverage', 'sp.ba_low_leverage',
+    'sp.ba_risp', 'sp.re24_overall', 'sp.re24_high_leverage', 'sp.re24_low_leverage',
+    'sp.re24_risp', 'sp.clutch', 'p.pwpa', 'p.pwpa_li', 'p.prea',
+    ('pitching_war', 'p.war'),
+    ('batting_war', 'COALESCE(b.war, 0)'),
+    ('batting_wpa', 'COALESCE(b.wpa, 0)'),
+    ('batting_wpa_li', 'COALESCE(b.wpa_li, 0)'),
+    ('batting_rea', 'COALESCE(b.rea, 0)'),
+    ('batting_clutch', 'COALESCE(b.clutch, 0)'),
+    ('total_war', 'ROUND(p.war + COALESCE(b.war, 0), 1)'),
+    ('total_wpa', 'ROUND(p.pwpa + COALESCE(b.wpa, 0), 1)'),
+    ('total_wpa_li', 'ROUND(p.pwpa_li + COALESCE(b.wpa_li, 0), 1)'),
+    ('total_rea', 'ROUND(p.prea + COALESCE(b.rea, 0), 1)'),
+    ('total_clutch', 'ROUND(sp.clutch + COALESCE(b.clutch, 0), 1)'),
+]
+
+
+SITUATIONAL_PITCHING_SOURCE = """situational_pitching sp
+    LEFT JOIN pitching p ON sp.player_id = p.player_id AND sp.year = p.year AND sp.division = p.division
+    LEFT JOIN batting b ON sp.player_id = b.player_id AND sp.year = b.year AND sp.division = b.division"""
+
+
+SPLITS_BATTING_COLUMNS = [
+    'player_id', 'player_name', 'team_name', 'conference', 'division', 'year',
+    'pa_overall', 'ba_overall', 'ob_pct_overall', 'slg_pct_overall', 'woba_overall',
+    'pa_vs_rhp', 'ba_vs_rhp', 'ob_pct_vs_rhp', 'slg_pct_vs_rhp', 'woba_vs_rhp',
+    'pa_vs_lhp', 'ba_vs_lhp', 'ob_pct_vs_lhp', 'slg_pct_vs_lhp', 'woba_vs_lhp',
+]
+
+
+SPLITS_PITCHING_COLUMNS = [
+    'player_id', 'player_name', 'team_name', 'conference', 'division', 'year',
+    'pa_overall', 'ba_overall', 'ob_pct_overall', 'slg_pct_overall', 'woba_overall',
+    'pa_vs_rhh', 'ba_vs_rhh', 'ob_pct_vs_rhh', 'slg_pct_vs_rhh', 'woba_vs_rhh',
+    'pa_vs_lhh', 'ba_vs_lhh', 'ob_pct_vs_lhh', 'slg_pct_vs_lhh', 'woba_vs_lhh',
+]
+
+
+BATTED_BALL_COLUMNS = [
+    'player_id', 'player_name', 'team_name', 'conference', 'division', 'year', 'count',
+    'batter_hand', 'pull_pct', 'oppo_pct', 'middle_pct', 'gb_pct', 'fb_pct', 'ld_pct',
+    'pop_pct', 'pull_air_pct', 'oppo_gb_pct',
+]
+
+
+# kind -> (columns, FROM clause, alias of the player_id/year/division columns)
+PLAYER_LEADERBOARDS = {
+    'value': (VALUE_COLUMNS, 'value_leaderboard', None),
+    'baserunning': (BASERUNNING_COLUMNS, 'baserunning', None),
+    'situational': (SITUATIONAL_BATTING_COLUMNS, SITUATIONAL_BATTING_SOURCE, 'sb'),
+    'situational_pitcher': (SITUATIONAL_PITCHING_COLUMNS, SITUATIONAL_PITCHING_SOURCE, 'sp'),
+    'splits': (SPLITS_BATTING_COLUMNS, 'splits_batting', None),
+    'splits_pitcher': (SPLITS_PITCHING_COLUMNS, 'splits_pitching', None),
+    'batted_ball': (BATTED_BALL_COLUMNS, 'batted_ball', None),
+}
 
 
 @bp.get('/value')
@@ -59,6 +193,54 @@ def get_value_leaderboard(player_id=None):
           enum: [1, 2, 3]
         default: 3
         description: NCAA division
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by (default total_war)
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+        description: Rows to skip (paged requests)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Value stats (WAR, WPA, REA, Clutch)
@@ -83,115 +265,49 @@ def get_value_leaderboard(player_id=None):
     except ValueError:
         return jsonify({"error": "Invalid year format"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(VALUE_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(VALUE_COLUMNS))
+        keys = order_keys(options, [('total_war', True)], 'rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        # A single season is an equality, so the (division, year, total_war) index also gives the order
+        if start_year == end_year:
+            year_filter = "year = ?"
+            params = [division, start_year]
+        else:
+            year_filter = "year BETWEEN ? AND ?"
+            params = [division, start_year, end_year]
         player_filter = ""
-        params = [division, start_year, end_year, division, start_year, end_year]
-        
         if player_id:
-            player_filter = "WHERE player_id = ?"
+            player_filter = "AND player_id = ?"
             params.append(player_id)
 
         cursor.execute(f"""
-            WITH batting_data AS (
-                SELECT
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    pa,
-                    war as batting_war,
-                    wpa as batting_wpa,
-                    wpa_li as batting_wpa_li,
-                    rea as batting_rea,
-                    clutch as batting_clutch
-                FROM batting
-                WHERE division = ? AND year BETWEEN ? AND ?
-            ),
-            pitching_data AS (
-                SELECT
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    ip,
-                    war as pitching_war,
-                    pwpa as pitching_wpa,
-                    pwpa_li as pitching_wpa_li,
-                    prea as pitching_rea,
-                    clutch as pitching_clutch
-                FROM pitching
-                WHERE division = ? AND year BETWEEN ? AND ?
-            ),
-            combined AS (
-                SELECT 
-                    COALESCE(b.player_id, p.player_id) as player_id,
-                    COALESCE(b.player_name, p.player_name) as player_name,
-                    COALESCE(b.team_name, p.team_name) as team_name,
-                    COALESCE(b.conference, p.conference) as conference,
-                    COALESCE(b.division, p.division) as division,
-                    COALESCE(b.year, p.year) as year,
-                    COALESCE(b.pa, 0) as pa,
-                    COALESCE(p.ip, 0) as ip,
-                    COALESCE(b.batting_war, 0) as batting_war,
-                    COALESCE(p.pitching_war, 0) as pitching_war,
-                    COALESCE(b.batting_wpa, 0) as batting_wpa,
-                    COALESCE(p.pitching_wpa, 0) as pitching_wpa,
-                    COALESCE(b.batting_wpa_li, 0) as batting_wpa_li,
-                    COALESCE(p.pitching_wpa_li, 0) as pitching_wpa_li,
-                    COALESCE(b.batting_rea, 0) as batting_rea,
-                    COALESCE(p.pitching_rea, 0) as pitching_rea,
-                    COALESCE(b.batting_clutch, 0) as batting_clutch,
-                    COALESCE(p.pitching_clutch, 0) as pitching_clutch
-                FROM batting_data b
-                FULL OUTER JOIN pitching_data p 
-                    ON b.player_id = p.player_id 
-                    AND b.year = p.year
-            )
-            SELECT 
-                player_id,
-                player_name,
-                team_name,
-                conference,
-                division,
-                year,
-                pa,
-                ip,
-                batting_war,
-                pitching_war,
-                ROUND(batting_war + pitching_war, 1) as total_war,
-                batting_wpa,
-                pitching_wpa,
-                ROUND(batting_wpa + pitching_wpa, 1) as total_wpa,
-                batting_wpa_li,
-                pitching_wpa_li,
-                ROUND(batting_wpa_li + pitching_wpa_li, 1) as total_wpa_li,
-                batting_rea,
-                pitching_rea,
-                ROUND(batting_rea + pitching_rea, 1) as total_rea,
-                batting_clutch,
-                pitching_clutch,
-                ROUND(batting_clutch + pitching_clutch, 1) as total_clutch,
-                PERCENT_RANK() OVER (PARTITION BY year ORDER BY batting_war) * 100 as batting_war_percentile,
-                PERCENT_RANK() OVER (PARTITION BY year ORDER BY pitching_war) * 100 as pitching_war_percentile,
-                PERCENT_RANK() OVER (PARTITION BY year ORDER BY ROUND(batting_war + pitching_war, 1)) * 100 as total_war_percentile
-            FROM combined
-            {player_filter}
-            ORDER BY total_war DESC
-        """, params)
-
-        results = [dict(row) for row in cursor.fetchall()]
-        
-        if player_id and not results:
-            return jsonify({"error": "Player not found"}), 404
-            
-        return jsonify(results)
+            SELECT {select_list(VALUE_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM value_leaderboard
+            WHERE division = ?
+                AND {year_filter}
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        payload = leaderboard_payload(cursor, options, keys, fmt)
+
+        if player_id:
+            rows = payload if isinstance(payload, list) else payload.get('items', payload.get('rows'))
+            if not rows:
+                return jsonify({"error": "Player not found"}), 404
+
+        return jsonify(payload)
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_value_leaderboard: {e}")
@@ -233,6 +349,53 @@ def get_player_baserunning(player_id=None):
           type: integer
           enum: [1, 2, 3]
         default: 3
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Baserunning stats including SB, CS, wSB, wGDP, wTEB
@@ -255,72 +418,36 @@ def get_player_baserunning(player_id=None):
     if start_year < MIN_YEAR or end_year > MAX_YEAR or start_year > end_year:
         return jsonify({"error": "Invalid year range"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(BASERUNNING_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(BASERUNNING_COLUMNS))
+        keys = order_keys(options, [('year', True), ('baserunning', True)], 'rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        params = [division, start_year, end_year]
+        player_filter = ""
         if player_id:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    baserunning,
-                    wsb,
-                    wgdp,
-                    wteb,
-                    picked,
-                    sb,
-                    cs,
-                    sb_pct,
-                    opportunities,
-                    outs_ob,
-                    ebt,
-                    CASE 
-                        WHEN opportunities > 0 THEN ROUND((ebt * 100.0 / opportunities), 1)
-                        ELSE 0
-                    END AS xbt_pct
-                FROM baserunning
-                WHERE division = ? 
-                    AND year BETWEEN ? AND ?
-                    AND player_id = ?
-                ORDER BY year DESC, baserunning DESC
-            """, (division, start_year, end_year, player_id))
-        else:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    baserunning,
-                    wsb,
-                    wgdp,
-                    wteb,
-                    picked,
-                    sb,
-                    cs,
-                    sb_pct,
-                    opportunities,
-                    outs_ob,
-                    ebt,
-                    CASE 
-                        WHEN opportunities > 0 THEN ROUND((ebt * 100.0 / opportunities), 1)
-                        ELSE 0
-                    END AS xbt_pct
-                FROM baserunning
-                WHERE division = ? 
-                    AND year BETWEEN ? AND ?
-                ORDER BY year DESC, baserunning DESC
-            """, (division, start_year, end_year))
-
-        results = [dict(row) for row in cursor.fetchall()]
-        return jsonify(results)
+            player_filter = "AND player_id = ?"
+            params.append(player_id)
+
+        cursor.execute(f"""
+            SELECT {select_list(BASERUNNING_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM baserunning
+            WHERE division = ? 
+                AND year BETWEEN ? AND ?
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        return jsonify(leaderboard_payload(cursor, options, keys, fmt))
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_baserunning: {e}")
@@ -330,7 +457,97 @@ def get_player_baserunning(player_id=None):
 
 
 @bp.get('/rolling')
+@require_api_auth
+@cache_response(ttl=300)
 def get_rolling_leaderboard():
+    """
+    Get rolling wOBA leaderboard
+    ---
+    tags:
+      - Leaderboards
+    description: |
+      Change in each player's rolling wOBA over their last `window` plate
+      appearances (batters) or batters faced (pitchers), for their latest
+      season in the division.
+    parameters:
+      - in: query
+        name: division
+        schema:
+          type: integer
+          enum: [1, 2, 3]
+        default: 3
+      - in: query
+        name: window
+        schema:
+          type: integer
+        default: 25
+        description: Rolling window size (25, 50 or 100)
+      - in: query
+        name: player_type
+        schema:
+          type: string
+          enum: [batter, pitcher]
+        default: batter
+      - in: query
+        name: sort_order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+        description: Order by woba_change
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by instead of woba_change (direction from order)
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response also has next_cursor
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns items as {columns, rows} instead of one object per row
+    responses:
+      200:
+        description: "{items, window, player_type} (plus next_cursor when paged)"
+      400:
+        description: Invalid parameters
+    """
     division = request.args.get('division', type=int, default=3)
     window = request.args.get('window', type=int, default=25)
     sort_order = request.args.get('sort_order', default='desc')
@@ -338,116 +555,49 @@ def get_rolling_leaderboard():
 
     if division not in [1, 2, 3]:
         return jsonify({"error": "Invalid division. Must be 1, 2, or 3."}), 400
-    if window not in [25, 50, 100]:
-        return jsonify({"error": "Invalid window value. Must be 25, 50, or 100."}), 400
     if sort_order.lower() not in ['asc', 'desc']:
         return jsonify({"error": "Invalid sort_order. Must be 'asc' or 'desc'."}), 400
     if player_type.lower() not in ['batter', 'pitcher']:
         return jsonify({"error": "Invalid player_type. Must be 'batter' or 'pitcher'."}), 400
+    windows = available_rolling_windows(player_type.lower())
+    if window not in windows:
+        return jsonify({"error": f"Invalid window value. Must be one of: {', '.join(map(str, windows))}."}), 400
+
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(ROLLING_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(ROLLING_COLUMNS))
+        keys = order_keys(options, [('delta', sort_order.lower() == 'desc')], 'rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
-        if player_type.lower() == 'batter':
-            cursor.execute(f"""
-                WITH latest_batting AS (
-                    SELECT b.*
-                    FROM batting b
-                    JOIN (
-                        SELECT player_id, MAX(year) AS max_year
-                        FROM batting
-                        WHERE division = ?
-                        GROUP BY player_id
-                    ) m ON m.player_id = b.player_id AND m.max_year = b.year
-                    WHERE b.division = ?
-                ),
-                team_org AS (
-                    SELECT team_name, year, division, MAX(org_id) AS org_id
-                    FROM rosters
-                    GROUP BY team_name, year, division
-                )
-                SELECT 
-                    r.player_id,
-                    b.player_name,
-                    b.team_name,
-                    b.conference,
-                    COALESCE(t.org_id, NULL) AS team_org_id,
-                    ROUND(r."{window}_now", 3) as woba_now,
-                    ROUND(r."{window}_then", 3) as woba_then,
-                    ROUND(r."{window}_delta", 3) as woba_change
-                FROM rolling_batting r
-                JOIN latest_batting b ON r.player_id = b.player_id
-                LEFT JOIN team_org t 
-                    ON t.team_name = b.team_name 
-                    AND t.year = b.year 
-                    AND t.division = b.division
-                WHERE r.player_id IS NOT NULL
-                    AND r."{window}_now" IS NOT NULL 
-                    AND r."{window}_then" IS NOT NULL
-                ORDER BY r."{window}_delta" {'DESC' if sort_order.lower() == 'desc' else 'ASC'}
-            """, (division, division))
-        else:
-            cursor.execute(f"""
-                WITH latest_pitching AS (
-                    SELECT p.*
-                    FROM pitching p
-                    JOIN (
-                        SELECT player_id, MAX(year) AS max_year
-                        FROM pitching
-                        WHERE division = ?
-                        GROUP BY player_id
-                    ) m ON m.player_id = p.player_id AND m.max_year = p.year
-                    WHERE p.division = ?
-                ),
-                team_org AS (
-                    SELECT team_name, year, division, MAX(org_id) AS org_id
-                    FROM rosters
-                    GROUP BY team_name, year, division
-                )
-                SELECT 
-                    r.player_id,
-                    p.player_name,
-                    p.team_name,
-                    p.conference,
-                    COALESCE(t.org_id, NULL) AS team_org_id,
-                    ROUND(r."{window}_now", 3) as woba_now,
-                    ROUND(r."{window}_then", 3) as woba_then,
-                    ROUND(r."{window}_delta", 3) as woba_change
-                FROM rolling_pitching r
-                JOIN latest_pitching p ON r.player_id = p.player_id
-                LEFT JOIN team_org t 
-                    ON t.team_name = p.team_name 
-                    AND t.year = p.year 
-                    AND t.division = p.division
-                WHERE r.player_id IS NOT NULL
-                    AND r."{window}_now" IS NOT NULL 
-                    AND r."{window}_then" IS NOT NULL
-                ORDER BY r."{window}_delta" {'DESC' if sort_order.lower() == 'desc' else 'ASC'}
-            """, (division, division))
-
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'player_id': row[0],
-                'player_name': row[1],
-                'team_name': row[2],
-                'conference': row[3],
-                'team_org_id': row[4],
-                'woba_now': row[5],
-                'woba_then': row[6],
-                'woba_change': row[7]
-            })
-
-        return jsonify({
-            "items": results,
-            "window": window,
-            "player_type": player_type
-        })
-
-    except Exception as e:
-        logging.error(f"Error in get_rolling_leaderboard: {e}")
-        return jsonify({"error": f"Error: {str(e)}"}), 500
+        cursor.execute(f"""
+            SELECT {select_list(ROLLING_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM rolling_leaderboard
+            WHERE player_type = ?
+                AND division = ?
+                AND window = ?{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, [player_type.lower(), division, window] + clauses['params'])
+
+        payload = leaderboard_payload(cursor, options, keys, fmt)
+        if options['limit'] is None:
+            payload = {"items": payload}
+        elif fmt == 'columnar':
+            next_cursor = payload.pop('next_cursor')
+            payload = {"items": payload, "next_cursor": next_cursor}
+
+        return jsonify({**payload, "window": window, "player_type": player_type})
+
+    except sqlite3.Error as e:
+        logging.error(f"Database error in get_rolling_leaderboard: {e}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
     finally:
         conn.close()
 
@@ -488,6 +638,53 @@ def get_player_situational(player_id=None):
           type: integer
         default: 50
         description: Minimum plate appearances
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Situational stats (RISP, high/low leverage, clutch)
@@ -511,110 +708,37 @@ def get_player_situational(player_id=None):
     if start_year < MIN_YEAR or end_year > MAX_YEAR or start_year > end_year:
         return jsonify({"error": "Invalid year range"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(SITUATIONAL_BATTING_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(SITUATIONAL_BATTING_COLUMNS))
+        keys = order_keys(options, [('sb.year', True), ('sb.woba_overall', True)], 'sb.rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys, 'sb')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        params = [division, start_year, end_year, min_pa]
+        player_filter = ""
         if player_id:
-            cursor.execute("""
-                SELECT 
-                    sb.player_id,
-                    sb.player_name,
-                    sb.team_name,
-                    sb.conference,
-                    sb.division,
-                    sb.year,
-                    sb.woba_overall,
-                    sb.woba_risp,
-                    sb.woba_high_leverage,
-                    sb.woba_low_leverage,
-                    sb.pa_overall,
-                    sb.pa_risp,
-                    sb.pa_high_leverage,
-                    sb.pa_low_leverage,
-                    sb.ba_overall,
-                    sb.ba_high_leverage,
-                    sb.ba_low_leverage,
-                    sb.ba_risp,
-                    sb.re24_overall,
-                    sb.re24_high_leverage,
-                    sb.re24_low_leverage,
-                    sb.re24_risp,
-                    sb.clutch,
-                    b.wpa,
-                    b.wpa_li,
-                    b.rea,
-                    b.war as batting_war,
-                    COALESCE(p.war, 0) as pitching_war,
-                    COALESCE(p.pwpa, 0) as pitching_wpa,
-                    COALESCE(p.pwpa_li, 0) as pitching_wpa_li,
-                    COALESCE(p.prea, 0) as pitching_rea,
-                    COALESCE(p.clutch, 0) as pitching_clutch,
-                    ROUND(b.war + COALESCE(p.war, 0), 1) as total_war,
-                    ROUND(b.wpa + COALESCE(p.pwpa, 0), 1) as total_wpa,
-                    ROUND(b.wpa_li + COALESCE(p.pwpa_li, 0), 1) as total_wpa_li,
-                    ROUND(b.rea + COALESCE(p.prea, 0), 1) as total_rea,
-                    ROUND(sb.clutch + COALESCE(p.clutch, 0), 1) as total_clutch
-                FROM situational_batting sb
-                LEFT JOIN batting b ON sb.player_id = b.player_id AND sb.year = b.year AND sb.division = b.division
-                LEFT JOIN pitching p ON sb.player_id = p.player_id AND sb.year = p.year AND sb.division = p.division
-                WHERE sb.division = ?
-                    AND sb.year BETWEEN ? AND ?
-                    AND sb.pa_overall >= ?
-                    AND sb.player_id = ?
-                ORDER BY sb.year DESC, sb.woba_overall DESC
-            """, (division, start_year, end_year, min_pa, player_id))
-        else:
-            cursor.execute("""
-                SELECT 
-                    sb.player_id,
-                    sb.player_name,
-                    sb.team_name,
-                    sb.conference,
-                    sb.division,
-                    sb.year,
-                    sb.woba_overall,
-                    sb.woba_risp,
-                    sb.woba_high_leverage,
-                    sb.woba_low_leverage,
-                    sb.pa_overall,
-                    sb.pa_risp,
-                    sb.pa_high_leverage,
-                    sb.pa_low_leverage,
-                    sb.ba_overall,
-                    sb.ba_high_leverage,
-                    sb.ba_low_leverage,
-                    sb.ba_risp,
-                    sb.re24_overall,
-                    sb.re24_high_leverage,
-                    sb.re24_low_leverage,
-                    sb.re24_risp,
-                    sb.clutch,
-                    b.wpa,
-                    b.wpa_li,
-                    b.rea,
-                    b.war as batting_war,
-                    COALESCE(p.war, 0) as pitching_war,
-                    COALESCE(p.pwpa, 0) as pitching_wpa,
-                    COALESCE(p.pwpa_li, 0) as pitching_wpa_li,
-                    COALESCE(p.prea, 0) as pitching_rea,
-                    COALESCE(p.clutch, 0) as pitching_clutch,
-                    ROUND(b.war + COALESCE(p.war, 0), 1) as total_war,
-                    ROUND(b.wpa + COALESCE(p.pwpa, 0), 1) as total_wpa,
-                    ROUND(b.wpa_li + COALESCE(p.pwpa_li, 0), 1) as total_wpa_li,
-                    ROUND(b.rea + COALESCE(p.prea, 0), 1) as total_rea,
-                    ROUND(sb.clutch + COALESCE(p.clutch, 0), 1) as total_clutch
-                FROM situational_batting sb
-                LEFT JOIN batting b ON sb.player_id = b.player_id AND sb.year = b.year AND sb.division = b.division
-                LEFT JOIN pitching p ON sb.player_id = p.player_id AND sb.year = p.year AND sb.division = p.division
-                WHERE sb.division = ?
-                    AND sb.year BETWEEN ? AND ?
-                    AND sb.pa_overall >= ?
-                ORDER BY sb.year DESC, sb.woba_overall DESC
-            """, (division, start_year, end_year, min_pa))
-
-        results = [dict(row) for row in cursor.fetchall()]
-        return jsonify(results)
+            player_filter = "AND sb.player_id = ?"
+            params.append(player_id)
+
+        cursor.execute(f"""
+            SELECT {select_list(SITUATIONAL_BATTING_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM {SITUATIONAL_BATTING_SOURCE}
+            WHERE sb.division = ?
+                AND sb.year BETWEEN ? AND ?
+                AND sb.pa_overall >= ?
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        return jsonify(leaderboard_payload(cursor, options, keys, fmt))
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_situational: {e}")
@@ -659,6 +783,53 @@ def get_player_situational_pitcher(player_id=None):
           type: integer
         default: 100
         description: Minimum batters faced
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Situational pitching stats (RISP, high/low leverage, clutch)
@@ -682,110 +853,37 @@ def get_player_situational_pitcher(player_id=None):
     if start_year < MIN_YEAR or end_year > MAX_YEAR or start_year > end_year:
         return jsonify({"error": "Invalid year range"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(SITUATIONAL_PITCHING_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(SITUATIONAL_PITCHING_COLUMNS))
+        keys = order_keys(options, [('sp.year', True), ('sp.woba_overall', False)], 'sp.rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys, 'sp')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        params = [division, start_year, end_year, min_bf]
+        player_filter = ""
         if player_id:
-            cursor.execute("""
-                SELECT 
-                    sp.player_id,
-                    sp.player_name,
-                    sp.team_name,
-                    sp.conference,
-                    sp.division,
-                    sp.year,
-                    sp.woba_overall,
-                    sp.woba_risp,
-                    sp.woba_high_leverage,
-                    sp.woba_low_leverage,
-                    sp.pa_overall,
-                    sp.pa_risp,
-                    sp.pa_high_leverage,
-                    sp.pa_low_leverage,
-                    sp.ba_overall,
-                    sp.ba_high_leverage,
-                    sp.ba_low_leverage,
-                    sp.ba_risp,
-                    sp.re24_overall,
-                    sp.re24_high_leverage,
-                    sp.re24_low_leverage,
-                    sp.re24_risp,
-                    sp.clutch,
-                    p.pwpa,
-                    p.pwpa_li,
-                    p.prea,
-                    p.war as pitching_war,
-                    COALESCE(b.war, 0) as batting_war,
-                    COALESCE(b.wpa, 0) as batting_wpa,
-                    COALESCE(b.wpa_li, 0) as batting_wpa_li,
-                    COALESCE(b.rea, 0) as batting_rea,
-                    COALESCE(b.clutch, 0) as batting_clutch,
-                    ROUND(p.war + COALESCE(b.war, 0), 1) as total_war,
-                    ROUND(p.pwpa + COALESCE(b.wpa, 0), 1) as total_wpa,
-                    ROUND(p.pwpa_li + COALESCE(b.wpa_li, 0), 1) as total_wpa_li,
-                    ROUND(p.prea + COALESCE(b.rea, 0), 1) as total_rea,
-                    ROUND(sp.clutch + COALESCE(b.clutch, 0), 1) as total_clutch
-                FROM situational_pitching sp
-                LEFT JOIN pitching p ON sp.player_id = p.player_id AND sp.year = p.year AND sp.division = p.division
-                LEFT JOIN batting b ON sp.player_id = b.player_id AND sp.year = b.year AND sp.division = b.division
-                WHERE sp.division = ?
-                    AND sp.year BETWEEN ? AND ?
-                    AND sp.pa_overall >= ?
-                    AND sp.player_id = ?
-                ORDER BY sp.year DESC, sp.woba_overall ASC
-            """, (division, start_year, end_year, min_bf, player_id))
-        else:
-            cursor.execute("""
-                SELECT 
-                    sp.player_id,
-                    sp.player_name,
-                    sp.team_name,
-                    sp.conference,
-                    sp.division,
-                    sp.year,
-                    sp.woba_overall,
-                    sp.woba_risp,
-                    sp.woba_high_leverage,
-                    sp.woba_low_leverage,
-                    sp.pa_overall,
-                    sp.pa_risp,
-                    sp.pa_high_leverage,
-                    sp.pa_low_leverage,
-                    sp.ba_overall,
-                    sp.ba_high_leverage,
-                    sp.ba_low_leverage,
-                    sp.ba_risp,
-                    sp.re24_overall,
-                    sp.re24_high_leverage,
-                    sp.re24_low_leverage,
-                    sp.re24_risp,
-                    sp.clutch,
-                    p.pwpa,
-                    p.pwpa_li,
-                    p.prea,
-                    p.war as pitching_war,
-                    COALESCE(b.war, 0) as batting_war,
-                    COALESCE(b.wpa, 0) as batting_wpa,
-                    COALESCE(b.wpa_li, 0) as batting_wpa_li,
-                    COALESCE(b.rea, 0) as batting_rea,
-                    COALESCE(b.clutch, 0) as batting_clutch,
-                    ROUND(p.war + COALESCE(b.war, 0), 1) as total_war,
-                    ROUND(p.pwpa + COALESCE(b.wpa, 0), 1) as total_wpa,
-                    ROUND(p.pwpa_li + COALESCE(b.wpa_li, 0), 1) as total_wpa_li,
-                    ROUND(p.prea + COALESCE(b.rea, 0), 1) as total_rea,
-                    ROUND(sp.clutch + COALESCE(b.clutch, 0), 1) as total_clutch
-                FROM situational_pitching sp
-                LEFT JOIN pitching p ON sp.player_id = p.player_id AND sp.year = p.year AND sp.division = p.division
-                LEFT JOIN batting b ON sp.player_id = b.player_id AND sp.year = b.year AND sp.division = b.division
-                WHERE sp.division = ?
-                    AND sp.year BETWEEN ? AND ?
-                    AND sp.pa_overall >= ?
-                ORDER BY sp.year DESC, sp.woba_overall ASC
-            """, (division, start_year, end_year, min_bf))
-
-        results = [dict(row) for row in cursor.fetchall()]
-        return jsonify(results)
+            player_filter = "AND sp.player_id = ?"
+            params.append(player_id)
+
+        cursor.execute(f"""
+            SELECT {select_list(SITUATIONAL_PITCHING_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM {SITUATIONAL_PITCHING_SOURCE}
+            WHERE sp.division = ?
+                AND sp.year BETWEEN ? AND ?
+                AND sp.pa_overall >= ?
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        return jsonify(leaderboard_payload(cursor, options, keys, fmt))
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_situational_pitcher: {e}")
@@ -829,6 +927,53 @@ def get_player_splits(player_id=None):
         schema:
           type: integer
         default: 50
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Batting splits vs left/right-handed pitchers
@@ -852,74 +997,37 @@ def get_player_splits(player_id=None):
     if start_year < MIN_YEAR or end_year > MAX_YEAR or start_year > end_year:
         return jsonify({"error": "Invalid year range"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(SPLITS_BATTING_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(SPLITS_BATTING_COLUMNS))
+        keys = order_keys(options, [('year', True), ('woba_overall', True)], 'rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        params = [division, start_year, end_year, min_pa]
+        player_filter = ""
         if player_id:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    pa_overall,
-                    ba_overall,
-                    ob_pct_overall,
-                    slg_pct_overall,
-                    woba_overall,
-                    pa_vs_rhp,
-                    ba_vs_rhp,
-                    ob_pct_vs_rhp,
-                    slg_pct_vs_rhp,
-                    woba_vs_rhp,
-                    pa_vs_lhp,
-                    ba_vs_lhp,
-                    ob_pct_vs_lhp,
-                    slg_pct_vs_lhp,
-                    woba_vs_lhp
-                FROM splits_batting
-                WHERE division = ?
-                    AND year BETWEEN ? AND ?
-                    AND pa_overall >= ?
-                    AND player_id = ?
-                ORDER BY year DESC, woba_overall DESC
-            """, (division, start_year, end_year, min_pa, player_id))
-        else:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    pa_overall,
-                    ba_overall,
-                    ob_pct_overall,
-                    slg_pct_overall,
-                    woba_overall,
-                    pa_vs_rhp,
-                    ba_vs_rhp,
-                    ob_pct_vs_rhp,
-                    slg_pct_vs_rhp,
-                    woba_vs_rhp,
-                    pa_vs_lhp,
-                    ba_vs_lhp,
-                    ob_pct_vs_lhp,
-                    slg_pct_vs_lhp,
-                    woba_vs_lhp
-                FROM splits_batting
-                WHERE division = ?
-                    AND year BETWEEN ? AND ?
-                    AND pa_overall >= ?
-                ORDER BY year DESC, woba_overall DESC
-            """, (division, start_year, end_year, min_pa))
-
-        results = [dict(row) for row in cursor.fetchall()]
-        return jsonify(results)
+            player_filter = "AND player_id = ?"
+            params.append(player_id)
+
+        cursor.execute(f"""
+            SELECT {select_list(SPLITS_BATTING_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM splits_batting
+            WHERE division = ?
+                AND year BETWEEN ? AND ?
+                AND pa_overall >= ?
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        return jsonify(leaderboard_payload(cursor, options, keys, fmt))
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_splits: {e}")
@@ -963,6 +1071,53 @@ def get_player_splits_pitcher(player_id=None):
         schema:
           type: integer
         default: 100
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Pitching splits vs left/right-handed hitters
@@ -986,74 +1141,37 @@ def get_player_splits_pitcher(player_id=None):
     if start_year < MIN_YEAR or end_year > MAX_YEAR or start_year > end_year:
         return jsonify({"error": "Invalid year range"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(SPLITS_PITCHING_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(SPLITS_PITCHING_COLUMNS))
+        keys = order_keys(options, [('year', True), ('woba_overall', False)], 'rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        params = [division, start_year, end_year, min_bf]
+        player_filter = ""
         if player_id:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    pa_overall,
-                    ba_overall,
-                    ob_pct_overall,
-                    slg_pct_overall,
-                    woba_overall,
-                    pa_vs_rhh,
-                    ba_vs_rhh,
-                    ob_pct_vs_rhh,
-                    slg_pct_vs_rhh,
-                    woba_vs_rhh,
-                    pa_vs_lhh,
-                    ba_vs_lhh,
-                    ob_pct_vs_lhh,
-                    slg_pct_vs_lhh,
-                    woba_vs_lhh
-                FROM splits_pitching
-                WHERE division = ?
-                    AND year BETWEEN ? AND ?
-                    AND pa_overall >= ?
-                    AND player_id = ?
-                ORDER BY year DESC, woba_overall ASC
-            """, (division, start_year, end_year, min_bf, player_id))
-        else:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    pa_overall,
-                    ba_overall,
-                    ob_pct_overall,
-                    slg_pct_overall,
-                    woba_overall,
-                    pa_vs_rhh,
-                    ba_vs_rhh,
-                    ob_pct_vs_rhh,
-                    slg_pct_vs_rhh,
-                    woba_vs_rhh,
-                    pa_vs_lhh,
-                    ba_vs_lhh,
-                    ob_pct_vs_lhh,
-                    slg_pct_vs_lhh,
-                    woba_vs_lhh
-                FROM splits_pitching
-                WHERE division = ?
-                    AND year BETWEEN ? AND ?
-                    AND pa_overall >= ?
-                ORDER BY year DESC, woba_overall ASC
-            """, (division, start_year, end_year, min_bf))
-
-        results = [dict(row) for row in cursor.fetchall()]
-        return jsonify(results)
+            player_filter = "AND player_id = ?"
+            params.append(player_id)
+
+        cursor.execute(f"""
+            SELECT {select_list(SPLITS_PITCHING_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM splits_pitching
+            WHERE division = ?
+                AND year BETWEEN ? AND ?
+                AND pa_overall >= ?
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        return jsonify(leaderboard_payload(cursor, options, keys, fmt))
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_splits_pitcher: {e}")
@@ -1098,6 +1216,53 @@ def get_player_batted_ball(player_id=None):
           type: integer
         default: 100
         description: Minimum batted balls
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} instead of one object per row
     responses:
       200:
         description: Batted ball profile (GB%, FB%, LD%, Pull%, Oppo%, etc.)
@@ -1121,69 +1286,111 @@ def get_player_batted_ball(player_id=None):
     if start_year < MIN_YEAR or end_year > MAX_YEAR or start_year > end_year:
         return jsonify({"error": "Invalid year range"}), 400
 
+    try:
+        fields = parse_fields(request.args.get('fields'), column_names(BATTED_BALL_COLUMNS))
+        options = parse_leaderboard_args(request.args, sortable_columns(BATTED_BALL_COLUMNS))
+        keys = order_keys(options, [('year', True), ('count', True)], 'rowid')
+        fmt = response_format()
+        clauses = leaderboard_clauses(options, keys)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        params = [division, start_year, end_year, min_bb]
+        player_filter = ""
         if player_id:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    count,
-                    batter_hand,
-                    pull_pct,
-                    oppo_pct,
-                    middle_pct,
-                    gb_pct,
-                    fb_pct,
-                    ld_pct,
-                    pop_pct,
-                    pull_air_pct,
-                    oppo_gb_pct
-                FROM batted_ball
-                WHERE division = ?
-                    AND year BETWEEN ? AND ?
-                    AND count >= ?
-                    AND player_id = ?
-                ORDER BY year DESC, count DESC
-            """, (division, start_year, end_year, min_bb, player_id))
-        else:
-            cursor.execute("""
-                SELECT 
-                    player_id,
-                    player_name,
-                    team_name,
-                    conference,
-                    division,
-                    year,
-                    count,
-                    batter_hand,
-                    pull_pct,
-                    oppo_pct,
-                    middle_pct,
-                    gb_pct,
-                    fb_pct,
-                    ld_pct,
-                    pop_pct,
-                    pull_air_pct,
-                    oppo_gb_pct
-                FROM batted_ball
-                WHERE division = ?
-                    AND year BETWEEN ? AND ?
-                    AND count >= ?
-                ORDER BY year DESC, count DESC
-            """, (division, start_year, end_year, min_bb))
-
-        results = [dict(row) for row in cursor.fetchall()]
-        return jsonify(results)
+            player_filter = "AND player_id = ?"
+            params.append(player_id)
+
+        cursor.execute(f"""
+            SELECT {select_list(BATTED_BALL_COLUMNS, fields)}{clauses['cursor_columns']}
+            FROM batted_ball
+            WHERE division = ?
+                AND year BETWEEN ? AND ?
+                AND count >= ?
+                {player_filter}{clauses['where']}
+            ORDER BY {clauses['order_by']}
+            {clauses['limit']}
+        """, params + clauses['params'])
+
+        return jsonify(leaderboard_payload(cursor, options, keys, fmt))
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_batted_ball: {e}")
         return jsonify({"error": f"Database error: {str(e)}"}), 500
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+@player_bp.get('/<string:player_id>/leaderboards')
+@require_api_auth
+@cache_response(ttl=300)
+def get_player_leaderboards(player_id):
+    """
+    Get every leaderboard row for one player
+    ---
+    tags:
+      - Leaderboards
+    description: |
+      Returns the player's rows from each leaderboard (value, baserunning,
+      situational, situational_pitcher, splits, splits_pitcher, batted_ball)
+      for every season and division, newest first, without the leaderboard
+      minimums. Same columns as /api/leaderboards/<kind>/<player_id>.
+    parameters:
+      - in: path
+        name: player_id
+        schema:
+          type: string
+        required: true
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar]
+        default: json
+        description: columnar returns {columns, rows} per leaderboard instead of one object per row
+    responses:
+      200:
+        description: "{player_id, leaderboards: {kind: rows}}"
+      400:
+        description: Invalid parameters
+      404:
+        description: Player not found
+    """
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        leaderboards = {}
+        found = False
+        for kind, (columns, source, alias) in PLAYER_LEADERBOARDS.items():
+            prefix = f'{alias}.' if alias else ''
+            # (player_id, year, division) index probe on each table
+            cursor.execute(f"""
+                SELECT {select_list(columns)}
+                FROM {source}
+                WHERE {prefix}player_id = ?
+                ORDER BY {prefix}year DESC, {prefix}division DESC
+            """, (player_id,))
+            names, rows = fetch_rows(cursor)
+            found = found or bool(rows)
+            leaderboards[kind] = rows_payload(names, rows, fmt)
+
+        if not found:
+            return jsonify({"error": "Player not found"}), 404
+
+        return jsonify({"player_id": player_id, "leaderboards": leaderboards})
+
+    except sqlite3.Error as e:
+        logging.error(f"Database error in get_player_leaderboards: {e}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+    finally:
+        conn.close()
@@ -2,6 +2,15 @@ from flask import Blueprint, jsonify, request
 from config import MIN_YEAR, MAX_YEAR
 from db import get_db_connection
 from middleware import require_api_auth, cache_response
+from leaderboard_query import (
+    PITCHING_PERCENTILES,
+    stat_columns, stat_sortable, percentile_columns, column_names, select_list,
+    parse_leaderboard_args, is_filtered, leaderboard_format, order_keys, leaderboard_clauses,
+    leaderboard_payload,
+)
+from request_params import parse_fields
+from responses import stream_ndjson
+from exports import EXPORT_FORMATS, export_response
 
 
 bp = Blueprint('pitching', __name__, url_prefix='/api')
@@ -42,6 +51,64 @@ def get_pitching():
           enum: [1, 2, 3]
         default: 3
         description: NCAA division
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+        example: "player_id,player_name,team_name,war,era,fip"
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar, ndjson, arrow, parquet, csv]
+        default: json
+        description: |
+          columnar returns {columns, rows} instead of one object per row.
+          ndjson streams one object per line (not with limit/offset/cursor).
+          arrow, parquet and csv return the whole division-year as a file
+          (one year only; other filters and paging are ignored)
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: min_ip
+        schema:
+          type: number
+        description: Minimum innings pitched
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by (default war)
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+        description: Rows to skip (paged requests)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
     responses:
       200:
         description: Pitching leaderboard with WAR, ERA, FIP, K%, BB%, and more
@@ -66,23 +133,42 @@ def get_pitching():
     except ValueError:
         return jsonify({"error": "Invalid years format. Use single year or comma-separated list (e.g., '2024' or '2023,2024,MAX_YEAR')"}), 400
 
+    if request.args.get('format') in EXPORT_FORMATS:
+        if len(years) != 1:
+            return jsonify({"error": "File formats export one year at a time."}), 400
+        return export_response('pitching', division, years[0], request.args['format'])
+
+    try:
+        options = parse_leaderboard_args(request.args, stat_sortable('pitching', 'p', PITCHING_PERCENTILES), 'min_ip')
+        percentiles = percentile_columns('pitching', 'p', PITCHING_PERCENTILES, is_filtered(options))
+        columns = stat_columns('pitching', 'p', percentiles)
+        fields = parse_fields(request.args.get('fields'), column_names(columns))
+        keys = order_keys(options, [('p.war', True)], 'p.rowid')
+        fmt = leaderboard_format(options)
+        clauses = leaderboard_clauses(options, keys, 'p', 'ip')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     placeholders = ','.join(['?' for _ in years])
     query = f"""
-        SELECT *,
-               PERCENT_RANK() OVER (PARTITION BY year ORDER BY war) * 100 as war_percentile
+        SELECT {select_list(columns, fields)}{clauses['cursor_columns']}
         FROM pitching p
-        WHERE p.division = ? AND p.year IN ({placeholders})
-        ORDER BY p.war DESC
+        WHERE p.division = ? AND p.year IN ({placeholders}){clauses['where']}
+        ORDER BY {clauses['order_by']}
+        {clauses['limit']}
     """
 
-    cursor.execute(query, [division] + years)
+    cursor.execute(query, [division] + years + clauses['params'])
 
-    data = [dict(row) for row in cursor.fetchall()]
+    if fmt == 'ndjson':
+        return stream_ndjson(conn, cursor)
+
+    payload = leaderboard_payload(cursor, options, keys, fmt)
     conn.close()
-    return jsonify(data)
+    return jsonify(payload)
 
 
 @bp.get('/pitching_team')
@@ -107,6 +193,59 @@ def get_pitching_team():
           enum: [1, 2, 3]
         default: 3
         description: NCAA division
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated columns to return (default all)
+        example: "team_name,conference,war"
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar, ndjson, arrow, parquet, csv]
+        default: json
+        description: |
+          columnar returns {columns, rows} instead of one object per row.
+          ndjson streams one object per line (not with limit/offset/cursor).
+          arrow, parquet and csv return the whole division-year as a file
+          (one year only; other filters and paging are ignored)
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Only rows from this conference
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Only rows for this team_name
+      - in: query
+        name: sort
+        schema:
+          type: string
+        description: Column to sort by (default war)
+      - in: query
+        name: order
+        schema:
+          type: string
+          enum: [asc, desc]
+        default: desc
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000). When set the response is {items, next_cursor}
+      - in: query
+        name: offset
+        schema:
+          type: integer
+        description: Rows to skip (paged requests)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
     responses:
       200:
         description: Team pitching statistics
@@ -131,22 +270,41 @@ def get_pitching_team():
     except ValueError:
         return jsonify({"error": "Invalid years format. Use single year or comma-separated list (e.g., '2024' or '2023,2024,MAX_YEAR')"}), 400
 
+    if request.args.get('format') in EXPORT_FORMATS:
+        if len(years) != 1:
+            return jsonify({"error": "File formats export one year at a time."}), 400
+        return export_response('pitching_team', division, years[0], request.args['format'])
+
+    try:
+        options = parse_leaderboard_args(request.args, stat_sortable('pitching_team', 'pt', PITCHING_PERCENTILES))
+        percentiles = percentile_columns('pitching_team', 'pt', PITCHING_PERCENTILES, is_filtered(options))
+        columns = stat_columns('pitching_team', 'pt', percentiles)
+        fields = parse_fields(request.args.get('fields'), column_names(columns))
+        keys = order_keys(options, [('pt.war', True)], 'pt.rowid')
+        fmt = leaderboard_format(options)
+        clauses = leaderboard_clauses(options, keys, 'pt')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     placeholders = ','.join(['?' for _ in years])
     query = f"""
-        SELECT *,
-               PERCENT_RANK() OVER (PARTITION BY year ORDER BY war) * 100 as war_percentile
+        SELECT {select_list(columns, fields)}{clauses['cursor_columns']}
         FROM pitching_team pt
-        WHERE pt.division = ? AND pt.year IN ({placeholders})
-        ORDER BY pt.war DESC
+        WHERE pt.division = ? AND pt.year IN ({placeholders}){clauses['where']}
+        ORDER BY {clauses['order_by']}
+        {clauses['limit']}
     """
 
-    cursor.execute(query, [division] + years)
+    cursor.execute(query, [division] + years + clauses['params'])
+
+    if fmt == 'ndjson':
+        return stream_ndjson(conn, cursor)
 
-    data = [dict(row) for row in cursor.fetchall()]
+    payload = leaderboard_payload(cursor, options, keys, fmt)
     conn.close()
-    return jsonify(data)
+    return jsonify(payload)
 
 
@@ -1,15 +1,25 @@
 from flask import Blueprint, jsonify, request
 import logging
 import json
-import re
 import sqlite3
 from db import get_db_connection
 from config import MIN_YEAR, MAX_YEAR
-from middleware import require_api_auth
+from middleware import require_api_auth, cache_response
+from pbp_classifier import ZONE_KEYS, classify_descriptions, spray_direction
+from percentiles import POPULATIONS, get_population, known_conferences, score_player
+from player_search import get_player_search_index
+from request_params import parse_fields, encode_cursor, decode_cursor
+from responses import response_format, stream_json_array, stream_ndjson
+from team_dimension import parse_colors
 
 bp = Blueprint('player_data', __name__, url_prefix='/api')
 app = bp
 
+MAX_PERCENTILE_BATCH = 100
+
+# career sections of /player/<id>, selectable with include=
+PROFILE_SECTIONS = ('batting', 'pitching')
+
 @app.route('/rolling/<string:player_id>', methods=['GET'])
 @require_api_auth
 def get_player_rolling_data(player_id):
@@ -435,32 +445,116 @@ def get_player_years(player_id, division):
         conn.close()
 
 
+def parse_year_range(years_param):
+    """Parse "2023-2025" or "2023,2025" into a sorted list of valid years."""
+    error = f"Years must be between {MIN_YEAR} and {MAX_YEAR}"
+    if '-' in years_param:
+        start, end = (int(y.strip()) for y in years_param.split('-', 1))
+        # Bounds first, so a huge range is rejected without being built
+        if start > end or start < MIN_YEAR or end > MAX_YEAR:
+            raise ValueError(error)
+        return list(range(start, end + 1))
+
+    entries = [y.strip() for y in years_param.split(',') if y.strip()]
+    if len(entries) > MAX_YEAR - MIN_YEAR + 1:
+        raise ValueError(f"At most {MAX_YEAR - MIN_YEAR + 1} years")
+    years = sorted({int(y) for y in entries})
+    if not years or years[0] < MIN_YEAR or years[-1] > MAX_YEAR:
+        raise ValueError(error)
+    return years
+
+
+def aggregate_spray(cursor, where, params):
+    """
+    Spray zone / batted-ball / outcome counts from the pre-classified
+    pbp_spray table, grouped so clients can still filter by zone and
+    pitcher hand without receiving individual events.
+    """
+    cursor.execute(f"""
+        SELECT
+            zone_key,
+            field_zone,
+            direction,
+            pitcher_hand,
+            COUNT(*) AS events,
+            SUM(is_ground) AS ground,
+            SUM(is_fly) AS fly,
+            SUM(is_lined) AS lined,
+            SUM(is_popped) AS popped,
+            SUM(CASE WHEN is_fly = 1 OR is_lined = 1 THEN 1 ELSE 0 END) AS air,
+            SUM(is_pa) AS pa,
+            SUM(is_single) AS singles,
+            SUM(is_double) AS doubles,
+            SUM(is_triple) AS triples,
+            SUM(is_hr) AS hr,
+            SUM(is_bb) AS bb,
+            SUM(is_hbp) AS hbp,
+            SUM(is_sf) AS sf,
+            SUM(woba) AS woba_sum
+        FROM pbp_spray
+        WHERE {where}
+        GROUP BY zone_key, field_zone, direction, pitcher_hand
+    """, params)
+    groups = [dict(row) for row in cursor.fetchall()]
+
+    counts = {location: 0 for location in ZONE_KEYS}
+    for group in groups:
+        if group['zone_key']:
+            counts[group['zone_key']] += group['events']
+    return counts, groups
+
+
 @app.route('/spraychart_data/<player_id>', methods=['GET'])
 @require_api_auth
 def get_spraychart_data(player_id):
+    """
+    Get spray chart data for a batter
+    ---
+    tags:
+      - Players
+    description: |
+      With `year`, returns every classified batted-ball event for that season.
+      With `years` (e.g. "2023-2025" or "2023,2025"), returns aggregated zone,
+      direction and outcome counts across the seasons instead of events.
+    parameters:
+      - in: path
+        name: player_id
+        schema:
+          type: string
+        required: true
+      - in: query
+        name: year
+        schema:
+          type: integer
+        description: Single season (event-level response)
+      - in: query
+        name: years
+        schema:
+          type: string
+        description: Year range or comma-separated years (aggregated response)
+      - in: query
+        name: division
+        schema:
+          type: integer
+          enum: [1, 2, 3]
+    responses:
+      200:
+        description: Spray chart events or aggregated counts
+      404:
+        description: Player not found
+    """
+    years_param = request.args.get('years')
+    division = request.args.get('division', type=int)
+
+    if years_param:
+        return get_spraychart_summary(player_id, years_param, division)
+
     try:
-        from config import MAX_YEAR
         year = int(request.args.get('year', str(MAX_YEAR)))
     except ValueError:
         return jsonify({"error": "Invalid year format"}), 400
-    
-    division = request.args.get('division', type=int)
 
-    FIELD_PATTERNS = {
-        "to_lf": [r'to left', r'to lf', r'left field', r'lf line', r'by lf'],
-        "to_cf": [r'to center', r'to cf', r'center field', r'by cf'],
-        "to_rf": [r'to right', r'to rf', r'right field', r'rf line', r'by rf'],
-        "to_lf_hr": [r'homered to left', r'homered to lf', r'homers to lf', r'homers to left'],
-        "to_cf_hr": [r'homered to center', r'homered to cf', r'homers to cf', r'homers to center'],
-        "to_rf_hr": [r'homered to right', r'homered to rf', r'homers to rf', r'homers to right'],
-        "to_3b": [r'to 3b', r'to third', r'third base', r'3b line', r'by 3b', r'3b to 2b'],
-        "to_ss": [r'ss to 2b', r'to ss', r'to short', r'shortstop', r'by ss'],
-        "up_middle": [r'up the middle', r'to pitcher', r'to p', r'to c', r'by p', r'by c', r'to pitcher', r'to catcher'],
-        "to_2b": [r'2b to ss', r'to 2b', r'to second', r'second base', r'by 2b'],
-        "to_1b": [r'to 1b', r'to first', r'first base', r'1b line', r'by 1b', r'1b to ss', r'1b to p', r'1b to 2b'],
-    }
-
-    hit_counts = {location: 0 for location in FIELD_PATTERNS.keys()}
+    hit_counts = {location: 0 for location in ZONE_KEYS}
 
     conn = None
     try:
@@ -509,126 +603,25 @@ def get_spraychart_data(player_id):
             pbp_params.append(division)
         cursor.execute(pbp_query, pbp_params)
 
-        pbp_rows = cursor.fetchall()
-        pbp_data = [dict(row) for row in pbp_rows]
-
-        compiled_patterns = {}
-        for location, patterns in FIELD_PATTERNS.items():
-            compiled_patterns[location] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
-
-        bb_type_patterns = {
-            'is_ground': re.compile(r"ground|fielder's choice|reached on error|through the (left|right) side|down the", re.IGNORECASE),
-            'is_fly': re.compile(r"fly|flied|homered to", re.IGNORECASE),
-            'is_lined': re.compile(r"lined|doubled", re.IGNORECASE),
-            'is_popped': re.compile(r"popped|fouled out", re.IGNORECASE),
-        }
-
-        def classify_zone(description: str):
-            for location, patterns in compiled_patterns.items():
-                if any(p.search(description) for p in patterns):
-                    return location
-            return None
-
-        def map_zone_to_display(zone_key: str):
-            if zone_key in ("to_lf", "to_lf_hr"):
-                return "left-field" if zone_key == "to_lf" else "left-field-hr"
-            if zone_key in ("to_cf", "to_cf_hr"):
-                return "center-field" if zone_key == "to_cf" else "center-field-hr"
-            if zone_key in ("to_rf", "to_rf_hr"):
-                return "right-field" if zone_key == "to_rf" else "right-field-hr"
-            if zone_key == "to_3b":
-                return "third-base"
-            if zone_key == "to_ss":
-                return "shortstop"
-            if zone_key == "to_2b":
-                return "second-base"
-            if zone_key == "to_1b":
-                return "first-base"
-            if zone_key == "up_middle":
-                return "up-the-middle"
-            return None
+        pbp_data = [dict(row) for row in cursor.fetchall()]
+        classified = classify_descriptions([play.get('description') for play in pbp_data])
 
         events = []
-        for play in pbp_data:
-            desc = (play.get('description') or '').lower().split('3a')[0]
-            if not desc:
+        for play, play_class in zip(pbp_data, classified):
+            if play_class is None:
                 continue
 
-            zone_key = None
-            hr_found = False
-            for location, patterns in compiled_patterns.items():
-                if "_hr" in location and any(p.search(desc) for p in patterns):
-                    zone_key = location
-                    hr_found = True
-                    break
-            if not hr_found:
-                zone_key = classify_zone(desc)
-
-            display_zone = map_zone_to_display(zone_key) if zone_key else None
-            
-            is_hr = 'homered' in desc
-            if is_hr and display_zone and not display_zone.endswith("-hr"):
-                display_zone = display_zone + "-hr"
-
-            is_ground = bool(bb_type_patterns['is_ground'].search(desc))
-            is_fly = bool(bb_type_patterns['is_fly'].search(desc))
-            is_lined = bool(bb_type_patterns['is_lined'].search(desc))
-            is_popped = bool(bb_type_patterns['is_popped'].search(desc))
-
-            # Derive spray direction from the classified zone and batter hand.
-            # This is more robust than parsing the raw description text and
-            # ensures direction stats populate consistently for the scouting chart.
-            def compute_direction_from_zone(z_key: str, batter_hand: str):
-                if not z_key or not batter_hand or batter_hand == '-':
-                    return None
-                hand = batter_hand.lower()[0]
-                # Middle includes both straight-away CF and balls up the middle
-                if z_key in ("to_cf", "to_cf_hr", "up_middle"):
-                    return "middle"
-                if hand == 'r':
-                    if z_key in ("to_lf", "to_lf_hr"):
-                        return "pull"
-                    if z_key in ("to_rf", "to_rf_hr"):
-                        return "oppo"
-                if hand == 'l':
-                    if z_key in ("to_rf", "to_rf_hr"):
-                        return "pull"
-                    if z_key in ("to_lf", "to_lf_hr"):
-                        return "oppo"
-                return None
-
-            direction = compute_direction_from_zone(zone_key, bats)
-
-            is_single = 'singled' in desc
-            is_double = 'doubled' in desc
-            is_triple = 'tripled' in desc
-            is_bb = 'walked' in desc or 'intentional walk' in desc
-            is_hbp = 'hit by pitch' in desc
-            is_sf = 'sacrifice fly' in desc
-
+            zone_key = play_class['zone_key']
             if zone_key:
-                if zone_key in hit_counts:
-                    hit_counts[zone_key] += 1
+                hit_counts[zone_key] += 1
 
             events.append({
                 'description': play.get('description'),
                 'pitcher_id': play.get('pitcher_id'),
                 'pitcher_throws': play.get('pitcher_throws'),
                 'woba': play.get('woba'),
-                'zone_key': zone_key,
-                'field_zone': display_zone,
-                'is_ground': is_ground,
-                'is_fly': is_fly,
-                'is_lined': is_lined,
-                'is_popped': is_popped,
-                'direction': direction,
-                'is_single': is_single,
-                'is_double': is_double,
-                'is_triple': is_triple,
-                'is_hr': is_hr,
-                'is_bb': is_bb,
-                'is_hbp': is_hbp,
-                'is_sf': is_sf,
+                **play_class,
+                'direction': spray_direction(zone_key, bats),
                 'is_pa': play.get('woba') is not None,
             })
 
@@ -661,8 +654,148 @@ def get_spraychart_data(player_id):
             conn.close()
 
 
+def get_spraychart_summary(player_id, years_param, division):
+    try:
+        years = parse_year_range(years_param)
+    except ValueError:
+        return jsonify({"error": f"Invalid years. Use a range or list between {MIN_YEAR} and {MAX_YEAR} (e.g., '2023-2025')"}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        placeholders = ','.join(['?'] * len(years))
+        roster_query = f"""
+            SELECT r.player_name, r.team_name, r.bats
+            FROM rosters r
+            WHERE r.player_id = ? AND r.year IN ({placeholders})
+        """
+        roster_params = [player_id, *years]
+        if division:
+            roster_query += " AND r.division = ?"
+            roster_params.append(division)
+        roster_query += " ORDER BY r.year DESC LIMIT 1"
+        cursor.execute(roster_query, roster_params)
+
+        player_info = cursor.fetchone()
+        if not player_info:
+            return jsonify({"error": f"Player not found for ID {player_id} in years {years_param}"}), 404
+
+        where = f"batter_id = ? AND year IN ({placeholders})"
+        params = [player_id, *years]
+        if division:
+            where += " AND division = ?"
+            params.append(division)
+        counts, groups = aggregate_spray(cursor, where, params)
+
+        cursor.execute(
+            "SELECT DISTINCT year FROM pbp_spray WHERE batter_id = ? ORDER BY year DESC",
+            (player_id,),
+        )
+        available_years = [row['year'] for row in cursor.fetchall()]
+
+        return jsonify({
+            "counts": counts,
+            "groups": groups,
+            "player_id": player_id,
+            "player_name": player_info["player_name"],
+            "team_name": player_info["team_name"],
+            "bats": player_info["bats"],
+            "years": years,
+            "available_years": available_years,
+        })
+
+    except sqlite3.Error as e:
+        logging.error(f"Database error in get_spraychart_summary: {e}")
+        return jsonify({"error": "An internal server error occurred"}), 500
+    finally:
+        conn.close()
+
+
+@app.route('/spraychart_data/team/<team_name>', methods=['GET'])
+@require_api_auth
+@cache_response(ttl=300)
+def get_team_spraychart_data(team_name):
+    """
+    Get aggregated spray chart data for a team
+    ---
+    tags:
+      - Teams
+    parameters:
+      - in: path
+        name: team_name
+        schema:
+          type: string
+        required: true
+      - in: query
+        name: years
+        schema:
+          type: string
+        description: Year range or comma-separated years (e.g., "2021-2025"), default current year
+      - in: query
+        name: division
+        schema:
+          type: integer
+          enum: [1, 2, 3]
+        default: 3
+    responses:
+      200:
+        description: Zone, direction and outcome counts grouped by zone and pitcher hand
+      400:
+        description: Invalid parameters
+      404:
+        description: No spray data for team
+    """
+    years_param = request.args.get('years', str(MAX_YEAR))
+    division = request.args.get('division', type=int, default=3)
+
+    if division not in [1, 2, 3]:
+        return jsonify({"error": "Invalid division. Must be 1, 2, or 3."}), 400
+
+    try:
+        years = parse_year_range(years_param)
+    except ValueError:
+        return jsonify({"error": f"Invalid years. Use a range or list between {MIN_YEAR} and {MAX_YEAR} (e.g., '2021-2025')"}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        placeholders = ','.join(['?'] * len(years))
+        counts, groups = aggregate_spray(
+            cursor,
+            f"team_name = ? AND division = ? AND year IN ({placeholders})",
+            [team_name, division, *years],
+        )
+
+        if not groups:
+            return jsonify({"error": f"No spray data found for team {team_name}"}), 404
+
+        cursor.execute(
+            "SELECT DISTINCT year FROM pbp_spray WHERE team_name = ? AND division = ? ORDER BY year DESC",
+            (team_name, division),
+        )
+        available_years = [row['year'] for row in cursor.fetchall()]
+
+        return jsonify({
+            "counts": counts,
+            "groups": groups,
+            "team_name": team_name,
+            "division": division,
+            "years": years,
+            "available_years": available_years,
+        })
+
+    except sqlite3.Error as e:
+        logging.error(f"Database error in get_team_spraychart_data: {e}")
+        return jsonify({"error": "An internal server error occurred"}), 500
+    finally:
+        conn.close()
+
+
 @app.route('/player/<string:player_id>', methods=['GET'])
 @require_api_auth
+@cache_response(ttl=300)
 def get_player_stats(player_id):
     """
     Get player profile and career stats
@@ -671,6 +804,8 @@ def get_player_stats(player_id):
       - Players
     description: |
       Returns player profile info and career batting/pitching statistics.
+      Pass `include=` (empty) for just the profile header, or
+      `include=batting` / `include=pitching` for one side of the career.
       
       **cURL:**
       
@@ -688,37 +823,38 @@ def get_player_stats(player_id):
           type: string
         required: true
         description: The player ID
+      - in: query
+        name: include
+        schema:
+          type: string
+        default: batting,pitching
+        description: Comma-separated career sections to return (batting, pitching); empty for none
     responses:
       200:
         description: Player profile with batting and pitching stats by year
+      400:
+        description: Invalid include
       404:
         description: Player not found
     """
+    include_param = request.args.get('include')
+    if include_param is None:
+        include = PROFILE_SECTIONS
+    else:
+        include = [section.strip() for section in include_param.split(',') if section.strip()]
+        unknown = [section for section in include if section not in PROFILE_SECTIONS]
+        if unknown:
+            return jsonify({"error": f"Invalid include. Must be any of: {', '.join(PROFILE_SECTIONS)}"}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
         cursor.execute("""
-            SELECT 
-                r.player_name,
-                r.team_name,
-                r.division,
-                r.conference,
-                r.org_id,
-                r.height,
-                r.bats,
-                r.throws,
-                r.hometown,
-                r.high_school,
-                r.position,
-                r.year,
-                r.img_url as headshot_url,
-                ti.colors_hex
-            FROM rosters r
-            LEFT JOIN team_information ti ON r.org_id = ti.org_id
-            WHERE r.player_id = ?
-            ORDER BY r.year DESC
-            LIMIT 1
+            SELECT player_name, team_name, conference, division, org_id, height, bats, throws,
+                   hometown, high_school, position, year, headshot_url, colors_hex, is_pitcher
+            FROM player_latest
+            WHERE player_id = ?
         """, (player_id,))
         
         player_info = cursor.fetchone()
@@ -728,60 +864,7 @@ def get_player_stats(player_id):
         player_info_dict = dict(player_info)
         current_year = player_info_dict['year']
 
-        cursor.execute("""
-            SELECT r.img_url
-            FROM rosters r
-            WHERE r.player_id = ?
-              AND r.img_url IS NOT NULL
-              AND TRIM(r.img_url) <> ''
-              AND LOWER(TRIM(r.img_url)) NOT IN ('-', 'nan', 'none', 'null')
-            ORDER BY r.year DESC
-            LIMIT 1
-        """, (player_id,))
-
-        headshot_row = cursor.fetchone()
-        if headshot_row and headshot_row[0]:
-            player_info_dict["headshot_url"] = headshot_row[0]
-        else:
-            player_info_dict["headshot_url"] = None
-        
-        colors_hex = player_info_dict.get('colors_hex') or ''
-        color_parts = [c.strip() for c in colors_hex.split(';') if c.strip()]
-        team_colors = {
-            'primary': color_parts[0] if len(color_parts) > 0 else None,
-            'secondary': color_parts[1] if len(color_parts) > 1 else None,
-        }
-
-        cursor.execute("""
-            SELECT 
-                b.*,
-                r.org_id,
-                r.img_url as headshot_url
-            FROM batting b
-            LEFT JOIN rosters r ON b.player_id = r.player_id AND b.year = r.year AND b.division = r.division
-            WHERE b.player_id = ?
-            ORDER BY b.year DESC
-        """, (player_id,))
-        
-        batting_stats = [dict(row) for row in cursor.fetchall()]
-
-        cursor.execute("""
-            SELECT 
-                p.*,
-                r.org_id,
-                r.img_url as headshot_url
-            FROM pitching p
-            LEFT JOIN rosters r ON p.player_id = r.player_id AND p.year = r.year AND p.division = r.division
-            WHERE p.player_id = ?
-            ORDER BY p.year DESC
-        """, (player_id,))
-        
-        pitching_stats = [dict(row) for row in cursor.fetchall()]
-
-        is_pitcher = len(pitching_stats) > 0
-        is_active = current_year == MAX_YEAR
-
-        return jsonify({
+        profile = {
             "player_id": player_id,
             "headshot_url": player_info_dict["headshot_url"],
             "player_name": player_info_dict["player_name"],
@@ -789,18 +872,44 @@ def get_player_stats(player_id):
             "conference": player_info_dict["conference"],
             "division": player_info_dict["division"],
             "org_id": player_info_dict["org_id"],
-            "team_colors": team_colors,
-            "is_pitcher": is_pitcher,
-            "is_active": is_active,
+            "team_colors": parse_colors(player_info_dict['colors_hex']),
+            "is_pitcher": bool(player_info_dict["is_pitcher"]),
+            "is_active": current_year == MAX_YEAR,
             "height": player_info_dict["height"],
             "bats": player_info_dict["bats"],
             "throws": player_info_dict["throws"],
             "hometown": player_info_dict["hometown"],
             "high_school": player_info_dict["high_school"],
             "position": player_info_dict["position"],
-            "batting_stats": batting_stats,
-            "pitching_stats": pitching_stats
-        })
+        }
+
+        if 'batting' in include:
+            cursor.execute("""
+                SELECT 
+                    b.*,
+                    r.org_id,
+                    r.img_url as headshot_url
+                FROM batting b
+                LEFT JOIN rosters r ON b.player_id = r.player_id AND b.year = r.year AND b.division = r.division
+                WHERE b.player_id = ?
+                ORDER BY b.year DESC
+            """, (player_id,))
+            profile["batting_stats"] = [dict(row) for row in cursor.fetchall()]
+
+        if 'pitching' in include:
+            cursor.execute("""
+                SELECT 
+                    p.*,
+                    r.org_id,
+                    r.img_url as headshot_url
+                FROM pitching p
+                LEFT JOIN rosters r ON p.player_id = r.player_id AND p.year = r.year AND p.division = r.division
+                WHERE p.player_id = ?
+                ORDER BY p.year DESC
+            """, (player_id,))
+            profile["pitching_stats"] = [dict(row) for row in cursor.fetchall()]
+
+        return jsonify(profile)
 
     except sqlite3.Error as e:
         logging.error(f"Database error in get_player_stats: {e}")
@@ -821,6 +930,8 @@ def search_players():
       - Players
     description: |
       Search for players by name. Returns up to 8 matching results.
+      Matching ignores case, accents and punctuation; exact and prefix
+      matches rank ahead of last-name and mid-name matches.
       
       **cURL:**
       
@@ -839,110 +950,180 @@ def search_players():
           type: string
         required: true
         description: Search query (player name)
+      - in: query
+        name: mode
+        schema:
+          type: string
+          enum: [prefix, fuzzy]
+        default: prefix
+        description: fuzzy tolerates a typo or transposed letters per name part
+      - in: query
+        name: team
+        schema:
+          type: string
+        description: Optional team name to favor in fuzzy results
     responses:
       200:
         description: List of matching players (max 8 results)
     """
     query = request.args.get('q', '').strip()
+    mode = request.args.get('mode', 'prefix')
+    team = request.args.get('team')
+
+    if mode not in ('prefix', 'fuzzy'):
+        return jsonify({"error": "Invalid mode. Must be 'prefix' or 'fuzzy'."}), 400
     if not query:
         return jsonify([])
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        search_term = f"%{query.lower()}%"
-
-        cursor.execute("""
-            WITH ranked AS (
-                SELECT 
-                    r.player_id, 
-                    r.player_name AS playerName, 
-                    r.team_name AS team, 
-                    r.conference,
-                    CASE 
-                        WHEN LOWER(r.player_name) = LOWER(?) THEN 1
-                        WHEN LOWER(r.player_name) LIKE LOWER(?) || '%' THEN 2
-                        ELSE 3
-                    END AS match_rank
-                FROM rosters r
-                INNER JOIN (
-                    SELECT player_id, MAX(year) AS latest_year
-                    FROM rosters
-                    GROUP BY player_id
-                ) latest ON latest.player_id = r.player_id AND latest.latest_year = r.year
-                WHERE LOWER(r.player_name) LIKE ?
-                GROUP BY r.player_id
-            )
-            SELECT player_id, playerName, team, conference
-            FROM ranked
-            ORDER BY match_rank, playerName
-            LIMIT 8;
-        """, (query, query, search_term))
-
-        results = [dict(row) for row in cursor.fetchall()]
+        index = get_player_search_index()
+        if mode == 'fuzzy':
+            matches = index.fuzzy_search(query, limit=8, team=team)
+        else:
+            matches = index.search(query, limit=8)
+
+        results = [
+            {
+                'player_id': player['player_id'],
+                'playerName': player['playerName'],
+                'team': player['team'],
+                'conference': player['conference'],
+            }
+            for player in matches
+        ]
         return jsonify(results)
 
     except Exception as e:
         print(f"Database error: {e}")
         return jsonify({"error": "An error occurred while searching players"}), 500
 
-    finally:
-        cursor.close()
-        conn.close()
+PLAYER_INDEX_FIELDS = [
+    'player_id', 'player_name', 'position', 'team_name', 'conference',
+    'division', 'min_year', 'max_year', 'years',
+]
+MAX_PLAYERS_PAGE = 5000
+
+
+def _player_index_row(row, fields):
+    player_dict = {field: row[field] for field in fields}
+
+    if 'years' in player_dict:
+        try:
+            if isinstance(player_dict.get('years'), str):
+                player_dict['years'] = json.loads(player_dict['years'])
+        except (json.JSONDecodeError, TypeError):
+            player_dict['years'] = [row['min_year'], row['max_year']]
+
+    return player_dict
+
 
 @app.route('/players')
 @require_api_auth
 def get_players():
+    """
+    List all players
+    ---
+    tags:
+      - Players
+    description: |
+      Returns every player with their latest team/position and roster years,
+      ordered by name. Without `limit` the full list is returned as an array
+      (`stream=1` sends it in chunks, `format=ndjson` one player per line);
+      with `limit` the response is a page `{items, next_cursor}` and `cursor`
+      fetches the following page.
+    parameters:
+      - in: query
+        name: fields
+        schema:
+          type: string
+        description: Comma-separated subset of player_id, player_name, position, team_name, conference, division, min_year, max_year, years
+      - in: query
+        name: limit
+        schema:
+          type: integer
+        description: Page size (max 5000)
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        description: next_cursor from the previous page
+      - in: query
+        name: stream
+        schema:
+          type: boolean
+        description: Stream the full (unpaginated) list
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, ndjson]
+        default: json
+        description: ndjson streams one player object per line (not with limit/cursor)
+    responses:
+      200:
+        description: Player list or page
+      400:
+        description: Invalid parameters
+    """
+    limit = request.args.get('limit', type=int)
+    cursor_param = request.args.get('cursor')
+    stream = request.args.get('stream', '').lower() in ('1', 'true')
+
+    try:
+        fields = parse_fields(request.args.get('fields'), PLAYER_INDEX_FIELDS) or PLAYER_INDEX_FIELDS
+        after = decode_cursor(cursor_param, 2) if cursor_param else None
+        fmt = response_format(('json', 'ndjson'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if cursor_param and limit is None:
+        limit = MAX_PLAYERS_PAGE
+    if limit is not None and not (1 <= limit <= MAX_PLAYERS_PAGE):
+        return jsonify({"error": f"limit must be between 1 and {MAX_PLAYERS_PAGE}"}), 400
+    if fmt == 'ndjson' and limit is not None:
+        return jsonify({"error": "format=ndjson streams the full list and cannot be combined with limit or cursor"}), 400
+
+    columns = list(fields)
+    for key in ['player_name', 'player_id'] + (['min_year', 'max_year'] if 'years' in fields else []):
+        if key not in columns:
+            columns.append(key)
+
+    query = f"SELECT {', '.join(columns)} FROM player_index"
+    params = []
+    if after:
+        query += " WHERE player_name > ? OR (player_name = ? AND player_id > ?)"
+        params.extend([after[0], after[0], after[1]])
+    query += " ORDER BY player_name, player_id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
-        cursor.execute("""
-            WITH LatestPlayeryear AS (
-                SELECT 
-                    player_id, 
-                    MAX(year) as latest_year
-                FROM rosters
-                GROUP BY player_id
-            )
-            SELECT 
-                r1.player_id, 
-                r1.player_name,
-                r2.position,
-                r2.team_name,
-                r2.conference,
-                r2.division,
-                MIN(r1.year) as min_year,
-                MAX(r1.year) as max_year,
-                JSON_GROUP_ARRAY(DISTINCT r1.year) as years
-            FROM rosters r1
-            LEFT JOIN (
-                SELECT r.player_id, r.team_name, r.conference, r.division, r.year, r.position
-                FROM rosters r
-                JOIN LatestPlayeryear lpy ON r.player_id = lpy.player_id AND r.year = lpy.latest_year
-            ) r2 ON r1.player_id = r2.player_id
-            GROUP BY r1.player_id
-            ORDER BY r1.player_name
-        """)
-
-        players = []
-        for row in cursor.fetchall():
-            player_dict = dict(row)
+        cursor.execute(query, params)
+    except Exception as e:
+        conn.close()
+        print(f"Error fetching players: {e}")
+        return jsonify({"error": f"Failed to fetch players: {str(e)}"}), 500
 
-            if player_dict.get('position'):
-                player_dict['position'] = player_dict['position'].upper()
+    if fmt == 'ndjson':
+        return stream_ndjson(conn, cursor, lambda row: _player_index_row(row, fields))
+    if stream and limit is None:
+        return stream_json_array(conn, cursor, lambda row: _player_index_row(row, fields))
 
-            try:
-                if isinstance(player_dict.get('years'), str):
-                    player_dict['years'] = json.loads(player_dict['years'])
-            except (json.JSONDecodeError, TypeError):
-                player_dict['years'] = [
-                    player_dict['min_year'], player_dict['max_year']]
+    try:
+        rows = cursor.fetchall()
+        players = [_player_index_row(row, fields) for row in rows]
 
-            players.append(player_dict)
+        if limit is None:
+            return jsonify(players)
 
-        return jsonify(players)
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_cursor([rows[-1]['player_name'], rows[-1]['player_id']])
+        return jsonify({"items": players, "next_cursor": next_cursor})
 
     except Exception as e:
         print(f"Error fetching players: {e}")
@@ -952,260 +1133,175 @@ def get_players():
         cursor.close()
         conn.close()
 
-@app.route('/player-percentiles/<string:player_id>/<int:year>/<int:division>', methods=['GET'])
-@require_api_auth
-def get_player_percentiles(player_id, year, division):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    response = {"batting": None, "pitching": None}
-    conference_filter = request.args.get('conference')
-
-    def rows_to_dicts(rows, desc):
-        cols = [d[0] for d in desc]
-        return [dict(zip(cols, r)) for r in rows]
-
-    EPS = 1e-9
-
-    def compute_percentiles(pop_rows, player_row, stats, reverse_stats):
-        out = {}
-        
-        for stat in stats:
-            vals = []
-            for r in pop_rows:
-                val = r.get(stat)
-                if val is not None:
-                    try:
-                        vals.append(float(val))
-                    except (ValueError, TypeError):
-                        continue
-            
-            pv = player_row.get(stat)
-            if not vals or pv is None:
-                continue
-            
-            try:
-                pv = float(pv)
-            except (ValueError, TypeError):
-                continue
 
-            vals.sort()
-            n = len(vals)
-            
-            if stat in reverse_stats:
-                worse = sum(1 for v in vals if v > pv + EPS)
-                equal = sum(1 for v in vals if abs(v - pv) <= EPS)
-            else:
-                worse = sum(1 for v in vals if v < pv - EPS) 
-                equal = sum(1 for v in vals if abs(v - pv) <= EPS)
-
-            pct = (worse + 0.5 * equal) / n * 100.0
-            out[f"{stat}_percentile"] = int(round(pct))
-            out[stat] = pv
-        return out
-
-    def compute_rankings(pop_rows, player_row, stats, reverse_stats):
-        out = {}
-        for stat in stats:
-            vals = []
-            for r in pop_rows:
-                val = r.get(stat)
-                if val is not None:
-                    try:
-                        vals.append(float(val))
-                    except (ValueError, TypeError):
-                        continue
-            
-            pv = player_row.get(stat)
-            if not vals or pv is None:
-                continue
-            
-            try:
-                pv = float(pv)
-            except (ValueError, TypeError):
-                continue
+def percentile_params_error(year, division, conference_filter):
+    """Why a percentile request's division/year/conference is invalid, or None."""
+    if division not in [1, 2, 3]:
+        return "Invalid division. Must be 1, 2, or 3."
+    if year < MIN_YEAR or year > MAX_YEAR:
+        return f"Invalid year. Must be between {MIN_YEAR} and {MAX_YEAR}."
+    if conference_filter not in (None, '', 'auto', 'conference') \
+            and conference_filter not in known_conferences(division, year):
+        return f"Unknown conference for division {division} in {year}: {conference_filter}"
+    return None
 
-            if stat in reverse_stats:
-                better = sum(1 for v in vals if v < pv - EPS)
-                equal = sum(1 for v in vals if abs(v - pv) <= EPS)
-            else:
-                better = sum(1 for v in vals if v > pv + EPS)
-                equal = sum(1 for v in vals if abs(v - pv) <= EPS)
 
-            rank = 1 + better + max(0, (equal - 1)) / 2.0
-            out[f"{stat}_rank"] = int(round(rank))
-        return out
+def build_player_percentiles(cursor, player_id, year, division, conference_filter):
+    response = {"batting": None, "pitching": None}
 
-    try:
-        player_conference = None
-        cursor.execute(
-            """
-            SELECT conference
-            FROM rosters
-            WHERE player_id = ? AND division = ? AND year = ?
-            LIMIT 1
-            """,
-            (player_id, division, year),
-        )
-        row = cursor.fetchone()
-        if row:
-            player_conference = row[0]
-
-        target_conference = None
-        if conference_filter in ('auto', 'conference'):
-            target_conference = player_conference
-        elif conference_filter and conference_filter not in ('auto', 'conference'):
-            target_conference = conference_filter
-
-        batting_select = '''
-            player_id,
-            ba, ob_pct, slg_pct, woba,
-            (ob_pct + slg_pct) AS ops,
-            batting, baserunning, wpa, war, pa, wrc_plus, rea,
-            k_pct, bb_pct, wpa_li
-        '''
-        pitching_select = '''
-            player_id,
-            era, fip, xfip,
-            k_pct, bb_pct, k_minus_bb_pct,
-            hr_div_fb,
-            war, ip, ra9,
-            pwpa, prea, pwpa_li
-        '''
+    player_conference = None
+    cursor.execute(
+        """
+        SELECT conference
+        FROM rosters
+        WHERE player_id = ? AND division = ? AND year = ?
+        LIMIT 1
+        """,
+        (player_id, division, year),
+    )
+    row = cursor.fetchone()
+    if row:
+        player_conference = row[0]
+
+    target_conference = None
+    if conference_filter in ('auto', 'conference'):
+        target_conference = player_conference
+    elif conference_filter and conference_filter not in ('auto', 'conference'):
+        target_conference = conference_filter
+
+    for table in ('batting', 'pitching'):
+        spec = POPULATIONS[table]
+        qualifier = spec['qualifier']
+        threshold = spec['threshold']
 
         cursor.execute(
             f"""
-            SELECT {batting_select}
-            FROM batting
+            SELECT {spec['select']}
+            FROM {table}
             WHERE player_id = ? AND division = ? AND year = ?
             """,
             (player_id, division, year),
         )
-        player_batting_row = cursor.fetchone()
-        
-        if not player_batting_row:
+        player_row = cursor.fetchone()
+
+        if not player_row:
             cursor.execute(
                 f"""
-                SELECT {batting_select}
-                FROM batting
-                WHERE player_id = ? AND division = ? AND pa > 25
+                SELECT {spec['select']}
+                FROM {table}
+                WHERE player_id = ? AND division = ? AND {qualifier} > {threshold}
                 ORDER BY year DESC
                 LIMIT 1
                 """,
                 (player_id, division),
             )
-            player_batting_row = cursor.fetchone()
-        
-        if player_batting_row:
-            player_batting = dict(zip([d[0] for d in cursor.description], player_batting_row))
+            player_row = cursor.fetchone()
 
-            params = [division, year]
-            where = "pa > 25 AND division = ? AND year = ?"
-            if target_conference:
-                where += " AND conference = ?"
-                params.append(target_conference)
+        if not player_row:
+            continue
 
-            cursor.execute(
-                f"SELECT {batting_select} FROM batting WHERE {where} ORDER BY pa",
-                params,
-            )
-            all_pop_rows = rows_to_dicts(cursor.fetchall(), cursor.description)
-
-            pop_rows = [r for r in all_pop_rows if r.get('player_id') != player_id]
-
-            batting_stats = [
-                'ba', 'ob_pct', 'slg_pct', 'woba', 'ops',
-                'batting', 'baserunning', 'wpa', 'war', 'wrc_plus', 'rea',
-                'k_pct', 'bb_pct', 'wpa_li'
-            ]
-            batting_reverse = {'k_pct'}
-
-            percentiles = compute_percentiles(pop_rows, player_batting, batting_stats, batting_reverse)
-            rankings = compute_rankings(pop_rows, player_batting, batting_stats, batting_reverse)
-            combined_stats = {**percentiles, **rankings}
-
-            response["batting"] = {
-                "type": "batting",
-                "stats": combined_stats,
-                "qualified": (player_batting.get('pa') or 0) > 25,
-                "pa_threshold": 25,
-                "player_pa": player_batting.get('pa'),
-                "year": year,
-                "division": division,
-                "conference": target_conference,
-                "is_conference_filtered": bool(target_conference),
-                "player_count": len(all_pop_rows),
-            }
+        player_stats = dict(player_row)
+        population = get_population(table, division, year, target_conference)
 
-        cursor.execute(
-            f"""
-            SELECT {pitching_select}
-            FROM pitching
-            WHERE player_id = ? AND division = ? AND year = ?
-            """,
-            (player_id, division, year),
-        )
-        player_pitching_row = cursor.fetchone()
-        
-        if not player_pitching_row:
-            cursor.execute(
-                f"""
-                SELECT {pitching_select}
-                FROM pitching
-                WHERE player_id = ? AND division = ? AND ip > 10
-                ORDER BY year DESC
-                LIMIT 1
-                """,
-                (player_id, division),
-            )
-            player_pitching_row = cursor.fetchone()
-        
-        if player_pitching_row:
-            player_pitching = dict(zip([d[0] for d in cursor.description], player_pitching_row))
+        response[table] = {
+            "type": table,
+            "stats": score_player(population, table, player_id, player_stats),
+            "qualified": (player_stats.get(qualifier) or 0) > threshold,
+            f"{qualifier}_threshold": threshold,
+            f"player_{qualifier}": player_stats.get(qualifier),
+            "year": year,
+            "division": division,
+            "conference": target_conference,
+            "is_conference_filtered": bool(target_conference),
+            "player_count": population['count'],
+        }
 
-            params = [division, year]
-            where = "ip > 10 AND division = ? AND year = ?"
-            if target_conference:
-                where += " AND conference = ?"
-                params.append(target_conference)
+    if response["batting"] is None and response["pitching"] is None:
+        return {
+            "inactive": True,
+            "message": f"Player not active in {year} season for division {division}"
+        }
 
-            cursor.execute(
-                f"SELECT {pitching_select} FROM pitching WHERE {where} ORDER BY ip",
-                params,
-            )
-            all_pop_rows = rows_to_dicts(cursor.fetchall(), cursor.description)
-
-            pop_rows = [r for r in all_pop_rows if r.get('player_id') != player_id]
-
-            pitching_stats = [
-                'era', 'fip', 'xfip',
-                'k_pct', 'bb_pct', 'k_minus_bb_pct',
-                'ra9', 'war', 'prea', 'pwpa', 'pwpa_li', 'hr_div_fb'
-            ]
-            pitching_reverse = {'era', 'fip', 'xfip', 'bb_pct', 'ra9', 'hr_div_fb'}
-
-            percentiles = compute_percentiles(pop_rows, player_pitching, pitching_stats, pitching_reverse)
-            rankings = compute_rankings(pop_rows, player_pitching, pitching_stats, pitching_reverse)
-            combined_stats = {**percentiles, **rankings}
-
-            response["pitching"] = {
-                "type": "pitching",
-                "stats": combined_stats,
-                "qualified": (player_pitching.get('ip') or 0) > 10,
-                "ip_threshold": 10,
-                "player_ip": player_pitching.get('ip'),
-                "year": year,
-                "division": division,
-                "conference": target_conference,
-                "is_conference_filtered": bool(target_conference),
-                "player_count": len(all_pop_rows),
-            }
+    return response
 
-        if response["batting"] is None and response["pitching"] is None:
-            return jsonify({
-                "inactive": True,
-                "message": f"Player not active in {year} season for division {division}"
-            })
 
-        return jsonify(response)
+@app.route('/player-percentiles/<string:player_id>/<int:year>/<int:division>', methods=['GET'])
+@require_api_auth
+def get_player_percentiles(player_id, year, division):
+    conference_filter = request.args.get('conference')
+    error = percentile_params_error(year, division, conference_filter)
+    if error:
+        return jsonify({"error": error}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        return jsonify(build_player_percentiles(cursor, player_id, year, division, conference_filter))
+    finally:
+        conn.close()
+
+
+@app.route('/player-percentiles', methods=['GET'])
+@require_api_auth
+@cache_response(ttl=300)
+def get_player_percentiles_batch():
+    """
+    Get percentiles and ranks for many players at once
+    ---
+    tags:
+      - Players
+    description: |
+      Batched form of /player-percentiles/<player_id>/<year>/<division>, e.g.
+      for a whole roster. Returns an object keyed by player_id.
+    parameters:
+      - in: query
+        name: player_ids
+        schema:
+          type: string
+        required: true
+        description: Comma-separated player IDs (max 100)
+      - in: query
+        name: year
+        schema:
+          type: integer
+      - in: query
+        name: division
+        schema:
+          type: integer
+          enum: [1, 2, 3]
+        default: 3
+      - in: query
+        name: conference
+        schema:
+          type: string
+        description: Conference name, or "auto" for each player's own conference
+    responses:
+      200:
+        description: Percentile/rank payload per player
+      400:
+        description: Invalid parameters
+    """
+    player_ids = [p.strip() for p in request.args.get('player_ids', '').split(',') if p.strip()]
+    year = request.args.get('year', type=int, default=MAX_YEAR)
+    division = request.args.get('division', type=int, default=3)
+    conference_filter = request.args.get('conference')
+
+    if not player_ids:
+        return jsonify({"error": "player_ids parameter is required"}), 400
+    if len(player_ids) > MAX_PERCENTILE_BATCH:
+        return jsonify({"error": f"At most {MAX_PERCENTILE_BATCH} player_ids per request"}), 400
+    error = percentile_params_error(year, division, conference_filter)
+    if error:
+        return jsonify({"error": error}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        return jsonify({
+            player_id: build_player_percentiles(cursor, player_id, year, division, conference_filter)
+            for player_id in player_ids
+        })
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
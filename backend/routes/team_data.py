@@ -1,13 +1,62 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 import sqlite3
 from db import get_db_connection
 from config import MIN_YEAR, MAX_YEAR
 from firebase_admin import firestore
 from middleware import require_api_auth
+from responses import (
+    NDJSON_MIMETYPE, STREAMING_FORMATS, response_format, fetch_rows, rows_payload, stream_ndjson,
+)
 
 bp = Blueprint('team_data', __name__, url_prefix='/api')
 app = bp
 
+
+def _team_games_query(team_ids, conditions):
+    """
+    (query, params) for the distinct schedule rows where any of team_ids is
+    the team or the opponent, newest first. conditions are extra
+    (sql, params) filters applied to both sides.
+
+    The two sides are UNION ALL branches, each an index search on
+    (team_id | opponent_team_id, division, year). With those indexes SQLite
+    also plans the equivalent OR as a MULTI-INDEX OR of the same searches;
+    the branches spell that plan out rather than leaving it to the OR
+    optimization's cost estimate (scripts/benchmark.py times both).
+    """
+    placeholders = ','.join(['?'] * len(team_ids))
+    where = ''.join(f" AND {sql}" for sql, _ in conditions)
+    branch_params = list(team_ids) + [param for _, params in conditions for param in params]
+    query = f"""
+            SELECT DISTINCT
+                s.contest_id,
+                s.year,
+                s.division,
+                s.date,
+                s.team,
+                s.team_id,
+                s.opponent,
+                s.opponent_team_id,
+                s.team_score,
+                s.opponent_score,
+                s.innings,
+                s.attendance,
+                s.neutral_site,
+                CASE 
+                    WHEN s.team_score > s.opponent_score THEN 'W'
+                    WHEN s.team_score < s.opponent_score THEN 'L'
+                    ELSE 'T'
+                END as result
+            FROM (
+                SELECT * FROM schedules WHERE team_id IN ({placeholders}){where}
+                UNION ALL
+                SELECT * FROM schedules WHERE opponent_team_id IN ({placeholders}){where}
+            ) s
+            ORDER BY s.year DESC, s.date DESC
+        """
+    return query, branch_params + branch_params
+
+
 @app.route('/teams', methods=['GET'])
 @require_api_auth
 def get_teams():
@@ -39,6 +88,11 @@ def get_teams():
       400:
         description: Invalid division
     """
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     division = request.args.get('division', 3, type=int)
     year = request.args.get('year', type=int)
     years_param = request.args.get('years')
@@ -72,15 +126,19 @@ def get_teams():
     finally:
         conn.close()
 
-    teams = [{"team_id": idx + 1, "team_name": row[0]}
-             for idx, row in enumerate(sorted(data, key=lambda r: r[0]))]
+    teams = [(idx + 1, row[0]) for idx, row in enumerate(sorted(data, key=lambda r: r[0]))]
 
-    return jsonify(teams)
+    return jsonify(rows_payload(['team_id', 'team_name'], teams, fmt))
 
 
 @app.route('/players_batting/<team_name>', methods=['GET'])
 @require_api_auth
 def get_team_players(team_name):
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         division = request.args.get('division')
         year = request.args.get('year', str(MAX_YEAR))
@@ -128,15 +186,14 @@ def get_team_players(team_name):
             ORDER BY b.war DESC
             """, (team_name, year, division))
 
-        columns = [col[0] for col in cursor.description]
-        data = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        columns, rows = fetch_rows(cursor)
 
         conn.close()
 
-        if not data:
+        if not rows:
             return jsonify({"error": "No players found"}), 404
 
-        return jsonify(data)
+        return jsonify(rows_payload(columns, rows, fmt))
 
     except Exception as e:
         print(f"Error in get_team_players: {str(e)}")
@@ -154,6 +211,11 @@ def get_team_pitchers(team_name):
     if division not in [1, 2, 3]:
         return jsonify({"error": "Invalid division. Must be 1, 2, or 3."}), 400
 
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
@@ -179,11 +241,10 @@ def get_team_pitchers(team_name):
         WHERE p.team_name = ? AND p.division = ? AND p.year = ?
     """, (team_name, division, year))
 
-    data = [dict(zip([col[0] for col in cursor.description], row))
-            for row in cursor.fetchall()]
+    columns, rows = fetch_rows(cursor)
 
     conn.close()
-    return jsonify(data)
+    return jsonify(rows_payload(columns, rows, fmt))
 
 
 @bp.get('/trending-players')
@@ -243,6 +304,11 @@ def get_team_history():
       200:
         description: List of team history records
     """
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     division = request.args.get('division', type=int)
     org_id = request.args.get('org_id', type=int)
 
@@ -264,8 +330,7 @@ def get_team_history():
         query += " ORDER BY org_id, season DESC"
 
         cursor.execute(query, params)
-        data = [dict(row) for row in cursor.fetchall()]
-        return jsonify(data)
+        return jsonify(rows_payload(*fetch_rows(cursor), fmt))
 
     except sqlite3.Error as e:
         return jsonify({"error": f"Database error: {str(e)}"}), 500
@@ -294,6 +359,11 @@ def get_team_history_by_org(org_id):
       404:
         description: Organization not found
     """
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
@@ -302,12 +372,12 @@ def get_team_history_by_org(org_id):
             "SELECT * FROM team_history WHERE org_id = ? ORDER BY season DESC",
             (org_id,)
         )
-        data = [dict(row) for row in cursor.fetchall()]
+        columns, rows = fetch_rows(cursor)
 
-        if not data:
+        if not rows:
             return jsonify({"error": "Organization not found"}), 404
 
-        return jsonify(data)
+        return jsonify(rows_payload(columns, rows, fmt))
 
     except sqlite3.Error as e:
         return jsonify({"error": f"Database error: {str(e)}"}), 500
@@ -345,6 +415,11 @@ def get_games_by_team_id(team_id):
       200:
         description: List of games for the team
     """
+    try:
+        fmt = response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     year = request.args.get('year', type=int)
     division = request.args.get('division', type=int, default=3)
 
@@ -352,41 +427,13 @@ def get_games_by_team_id(team_id):
     cursor = conn.cursor()
 
     try:
-        query = """
-            SELECT DISTINCT
-                s.contest_id,
-                s.year,
-                s.division,
-                s.date,
-                s.team,
-                s.team_id,
-                s.opponent,
-                s.opponent_team_id,
-                s.team_score,
-                s.opponent_score,
-                s.innings,
-                s.attendance,
-                s.neutral_site,
-                CASE 
-                    WHEN s.team_score > s.opponent_score THEN 'W'
-                    WHEN s.team_score < s.opponent_score THEN 'L'
-                    ELSE 'T'
-                END as result
-            FROM schedules s
-            WHERE (s.team_id = ? OR s.opponent_team_id = ?)
-            AND s.division = ?
-        """
-        params = [team_id, team_id, division]
-
+        conditions = [("division = ?", [division])]
         if year:
-            query += " AND s.year = ?"
-            params.append(year)
-
-        query += " ORDER BY s.year DESC, s.date DESC"
+            conditions.append(("year = ?", [year]))
+        query, params = _team_games_query([team_id], conditions)
 
         cursor.execute(query, params)
-        data = [dict(row) for row in cursor.fetchall()]
-        return jsonify(data)
+        return jsonify(rows_payload(*fetch_rows(cursor), fmt))
 
     except sqlite3.Error as e:
         return jsonify({"error": f"Database error: {str(e)}"}), 500
@@ -425,16 +472,29 @@ def get_games_by_org_id(org_id):
           type: integer
           enum: [1, 2, 3]
         default: 3
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [json, columnar, ndjson]
+        default: json
+        description: ndjson streams one game per line
     responses:
       200:
         description: List of games for the organization across years
     """
+    try:
+        fmt = response_format(STREAMING_FORMATS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     start_year = request.args.get('start_year', type=int, default=MIN_YEAR)
     end_year = request.args.get('end_year', type=int, default=MAX_YEAR)
     division = request.args.get('division', type=int, default=3)
 
     conn = get_db_connection()
     cursor = conn.cursor()
+    streaming = False
 
     try:
         cursor.execute(
@@ -444,42 +504,23 @@ def get_games_by_org_id(org_id):
         team_ids = [row['team_id'] for row in cursor.fetchall() if row['team_id']]
 
         if not team_ids:
-            return jsonify([])
+            if fmt == 'ndjson':
+                return Response('', mimetype=NDJSON_MIMETYPE)
+            return jsonify(rows_payload([], [], fmt))
 
-        placeholders = ','.join(['?'] * len(team_ids))
-        query = f"""
-            SELECT DISTINCT
-                s.contest_id,
-                s.year,
-                s.division,
-                s.date,
-                s.team,
-                s.team_id,
-                s.opponent,
-                s.opponent_team_id,
-                s.team_score,
-                s.opponent_score,
-                s.innings,
-                s.attendance,
-                s.neutral_site,
-                CASE 
-                    WHEN s.team_score > s.opponent_score THEN 'W'
-                    WHEN s.team_score < s.opponent_score THEN 'L'
-                    ELSE 'T'
-                END as result
-            FROM schedules s
-            WHERE (s.team_id IN ({placeholders}) OR s.opponent_team_id IN ({placeholders}))
-            AND s.division = ?
-            AND s.year BETWEEN ? AND ?
-            ORDER BY s.year DESC, s.date DESC
-        """
-        params = team_ids + team_ids + [division, start_year, end_year]
+        query, params = _team_games_query(
+            team_ids, [("division = ?", [division]), ("year BETWEEN ? AND ?", [start_year, end_year])]
+        )
 
         cursor.execute(query, params)
-        data = [dict(row) for row in cursor.fetchall()]
-        return jsonify(data)
+        if fmt == 'ndjson':
+            streaming = True
+            return stream_ndjson(conn, cursor)
+        return jsonify(rows_payload(*fetch_rows(cursor), fmt))
 
     except sqlite3.Error as e:
         return jsonify({"error": f"Database error: {str(e)}"}), 500
     finally:
-        conn.close()
+        # A stream closes the connection itself once the last row is sent
+        if not streaming:
+            conn.close()
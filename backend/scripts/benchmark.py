@@ -0,0 +1,197 @@
+"""
+Benchmark representative API workloads against ncaa.db.
+
+Each case reports the query (execute + fetch) and, as separate lines, the
+cost of serializing its payload: stdlib json, the app's JSON provider, and
+the columnar format through the app's provider. --plans prints each case's
+EXPLAIN QUERY PLAN instead. The *_baseline cases run the old OR predicate
+with schedules NOT INDEXED, i.e. the plan from before the team/opponent
+indexes (a SCAN of schedules); *_or runs it with them (a MULTI-INDEX OR of
+two SEARCHes) and the unsuffixed cases the routes' UNION ALL branches.
+
+    python scripts/benchmark.py --db ncaa.db --repeat 5
+    python scripts/benchmark.py --db ncaa.db --plans --only team_games_baseline team_games_or team_games
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+import db
+from config import DB_PATH, MAX_YEAR
+from json_provider import FastJSONProvider, orjson
+from leaderboard_query import percentile_columns, select_list, stat_columns
+from responses import fetch_rows, rows_payload
+
+
+def _stat_leaderboard(table, percentiles):
+    def case(conn, division, year):
+        columns = stat_columns(table, 't', percentile_columns(table, 't', percentiles))
+        cursor = conn.execute(f"""
+            SELECT {select_list(columns)}
+            FROM {table} t
+            WHERE t.division = ? AND t.year IN (?)
+            ORDER BY t.war DESC
+        """, (division, year))
+        return fetch_rows(cursor)
+    return case
+
+
+def _conference_top(table):
+    def case(conn, division, year):
+        conference = conn.execute(
+            f"SELECT conference FROM {table} WHERE division = ? AND year = ? LIMIT 1", (division, year)
+        ).fetchone()
+        columns = stat_columns(table, 't', percentile_columns(table, 't', {'war_percentile': 'war'}, correlated=True))
+        cursor = conn.execute(f"""
+            SELECT {select_list(columns)}
+            FROM {table} t
+            WHERE t.division = ? AND t.year IN (?) AND t.conference = ?
+            ORDER BY t.war DESC, t.rowid ASC
+            LIMIT 25
+        """, (division, year, conference[0] if conference else None))
+        return fetch_rows(cursor)
+    return case
+
+
+def _players(conn, division, year):
+    cursor = conn.execute("SELECT * FROM player_index ORDER BY player_name, player_id")
+    return fetch_rows(cursor)
+
+
+SCHEDULE_COLUMNS = """
+    s.contest_id, s.year, s.division, s.date, s.team, s.team_id, s.opponent, s.opponent_team_id,
+    s.team_score, s.opponent_score, s.innings, s.attendance, s.neutral_site
+"""
+
+
+def _schedule_games(team_ids_sql, form):
+    """
+    Team/org schedule lookup as the routes' UNION ALL branches ('union') or
+    the old OR predicate, with the schedules indexes ('or') or without them
+    ('baseline').
+    """
+    def case(conn, division, year):
+        team_ids = [row[0] for row in conn.execute(team_ids_sql, (division, year))]
+        placeholders = ','.join(['?'] * len(team_ids))
+        if form == 'union':
+            branch = f"SELECT * FROM schedules WHERE {{}} IN ({placeholders}) AND division = ? AND year = ?"
+            cursor = conn.execute(f"""
+                SELECT DISTINCT {SCHEDULE_COLUMNS}
+                FROM ({branch.format('team_id')} UNION ALL {branch.format('opponent_team_id')}) s
+                ORDER BY s.year DESC, s.date DESC
+            """, (*team_ids, division, year) * 2)
+        else:
+            cursor = conn.execute(f"""
+                SELECT DISTINCT {SCHEDULE_COLUMNS}
+                FROM schedules s {'NOT INDEXED' if form == 'baseline' else ''}
+                WHERE (s.team_id IN ({placeholders}) OR s.opponent_team_id IN ({placeholders}))
+                AND s.division = ? AND s.year = ?
+                ORDER BY s.year DESC, s.date DESC
+            """, (*team_ids, *team_ids, division, year))
+        return fetch_rows(cursor)
+    return case
+
+
+TEAM_IDS = "SELECT team_id FROM schedules WHERE division = ? AND year = ? LIMIT 1"
+ORG_TEAM_IDS = """
+    SELECT team_id FROM team_history
+    WHERE org_id = (SELECT org_id FROM team_history WHERE division = ? AND season = ? LIMIT 1)
+"""
+
+
+CASES = {
+    'batting': _stat_leaderboard('batting', {'war_percentile': 'war', 'sos_adj_war_percentile': 'sos_adj_war'}),
+    'pitching': _stat_leaderboard('pitching', {'war_percentile': 'war'}),
+    'batting_conf_top25': _conference_top('batting'),
+    'players': _players,
+    'team_games_baseline': _schedule_games(TEAM_IDS, 'baseline'),
+    'team_games_or': _schedule_games(TEAM_IDS, 'or'),
+    'team_games': _schedule_games(TEAM_IDS, 'union'),
+    'org_games_baseline': _schedule_games(ORG_TEAM_IDS, 'baseline'),
+    'org_games_or': _schedule_games(ORG_TEAM_IDS, 'or'),
+    'org_games': _schedule_games(ORG_TEAM_IDS, 'union'),
+}
+
+
+def _time(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def _print_plans(conn, name, fn):
+    """Run a case once, tracing its statements, and print each one's query plan."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn()
+    finally:
+        conn.set_trace_callback(None)
+    for sql in statements:
+        print(f"{name}: {' '.join(sql.split())[:100]}")
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+            print(f"    {row[3]}")
+
+
+def _report(name, rows, ms, size=None):
+    rows_col = '' if rows is None else rows
+    size_col = '' if size is None else f"{size / 1024:,.0f} KB"
+    print(f"{name:<48} {rows_col:>8} {ms:>10.2f} {size_col:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark query and serialization cost")
+    parser.add_argument("--db", default=DB_PATH, help=f"Path to the SQLite database (default: {DB_PATH})")
+    parser.add_argument("--division", type=int, default=3)
+    parser.add_argument("--year", type=int, default=MAX_YEAR)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(CASES.keys()), help="Only run these cases")
+    parser.add_argument("--plans", action="store_true", help="Print query plans instead of timings")
+    args = parser.parse_args()
+
+    db.DB_PATH = args.db
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    provider_name = 'orjson' if orjson is not None else 'stdlib fallback'
+
+    if args.plans:
+        conn = db.get_db_connection()
+        try:
+            for name in args.only or CASES:
+                _print_plans(conn, name, lambda: CASES[name](conn, args.division, args.year))
+        finally:
+            conn.close()
+        sys.exit(0)
+
+    print(f"JSON provider: {provider_name}")
+    print(f"{'case':<48} {'rows':>8} {'median ms':>10} {'payload':>12}")
+    with app.app_context():
+        conn = db.get_db_connection()
+        try:
+            for name in args.only or CASES:
+                ms, (columns, rows) = _time(lambda: CASES[name](conn, args.division, args.year), args.repeat)
+                _report(f"{name}.query", len(rows), ms)
+
+                objects = rows_payload(columns, rows)
+                columnar = rows_payload(columns, rows, 'columnar')
+
+                ms, body = _time(lambda: json.dumps(objects).encode(), args.repeat)
+                _report(f"{name}.serialize.stdlib_json", None, ms, len(body))
+                ms, body = _time(lambda: app.json.dumps_bytes(objects), args.repeat)
+                _report(f"{name}.serialize.provider", None, ms, len(body))
+                ms, body = _time(lambda: app.json.dumps_bytes(columnar), args.repeat)
+                _report(f"{name}.serialize.provider_columnar", None, ms, len(body))
+        finally:
+            conn.close()
@@ -0,0 +1,31 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH
+from derived import DERIVED_TABLES, build_derived_tables
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build derived tables in ncaa.db")
+    parser.add_argument("--db", default=DB_PATH, help=f"Path to the SQLite database (default: {DB_PATH})")
+    parser.add_argument("--only", nargs="+", choices=list(DERIVED_TABLES.keys()),
+                        help="Only build these tables (default: all)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(args.db)
+    try:
+        built = build_derived_tables(conn, args.only)
+    finally:
+        conn.close()
+
+    print(f"Built {', '.join(built)} in {time.perf_counter() - start:.1f}s")
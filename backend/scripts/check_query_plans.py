@@ -0,0 +1,287 @@
+"""
+Query plan regression check for the API.
+
+Requests every GET /api route (plus the query-string variants below)
+against a fixture database, captures each SQL statement the routes run and
+fails when a plan does a full SCAN of one of the large tables without an
+allowlist entry, e.g. a LIKE '%q%' filter or an OR across two indexed
+columns. It also fails when a route doesn't return its expected status,
+runs no SQL, or runs a statement that can't be explained, so nothing
+passes unchecked. Each request sees a new data version, so per-data caches
+are cold and every route runs its own loaders. Run it on a migrated
+database (scripts/migrate.py) so the indexes exist:
+
+    python scripts/check_query_plans.py --db ncaa.db
+"""
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, g
+
+import db
+import exports
+from config import DB_PATH
+from json_provider import FastJSONProvider
+
+LARGE_TABLES = {'pbp', 'rosters', 'batting', 'pitching', 'schedules'}
+
+# (route rule, table) -> why a full scan is acceptable there
+ALLOWLIST = {
+    ('/api/similar-batters/<string:player_id>', 'batting'): "compares the player with every batter in the division-year",
+    ('/api/similar-pitchers/<string:player_id>', 'pitching'): "compares the player with every pitcher in the division-year",
+}
+
+# Statement fragment -> why; for in-memory data loaded once per data version by whichever route runs first
+LOAD_ONCE = {}
+
+# Query strings for routes that need more than their path to return 200
+ROUTE_QUERIES = {
+    '/api/games': 'month={month}&day={day}&year={year}&division={division}',
+    '/api/player-percentiles': 'player_ids={batter_id}&year={year}&division={division}',
+    '/api/players_batting/<team_name>': 'division={division}&year={year}',
+    '/api/players_pitching/<team_name>': 'division={division}&year={year}',
+    '/api/search/players': 'q={search}',
+}
+
+# Successful statuses other than 2xx
+EXPECTED_STATUS = {
+    '/api/team-logo/<int:org_id>': 302,
+}
+
+# Route -> why it isn't checked
+SKIPPED_ROUTES = {
+    '/api/trending-players': "reads Firestore, not ncaa.db",
+}
+
+# Further variants that exercise other queries of a route
+EXTRA_REQUESTS = [
+    '/api/batting?conference={conference}&min_pa=10&limit=25',
+    '/api/batting?team={team_name}&sort=woba&order=desc',
+    '/api/pitching?conference={conference}&min_ip=5&limit=25',
+    '/api/search/players?q={search}&mode=fuzzy',
+    '/api/players?limit=100',
+    '/api/player/{batter_id}?include=',
+    '/api/team_games/{team_id}?year={year}',
+    '/api/org_games/{org_id}?start_year={year}&end_year={year}',
+    '/api/leaderboards/rolling?player_type=pitcher',
+    '/api/rolling/{batter_id}?window=5',
+]
+
+# Path variables with no fixture value (e.g. Firestore ids); those routes are skipped
+UNSAMPLED = object()
+
+_FROM_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_SCAN_RE = re.compile(r"^SCAN (\w+)")
+_KEYWORDS = {'where', 'on', 'left', 'inner', 'join', 'group', 'order', 'limit', 'union', 'cross', 'using', 'natural'}
+
+
+def _samples(conn, division):
+    """Path and query values drawn from the fixture, keyed by variable name."""
+    batter = conn.execute(
+        "SELECT player_id, team_name, conference, year FROM batting WHERE division = ? ORDER BY pa DESC LIMIT 1",
+        (division,),
+    ).fetchone()
+    pitcher = conn.execute(
+        "SELECT player_id FROM pitching WHERE division = ? ORDER BY ip DESC LIMIT 1", (division,)
+    ).fetchone()
+    roster = conn.execute(
+        "SELECT org_id, player_name FROM rosters WHERE player_id = ? LIMIT 1", (batter['player_id'],)
+    ).fetchone()
+    game = conn.execute(
+        "SELECT contest_id, year, date FROM pbp WHERE division = ? LIMIT 1", (division,)
+    ).fetchone()
+    team = conn.execute(
+        "SELECT team_id FROM schedules WHERE division = ? AND year = ? LIMIT 1", (division, batter['year'])
+    ).fetchone()
+    month, day, _ = game['date'].split('/')
+    return {
+        'player_id': batter['player_id'],
+        'batter_id': batter['player_id'],
+        'pitcher_id': pitcher['player_id'],
+        'team_name': batter['team_name'],
+        'conference': batter['conference'],
+        'search': (roster['player_name'] or 'a')[:3],
+        'org_id': roster['org_id'],
+        'team_id': team['team_id'],
+        'year': batter['year'],
+        'division': division,
+        'contest_id': game['contest_id'],
+        'game_year': game['year'],
+        'month': month,
+        'day': day,
+        'table': 'batting',
+        'key_id': UNSAMPLED,
+    }
+
+
+def _route_requests(app, samples):
+    """(rule, url) for every GET /api route with its path and query filled in, then EXTRA_REQUESTS."""
+    requests = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if 'GET' not in rule.methods or not rule.rule.startswith('/api/'):
+            continue
+        if rule.rule in SKIPPED_ROUTES:
+            print(f"skip {rule.rule}: {SKIPPED_ROUTES[rule.rule]}")
+            continue
+        values = {}
+        for name in rule.arguments:
+            value = samples.get(name, UNSAMPLED)
+            if name == 'player_id' and 'pitch' in rule.rule:
+                value = samples['pitcher_id']
+            if name == 'year' and 'contest_id' in rule.arguments:
+                value = samples['game_year']
+            values[name] = value
+        if any(value is UNSAMPLED for value in values.values()):
+            print(f"skip {rule.rule}: no fixture value for {', '.join(k for k, v in values.items() if v is UNSAMPLED)}")
+            continue
+        url = rule.build(values, append_unknown=False)[1]
+        if rule.rule in ROUTE_QUERIES:
+            url += '?' + ROUTE_QUERIES[rule.rule].format(**samples)
+        requests.append((rule.rule, url))
+
+    adapter = app.url_map.bind('localhost')
+    for template in EXTRA_REQUESTS:
+        url = template.format(**samples)
+        endpoint, _ = adapter.match(url.split('?')[0], method='GET')
+        rule = next(r.rule for r in app.url_map.iter_rules(endpoint))
+        requests.append((rule, url))
+    return requests
+
+
+def _aliases(sql):
+    """alias (or table name) -> table for the tables a statement reads."""
+    aliases = {}
+    for table, alias in _FROM_RE.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in _KEYWORDS:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def _full_scans(conn, sql):
+    """(table, plan line) for every large-table full scan in a statement's plan; raises sqlite3.Error."""
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    aliases = _aliases(sql)
+    scans = []
+    for row in plan:
+        match = _SCAN_RE.match(row[3])
+        if not match:
+            continue
+        table = aliases.get(match.group(1).lower(), match.group(1).lower())
+        if table in LARGE_TABLES:
+            scans.append((table, row[3]))
+    return scans
+
+
+def _create_app():
+    from routes.batting import bp as batting_bp
+    from routes.pitching import bp as pitching_bp
+    from routes.conferences import bp as conferences_bp
+    from routes.logo import bp as logo_bp
+    from routes.leaderboards import bp as leaderboards_bp, player_bp as player_leaderboards_bp
+    from routes.team_data import bp as team_data_bp
+    from routes.player_data import bp as player_data_bp
+    from routes.guts import bp as guts_bp
+    from routes.games import bp as games_bp
+    from routes.exports import bp as exports_bp
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    for bp in (batting_bp, pitching_bp, conferences_bp, logo_bp, leaderboards_bp, player_leaderboards_bp,
+               team_data_bp, player_data_bp, guts_bp, games_bp, exports_bp):
+        app.register_blueprint(bp)
+
+    @app.before_request
+    def _authenticate():
+        # Treated like an /api/batch sub-request: already authenticated, not rate limited
+        g.batch_user = {'uid': 'query-plan-check', 'auth_type': 'api_key', 'is_anonymous': False}
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail on unallowlisted full scans of large tables")
+    parser.add_argument("--db", default=DB_PATH, help=f"Path to the SQLite database (default: {DB_PATH})")
+    parser.add_argument("--division", type=int, default=3)
+    parser.add_argument("--verbose", action="store_true", help="Print every statement's plan")
+    args = parser.parse_args()
+
+    db.DB_PATH = args.db
+    app = _create_app()
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    samples = _samples(conn, args.division)
+
+    # Built exports would otherwise be served from disk without any SQL
+    export_dir = tempfile.mkdtemp(prefix='query-plan-check-')
+    exports.EXPORT_DIR = export_dir
+
+    violations = []
+    failures = []
+    seen = set()
+    client = app.test_client()
+    try:
+        for number, (rule, url) in enumerate(_route_requests(app, samples)):
+            statements = []
+            db.set_data_version(f"query-plan-check-{number}")
+            db.set_trace_callback(statements.append)
+            try:
+                response = client.get(url)
+                response.get_data()
+                response.close()
+            finally:
+                db.set_trace_callback(None)
+                db.set_data_version(None)
+            print(f"{response.status_code} {url} ({len(statements)} statements)")
+
+            expected = EXPECTED_STATUS.get(rule)
+            if expected is not None and response.status_code != expected:
+                failures.append((url, f"status {response.status_code}, expected {expected}"))
+            elif expected is None and not 200 <= response.status_code < 300:
+                failures.append((url, f"status {response.status_code}"))
+            if not statements:
+                failures.append((url, "ran no SQL"))
+
+            for sql in statements:
+                key = (rule, ' '.join(sql.split()))
+                if key in seen:
+                    continue
+                seen.add(key)
+                try:
+                    scans = _full_scans(conn, sql)
+                except sqlite3.Error as e:
+                    failures.append((url, f"could not explain ({e}): {key[1][:160]}"))
+                    continue
+                if args.verbose:
+                    print(f"    {key[1][:160]}")
+                    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                        print(f"        {row[3]}")
+                if any(fragment in key[1] for fragment in LOAD_ONCE):
+                    continue
+                for table, detail in scans:
+                    if (rule, table) not in ALLOWLIST:
+                        violations.append((rule, table, detail, key[1]))
+    finally:
+        conn.close()
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+    if failures:
+        print(f"\n{len(failures)} request(s) not checked:")
+        for url, reason in failures:
+            print(f"  {url}: {reason}")
+    if violations:
+        print(f"\n{len(violations)} full scan(s) of large tables:")
+        for rule, table, detail, sql in violations:
+            print(f"  {rule}: {detail} [{table}]\n      {sql[:200]}")
+    if failures or violations:
+        sys.exit(1)
+    print("\nNo unallowlisted full scans")
@@ -0,0 +1,1499 @@
+"""
+Generate a synthetic, schema-compatible ncaa.db for local benchmarks.
+
+Simulates whole seasons: conferences and teams per division, rosters that
+carry players from year to year (with accented and apostrophe names), a
+weekend-series schedule and every game plate appearance by plate
+appearance, with platoon splits, park factors, steals, double plays,
+bullpen usage and win expectancy. pbp, schedules and every season table
+(batting, pitching, their team totals, splits, situational, batted ball,
+baserunning, rolling wOBA, guts, expected runs) are aggregated from the
+same plays, so they agree with each other the way the scraped tables do.
+
+--scale multiplies the number of teams per division; 1 is about one real
+season per year (~940 teams, ~22k games, ~1.8M pbp rows). Rows grow
+linearly with it, e.g. 5 or 20 for load tests.
+
+    python scripts/generate_synthetic_db.py --db synthetic.db --scale 1 --migrate
+    python scripts/benchmark.py --db synthetic.db
+    python scripts/check_query_plans.py --db synthetic.db
+"""
+import argparse
+import logging
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from array import array
+from collections import defaultdict
+from datetime import date, timedelta
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import MAX_YEAR
+from migrations import migrate
+
+logger = logging.getLogger(__name__)
+
+rng = random.Random()
+
+# League shape at --scale 1
+TEAMS_PER_DIVISION = {1: 300, 2: 250, 3: 390}
+CONFERENCE_SIZE = 10
+PITCHERS_PER_ROSTER = 16
+HITTER_POSITIONS = ['C', 'C', 'C', '1B', '1B', '2B', '2B', 'SS', 'SS', '3B', '3B', 'INF', 'INF',
+                    'OF', 'OF', 'OF', 'OF', 'OF', 'UT']
+SEASON_WEEKS = 12
+CONFERENCE_WEEKS_FROM = 5
+EXTRA_INNINGS_CAP = 6
+PBP_BATCH_SIZE = 100000
+WINDOWS = (25, 50, 100)
+
+K, BB, HBP, SINGLE, DOUBLE, TRIPLE, HR = range(7)
+
+# Per-PA event rates, then each division's multipliers (D1 has better pitching)
+BASE_RATES = (0.190, 0.100, 0.035, 0.158, 0.048, 0.007, 0.020)
+DIVISION_RATES = {
+    1: (1.05, 0.98, 0.97, 0.97, 0.98, 0.92, 0.97),
+    2: (1.00, 1.00, 1.00, 1.00, 1.00, 1.00, 1.00),
+    3: (0.94, 1.05, 1.05, 1.04, 1.03, 1.10, 1.03),
+}
+WOBA_WEIGHTS = (0.83, 0.86, 0.97, 1.33, 1.66, 2.05)
+WOBA_SCALE = 1.22
+
+# Run expectancy by outs, then base state (bit 0 = first, 1 = second, 2 = third)
+RUN_EXPECTANCY = (
+    (0.58, 0.98, 1.20, 1.58, 1.42, 1.85, 2.05, 2.45),
+    (0.31, 0.60, 0.75, 1.02, 1.00, 1.25, 1.45, 1.65),
+    (0.12, 0.26, 0.35, 0.48, 0.40, 0.55, 0.65, 0.85),
+)
+SCORING_PROBABILITY = (
+    (0.30, 0.45, 0.63, 0.65, 0.85, 0.88, 0.88, 0.88),
+    (0.17, 0.29, 0.42, 0.44, 0.68, 0.66, 0.70, 0.70),
+    (0.07, 0.14, 0.24, 0.25, 0.28, 0.29, 0.28, 0.34),
+)
+DIVISION_RUN_ENVIRONMENT = {1: 0.93, 2: 1.00, 3: 1.07}
+BASE_STATES = ['_ _ _', '1 _ _', '_ 2 _', '1 2 _', '_ _ 3', '1 _ 3', '_ 2 3', '1 2 3']
+BASE_NAMES = ('first', 'second', 'third')
+
+HOME_EDGE = 0.15
+TIE_VARIANCE = 1.0
+LI_NORM = 0.187
+HIGH_LEVERAGE = 1.5
+LOW_LEVERAGE = 0.85
+
+RUNS_SB = 0.2
+GDP_RUNS = 0.37
+EBT_RUNS = 0.2
+OOB_RUNS = -0.45
+REPLACEMENT_RUNS_PER_PA = 0.03
+REPLACEMENT_RUNS_PER_IP = 0.12
+POSITION_RUNS = {'C': 3.0, 'SS': 2.0, '2B': 1.0, '3B': 1.0, 'INF': 0.5, 'UT': 0.0, 'OF': -0.5, '1B': -3.0}
+
+FIRST_NAMES = [
+    'Aiden', 'Andrés', 'Ángel', 'Austin', 'Ben', 'Björn', 'Brady', 'Caleb', 'Carlos', 'Chase', 'Cole',
+    'Connor', 'Cooper', 'Daniel', 'Diego', 'Dylan', 'Eli', 'Ethan', 'Gavin', 'Héctor', 'Hunter', 'Iván',
+    'Jack', 'Jake', 'Jaylen', 'Joaquín', 'José', 'Josh', 'Julián', 'Kyle', 'Liam', 'Logan', 'Luis', 'Luke',
+    'Marcus', 'Mason', 'Matt', 'Max', 'Nate', 'Nicolás', 'Noah', 'Owen', 'Parker', 'Rafael', 'Ramón',
+    'Reid', 'Rubén', 'Ryan', 'Sam', 'Sebastián', 'Seth', 'Shane', 'Søren', 'Tanner', 'Trey', 'Tyler',
+    'Will', 'Wyatt', 'Zach',
+]
+LAST_NAMES = [
+    'Acosta', 'Allen', 'Anderson', 'Bailey', 'Baker', 'Brooks', 'Brown', 'Campbell', 'Castillo', 'Clark',
+    'Collins', 'Cruz', 'Davis', 'De La Cruz', 'Díaz', 'Evans', 'Fernández', 'Fischer', 'Flores', 'García',
+    'García-López', 'Gómez', 'González', 'Hall', 'Harris', 'Hernández', 'Hughes', 'Ibáñez', 'Jackson',
+    'Johnson', 'Jones', 'Kelly', 'Kim', 'King', 'Lee', 'López', 'Martin', 'Martínez', 'McAllister',
+    'Miller', 'Moore', 'Morales', 'Muñoz', 'Murphy', 'Nelson', 'Nguyen', 'Núñez', "O'Brien", "O'Connor",
+    'Ortiz', 'Parker', 'Peña', 'Pérez', 'Phillips', 'Ramírez', 'Reyes', 'Rivera', 'Roberts', 'Rodríguez',
+    'Ruiz', 'Sánchez', 'Schäfer', 'Scott', 'Smith', 'St. Pierre', 'Stewart', 'Sullivan', 'Taylor',
+    'Thompson', 'Torres', 'Van der Berg', 'Walker', 'White', 'Williams', 'Wilson', 'Wright', 'Young',
+]
+NAME_SUFFIXES = [' Jr.', ' II', ' III']
+PLACES = [
+    'Albany', 'Alder Creek', 'Ashford', 'Bay Ridge', 'Bellmont', 'Birchwood', 'Brookhaven', 'Cañon City',
+    'Carver', 'Cedar Falls', 'Clearwater', "Coeur d'Alene", 'Concord', 'Crestview', 'Dover', 'Eastbrook',
+    'Elmira', 'Española', 'Fairhaven', 'Glenwood', 'Granite Bay', 'Greenfield', 'Hamilton', 'Harbor City',
+    'Highland', 'Hillsdale', 'Kingsport', 'La Cañada', 'Lakeview', 'Lewisburg', 'Linden', 'Maplewood',
+    'Marion', 'Milton', 'Montclair', 'Mount Vernon', 'New Haven', 'Northfield', 'Oakdale', 'Pine Bluff',
+    'Plainview', 'Port Allen', 'Redlands', 'Ridgefield', 'Río Grande', 'Riverside', 'Rockport', 'San José',
+    'Sheridan', 'Springfield', 'Stonebridge', 'Summit', 'Sunnyvale', 'Trenton', 'Union City',
+    'Valley Forge', 'Waverly', 'Westfield', 'Whitman', 'Willow Creek', 'Winchester', 'York',
+]
+STATES = ['AL', 'AZ', 'CA', 'CO', 'CT', 'FL', 'GA', 'IA', 'IL', 'IN', 'KS', 'KY', 'MA', 'MD', 'ME', 'MI',
+          'MN', 'MO', 'NC', 'NE', 'NH', 'NJ', 'NY', 'OH', 'OK', 'OR', 'PA', 'SC', 'TN', 'TX', 'VA', 'VT',
+          'WA', 'WI', 'PR', 'ON']
+TEAM_PATTERNS = ['{}', '{} St.', 'St. {}', '{} Col.', 'North {}', 'Southern {}', '{} Tech', 'Mount {}']
+HIGH_SCHOOL_PATTERNS = ['{} HS', '{} High School', '{} Academy', '{} Christian', 'St. Joseph ({})',
+                        'Colegio San Ignacio', "Bishop O'Dowd", 'Cardinal Gibbons']
+CONFERENCE_REGIONS = [
+    'Atlantic', 'Big Sky', 'Capital', 'Centennial', 'Coastal', 'Colonial', 'Empire', 'Great Lakes',
+    'Great Northwest', 'Gulf South', 'Heartland', 'Keystone', 'Liberty', 'Lone Star', 'Mid-America',
+    'Mid-Atlantic', 'Midwest', 'Mountain', 'North Coast', 'Northeast', 'Ohio Valley', 'Old Dominion',
+    'Pacific', 'Peach Belt', 'Prairie', 'Southern', 'Sunshine State', 'Upper Midwest', 'Western',
+]
+CONFERENCE_KINDS = ['Conference', 'Athletic Conference', 'Collegiate Conference', 'League',
+                    'Intercollegiate Athletic Conference', 'Athletic Association']
+TEAM_COLORS = ['#000000', '#FFFFFF', '#002855', '#8C1D40', '#FFC72C', '#00843D', '#BA0C2F', '#4B2E83',
+               '#FF7F00', '#0033A0', '#862633', '#C5B783', '#6F263D', '#13294B', '#E04E39', '#154734']
+CLASSES = ['Fr.', 'So.', 'Jr.', 'Sr.', 'Gr.']
+
+# Description text by event and field side ('left', 'middle', 'right')
+GROUND_SINGLES = {'left': ['singled through the left side', 'singled to shortstop', 'singled to third base'],
+                  'middle': ['singled up the middle', 'singled to pitcher'],
+                  'right': ['singled through the right side', 'singled to second base', 'singled to first base']}
+AIR_SINGLES = {'left': ['singled to left field'], 'middle': ['singled to center field'],
+               'right': ['singled to right field']}
+GROUND_DOUBLES = {'left': ['doubled down the lf line'], 'middle': ['doubled to center field'],
+                  'right': ['doubled down the rf line']}
+AIR_DOUBLES = {'left': ['doubled to left field', 'doubled to left center'], 'middle': ['doubled to center field'],
+               'right': ['doubled to right field', 'doubled to right center']}
+TRIPLES = {'left': ['tripled to left field'], 'middle': ['tripled to center field'],
+           'right': ['tripled to right field', 'tripled down the rf line']}
+HOMERS = {'left': ['homered to left field', 'homered to lf'], 'middle': ['homered to center field', 'homered to cf'],
+          'right': ['homered to right field', 'homered to rf']}
+OUTS = {
+    'gb': {'left': ['grounded out to ss', 'grounded out to 3b'],
+           'middle': ['grounded out to p', 'grounded out to ss', 'grounded out to 2b'],
+           'right': ['grounded out to 2b', 'grounded out to 1b unassisted', 'grounded out to 1b']},
+    'ld': {'left': ['lined out to ss', 'lined out to 3b', 'lined out to lf'],
+           'middle': ['lined out to p', 'lined out to cf'],
+           'right': ['lined out to 2b', 'lined out to 1b', 'lined out to rf']},
+    'pop': {'left': ['popped up to ss', 'popped up to 3b', 'fouled out to 3b'],
+            'middle': ['popped up to c', 'popped up to 2b'],
+            'right': ['popped up to 1b', 'fouled out to 1b', 'popped up to 2b']},
+    'fb': {'left': ['flied out to lf'], 'middle': ['flied out to cf'], 'right': ['flied out to rf']},
+}
+DOUBLE_PLAYS = {'left': ['grounded into double play ss to 2b to 1b', 'grounded into double play 3b to 2b to 1b'],
+                'middle': ['grounded into double play p to ss to 1b', 'grounded into double play ss to 1b'],
+                'right': ['grounded into double play 2b to ss to 1b', 'grounded into double play 1b to ss to p']}
+OUTFIELD = {'left': 'lf', 'middle': 'cf', 'right': 'rf'}
+INFIELD = {'left': ['ss', '3b'], 'middle': ['p', 'ss', '2b'], 'right': ['2b', '1b']}
+
+# (ab, h, tb, on base, OBP denominator) per plate appearance outcome
+OUTCOMES = {
+    'k': (1, 0, 0, 0, 1), 'bb': (0, 0, 0, 1, 1), 'hbp': (0, 0, 0, 1, 1),
+    '1b': (1, 1, 1, 1, 1), '2b': (1, 1, 2, 1, 1), '3b': (1, 1, 3, 1, 1), 'hr': (1, 1, 4, 1, 1),
+    'out': (1, 0, 0, 0, 1), 'dp': (1, 0, 0, 0, 1), 'roe': (1, 0, 0, 0, 1),
+    'sf': (0, 0, 0, 0, 1), 'sac': (0, 0, 0, 0, 0),
+}
+HIT_KINDS = ('1b', '2b', '3b', 'hr')
+
+# Line slots: PA, AB, H, TB, on base, OBP denominator, wOBA sum, RE24 sum
+LINE_PA, LINE_AB, LINE_H, LINE_TB, LINE_OB, LINE_OBD, LINE_WOBA, LINE_RE = range(8)
+# Batted-ball slots
+BIP_COUNT, BIP_PULL, BIP_OPPO, BIP_MIDDLE, BIP_GB, BIP_FB, BIP_LD, BIP_POP, BIP_PULL_AIR, BIP_OPPO_GB = range(10)
+
+PLAYER_KEYS = ['player_id', 'player_name', 'team_name', 'conference', 'division', 'year']
+TEAM_KEYS = ['team_name', 'conference', 'division', 'year']
+BATTING_STATS = [
+    'gp', 'gs', 'pa', 'ab', 'h', '2b', '3b', 'hr', 'r', 'rbi', 'bb', 'hbp', 'k', 'sf', 'sac', 'sb', 'cs',
+    'picked', 'gdp', 'gdp_opps', 'ba', 'ob_pct', 'slg_pct', 'iso', 'woba', 'wrc', 'wrc_plus', 'ops_plus',
+    'r_div_pa', 'k_pct', 'bb_pct', 'sb_pct', 'batting', 'baserunning', 'adjustment', 'war', 'sos_adj_war',
+    'wpa', 'wpa_li', 'rea', 'clutch', 'wsb', 'wgdp', 'wteb', 'ebt', 'outs_ob',
+]
+PITCHING_STATS = [
+    'app', 'gs', 'w', 'l', 'sv', 'ip', 'bf', 'pitches', 'h', '2b_a', '3b_a', 'hr_a', 'r', 'er', 'bb', 'hbp',
+    'so', 'go', 'fo', 'inh_run', 'inh_run_score', 'ir_a_pct', 'era', 'era+', 'fip', 'xfip', 'ra9', 'h9',
+    'bb9', 'k9', 'hr9', 'k_pct', 'bb_pct', 'k_minus_bb_pct', 'hr_div_fb', 'gmli', 'war', 'sos_adj_war',
+    'pwpa', 'pwpa_li', 'prea', 'clutch',
+]
+BATTING_SUMMED = ['batting', 'baserunning', 'adjustment', 'war', 'sos_adj_war', 'wsb', 'wgdp', 'wteb']
+PITCHING_SUMMED = ['war', 'sos_adj_war']
+SITUATIONS = ['overall', 'risp', 'high_leverage', 'low_leverage']
+SITUATIONAL_STATS = (
+    [f'woba_{s}' for s in SITUATIONS] + [f'pa_{s}' for s in SITUATIONS]
+    + ['ba_overall', 'ba_high_leverage', 'ba_low_leverage', 'ba_risp']
+    + ['re24_overall', 're24_high_leverage', 're24_low_leverage', 're24_risp', 'clutch']
+)
+SPLIT_STATS = ['pa', 'ba', 'ob_pct', 'slg_pct', 'woba']
+SPLITS = {'splits_batting': ['overall', 'vs_rhp', 'vs_lhp'], 'splits_pitching': ['overall', 'vs_rhh', 'vs_lhh']}
+
+SCHEMA = {
+    'team_information': ['org_id', 'ncaa_slug', 'colors_hex', 'conference'],
+    'team_history': ['org_id', 'team_id', 'division', 'season', 'team_name', 'conference', 'wins', 'losses', 'ties'],
+    'rosters': PLAYER_KEYS + ['org_id', 'class', 'height', 'bats', 'throws', 'hometown', 'high_school',
+                              'position', 'img_url'],
+    'schedules': ['contest_id', 'year', 'division', 'date', 'team', 'team_id', 'opponent', 'opponent_team_id',
+                  'team_score', 'opponent_score', 'innings', 'attendance', 'neutral_site'],
+    'pbp': ['contest_id', 'play_id', 'year', 'division', 'date', 'home_team', 'away_team', 'home_score',
+            'away_score', 'inning', 'top_inning', 'description', 'home_win_exp_before', 'home_win_exp_after',
+            'wpa', 'run_expectancy_delta', 'batter_id', 'pitcher_id', 'li', 'home_score_after',
+            'away_score_after', 'woba'],
+    'batting': PLAYER_KEYS + ['class', 'bats', 'throws'] + BATTING_STATS,
+    'batting_team': TEAM_KEYS + BATTING_STATS,
+    'pitching': PLAYER_KEYS + ['class', 'throws'] + PITCHING_STATS,
+    'pitching_team': TEAM_KEYS + PITCHING_STATS,
+    'baserunning': PLAYER_KEYS + ['baserunning', 'wsb', 'wgdp', 'wteb', 'picked', 'sb', 'cs', 'sb_pct',
+                                  'opportunities', 'outs_ob', 'ebt'],
+    'batted_ball': PLAYER_KEYS + ['count', 'batter_hand', 'pull_pct', 'oppo_pct', 'middle_pct', 'gb_pct',
+                                  'fb_pct', 'ld_pct', 'pop_pct', 'pull_air_pct', 'oppo_gb_pct'],
+    'situational_batting': PLAYER_KEYS + SITUATIONAL_STATS,
+    'situational_pitching': PLAYER_KEYS + SITUATIONAL_STATS,
+    'splits_batting': PLAYER_KEYS + [f'{stat}_{split}' for split in SPLITS['splits_batting'] for stat in SPLIT_STATS],
+    'splits_pitching': PLAYER_KEYS + [f'{stat}_{split}' for split in SPLITS['splits_pitching'] for stat in SPLIT_STATS],
+    'rolling_batting': ['player_id'] + [f'{w}_{part}' for w in WINDOWS for part in ('now', 'then', 'delta')],
+    'rolling_pitching': ['player_id'] + [f'{w}_{part}' for w in WINDOWS for part in ('now', 'then', 'delta')],
+    'guts_constants': ['year', 'division', 'woba', 'woba_scale', 'wbb', 'whbp', 'w1b', 'w2b', 'w3b', 'whr',
+                       'runs_sb', 'runs_cs', 'runs_out', 'runs_pa', 'runs_win', 'cs_rate', 'cfip'],
+    'park_factors': ['team_name', 'division', 'pf', '1b_pf', '2b_pf', '3b_pf', 'hr_pf', 'bb_pf', 'hbp_pf',
+                     'e_pf', 'reg_factor'],
+    'expected_runs': ['year', 'division', 'bases', 'erv_0', 'erv_1', 'erv_2', 'prob_0', 'prob_1', 'prob_2'],
+}
+TEXT_COLUMNS = {
+    'player_id', 'player_name', 'team_name', 'conference', 'class', 'bats', 'throws', 'height', 'hometown',
+    'high_school', 'position', 'img_url', 'ncaa_slug', 'colors_hex', 'date', 'team', 'opponent',
+    'home_team', 'away_team', 'description', 'batter_id', 'pitcher_id', 'batter_hand', 'bases',
+}
+INTEGER_COLUMNS = {
+    'division', 'year', 'season', 'org_id', 'team_id', 'opponent_team_id', 'contest_id', 'play_id',
+    'home_score', 'away_score', 'home_score_after', 'away_score_after', 'inning', 'top_inning',
+    'team_score', 'opponent_score', 'innings', 'attendance', 'neutral_site', 'wins', 'losses', 'ties',
+    'count', 'opportunities', 'app', 'w', 'l', 'sv', 'bf', 'pitches', 'er', 'so', 'go', 'fo', 'inh_run',
+    'inh_run_score', '2b_a', '3b_a', 'hr_a',
+} | {stat for stat in BATTING_STATS[:20]} | {'ebt', 'outs_ob'}
+
+
+def _column_type(table, column):
+    if table == 'team_history' and column == 'division':
+        return 'TEXT'
+    if column in TEXT_COLUMNS:
+        return 'TEXT'
+    if column in INTEGER_COLUMNS or column.startswith('pa_'):
+        return 'INTEGER'
+    return 'REAL'
+
+
+def _create_tables(conn):
+    for table, columns in SCHEMA.items():
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+        definitions = ', '.join(f'"{column}" {_column_type(table, column)}' for column in columns)
+        conn.execute(f"CREATE TABLE {table} ({definitions})")
+
+
+def _insert(conn, table, rows):
+    """Insert tuples in SCHEMA column order, or dicts keyed by column."""
+    columns = SCHEMA[table]
+    rows = [tuple(row.get(column) for column in columns) if isinstance(row, dict) else row for row in rows]
+    placeholders = ', '.join('?' * len(columns))
+    conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+
+def _slug(text):
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', ascii_text.lower()).strip('-')
+
+
+def _talent(sd, low=0.5, high=2.0):
+    return min(max(rng.lognormvariate(0, sd), low), high)
+
+
+def _unique_names(count, make, used):
+    names = []
+    attempts = 0
+    while len(names) < count:
+        name = make()
+        attempts += 1
+        if name in used:
+            if attempts > 20:
+                name = f"{name} ({rng.choice(STATES)})"
+            if name in used:
+                continue
+        used.add(name)
+        names.append(name)
+        attempts = 0
+    return names
+
+
+# -- League, rosters and schedule ------------------------------------------------------------------
+
+def _build_league(divisions, scale):
+    """{division: [team]} with conferences, org ids, colors and park factors."""
+    league = {}
+    used_teams = set()
+    used_conferences = set()
+    org_id = 100
+    for division in divisions:
+        count = max(4, round(TEAMS_PER_DIVISION[division] * scale))
+        names = _unique_names(count, lambda: rng.choice(TEAM_PATTERNS).format(rng.choice(PLACES)), used_teams)
+
+        conference_count = max(1, count // CONFERENCE_SIZE)
+        conferences = _unique_names(
+            conference_count,
+            lambda: f"{rng.choice(CONFERENCE_REGIONS)} {rng.choice(CONFERENCE_KINDS)}",
+            used_conferences,
+        )
+        conference_strength = {name: rng.gauss(0, 0.04) for name in conferences}
+
+        teams = []
+        for i, name in enumerate(names):
+            org_id += 1
+            conference = conferences[i * conference_count // count]
+            park = {'pf': rng.gauss(100, 5)}
+            for event in ('1b', '2b', '3b', 'hr', 'bb', 'hbp', 'e'):
+                spread = {'hr': 14, '3b': 18, 'e': 12}.get(event, 6)
+                park[f'{event}_pf'] = rng.gauss(park['pf'], spread)
+            teams.append({
+                'org_id': org_id,
+                'team_name': name,
+                'ncaa_slug': _slug(name),
+                'conference': conference,
+                'division': division,
+                'strength': math.exp(conference_strength[conference] + rng.gauss(0, 0.05)),
+                'colors_hex': ';'.join(rng.sample(TEAM_COLORS, 2)),
+                'park': park,
+                'reg_factor': rng.choice([0.6, 0.7, 0.8, 0.9, 1.0]),
+                'hitters': [],
+                'pitchers': [],
+            })
+
+        # Park factors average 100 within a division, like the real ones
+        offset = 100 - sum(team['park']['pf'] for team in teams) / len(teams)
+        for team in teams:
+            park = team['park']
+            for key in park:
+                park[key] += offset
+            # Park multipliers in event order (K, BB, HBP, 1B, 2B, 3B, HR)
+            team['park_rates'] = (1.0, park['bb_pf'] / 100, park['hbp_pf'] / 100, park['1b_pf'] / 100,
+                                  park['2b_pf'] / 100, park['3b_pf'] / 100, park['hr_pf'] / 100)
+
+        mean_strength = sum(team['strength'] for team in teams) / len(teams)
+        by_conference = defaultdict(list)
+        for team in teams:
+            by_conference[team['conference']].append(team['strength'])
+        for team in teams:
+            strengths = by_conference[team['conference']]
+            relative = sum(strengths) / len(strengths) / mean_strength
+            team['sos'] = min(max(1 + 3 * (relative - 1), 0.8), 1.2)
+        league[division] = teams
+    return league
+
+
+_next_player_id = [0]
+
+
+def _new_player(team, year, pitcher, position, klass):
+    _next_player_id[0] += 1
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    if rng.random() < 0.03:
+        name += rng.choice(NAME_SUFFIXES)
+    inches = min(max(round(rng.gauss(72.5, 2.4)), 66), 79)
+    place = rng.choice(PLACES)
+    throws = 'L' if rng.random() < (0.28 if pitcher else 0.12) else 'R'
+    bats = rng.choices(['R', 'L', 'S'], weights=[0.6, 0.3, 0.1])[0]
+    player = {
+        'player_id': f"d3d-{_next_player_id[0]}",
+        'player_name': name,
+        'class': klass,
+        'position': position,
+        'height': f"{inches // 12}-{inches % 12}",
+        'bats': bats,
+        'throws': throws,
+        'hometown': f"{place}, {rng.choice(STATES)}",
+        'high_school': rng.choice(HIGH_SCHOOL_PATTERNS).format(rng.choice(PLACES)),
+        'pitcher': pitcher,
+        'joined': year,
+    }
+    if pitcher:
+        player['talent'] = {'k': _talent(0.2), 'bb': _talent(0.25), 'hbp': _talent(0.3),
+                            'hit': _talent(0.07, 0.8, 1.25), 'hr': _talent(0.2)}
+        player['stamina'] = rng.random()
+        player['gb'] = min(max(rng.gauss(0.44, 0.06), 0.25), 0.65)
+    else:
+        player['talent'] = {'k': _talent(0.22), 'bb': _talent(0.25), 'hbp': _talent(0.3),
+                            'contact': _talent(0.1, 0.7, 1.4), 'power': _talent(0.35, 0.2, 3.0),
+                            'speed': _talent(0.25, 0.4, 2.0)}
+        player['pull'] = min(max(rng.gauss(0.42, 0.06), 0.25), 0.6)
+        player['gb'] = min(max(rng.gauss(0.43, 0.06), 0.25), 0.65)
+        player['bunt'] = 0.15 if player['talent']['power'] < 0.6 else 0.03
+    return player
+
+
+def _develop(player):
+    """A year older: a little better at everything."""
+    talent = player['talent']
+    for key in talent:
+        if key in ('k', 'hit') and not player['pitcher'] or key in ('bb', 'hit', 'hr') and player['pitcher']:
+            talent[key] *= math.exp(rng.gauss(-0.03, 0.05))
+        else:
+            talent[key] *= math.exp(rng.gauss(0.03, 0.05))
+    player['class'] = CLASSES[min(CLASSES.index(player['class']) + 1, len(CLASSES) - 1)]
+
+
+def _advance_rosters(teams, year):
+    """Graduate, develop and refill every team's roster for a new season."""
+    for team in teams:
+        for group, size in (('hitters', len(HITTER_POSITIONS)), ('pitchers', PITCHERS_PER_ROSTER)):
+            kept = []
+            for player in team[group]:
+                if player['class'] in ('Sr.', 'Gr.') and rng.random() < 0.9 or rng.random() < 0.1:
+                    continue
+                _develop(player)
+                kept.append(player)
+            first_year = not team[group]
+            target = size + rng.randint(-2, 2)
+            while len(kept) < target:
+                klass = rng.choices(CLASSES, weights=[30, 25, 23, 17, 5])[0] if first_year else \
+                    rng.choices(CLASSES, weights=[80, 5, 7, 0, 8])[0]
+                if group == 'pitchers':
+                    position = rng.choices(['P', 'RHP', 'LHP'], weights=[0.7, 0.2, 0.1])[0]
+                else:
+                    position = HITTER_POSITIONS[len(kept) % len(HITTER_POSITIONS)]
+                kept.append(_new_player(team, year, group == 'pitchers', position, klass))
+            team[group] = kept
+
+
+def _roster_rows(team, year):
+    rows = []
+    for player in team['hitters'] + team['pitchers']:
+        x = rng.random()
+        img_url = (f"https://images.example.com/{team['ncaa_slug']}/{year}/{player['player_id']}.jpg"
+                   if x < 0.75 else ('-' if x < 0.85 else None))
+        rows.append({
+            **player,
+            'team_name': team['team_name'],
+            'conference': team['conference'],
+            'division': team['division'],
+            'year': year,
+            'org_id': team['org_id'],
+            'img_url': img_url,
+        })
+    return rows
+
+
+def _season_rates(team, env):
+    """Per-PA event rates for this season's hitters (by pitcher hand) and pitchers."""
+    base = env['rates']
+    strength = team['strength']
+    for player in team['hitters']:
+        t = player['talent']
+        rates = [base[K] * t['k'], base[BB] * t['bb'], base[HBP] * t['hbp'],
+                 base[SINGLE] * t['contact'] * strength, base[DOUBLE] * t['contact'] * t['power'] ** 0.5 * strength,
+                 base[TRIPLE] * t['contact'] * t['speed'], base[HR] * t['power'] * strength]
+        on_base = sum(rates[1:])
+        if on_base > 0.55:
+            rates = rates[:1] + [rate * 0.55 / on_base for rate in rates[1:]]
+        same = (rates[K] * 1.1, rates[BB] * 0.95, rates[HBP], rates[SINGLE] * 0.94, rates[DOUBLE] * 0.94,
+                rates[TRIPLE] * 0.94, rates[HR] * 0.92)
+        opposite = (rates[K] * 0.95, rates[BB] * 1.02, rates[HBP], rates[SINGLE] * 1.03, rates[DOUBLE] * 1.03,
+                    rates[TRIPLE] * 1.03, rates[HR] * 1.04)
+        if player['bats'] == 'S':
+            player['rates'] = {'R': opposite, 'L': opposite}
+        else:
+            player['rates'] = {player['bats']: same, 'L' if player['bats'] == 'R' else 'R': opposite}
+        player['quality'] = sum(opposite[1:]) + opposite[DOUBLE] + 2 * opposite[TRIPLE] + 3 * opposite[HR] - opposite[K] / 2
+    for player in team['pitchers']:
+        t = player['talent']
+        player['rates'] = (t['k'], t['bb'], t['hbp'], t['hit'] / strength, t['hit'] / strength, t['hit'],
+                           t['hr'] / strength)
+        player['quality'] = t['k'] / (t['bb'] * t['hit'] * t['hr'] ** 0.5) + rng.gauss(0, 0.1)
+
+    pitchers = sorted(team['pitchers'], key=lambda p: p['quality'] + p['stamina'] / 2, reverse=True)
+    team['rotation'] = pitchers[:4]
+    bullpen = sorted(pitchers[4:], key=lambda p: p['quality'], reverse=True)
+    team['closer'] = bullpen[0] if bullpen else None
+    team['bullpen'] = bullpen[1:]
+
+
+def _schedule(teams, year):
+    """(date, home, away, neutral_site, innings) for a season of weekend series and midweek games."""
+    opening_day = date(year, 2, 14)
+    opening_day += timedelta(days=(4 - opening_day.weekday()) % 7)
+    by_conference = defaultdict(list)
+    for team in teams:
+        by_conference[team['conference']].append(team)
+
+    games = []
+    for week in range(SEASON_WEEKS):
+        friday = opening_day + timedelta(weeks=week)
+        groups = list(by_conference.values()) if week >= CONFERENCE_WEEKS_FROM else [teams]
+        series = _pairings(groups)
+        for home, away in series:
+            neutral = int(week < 2 and rng.random() < 0.3)
+            for day in range(3):
+                innings = 7 if day == 2 and home['division'] != 1 and rng.random() < 0.4 else 9
+                games.append((friday + timedelta(days=day), home, away, neutral, innings))
+        if week > 0:
+            for home, away in _pairings([teams]):
+                games.append((friday - timedelta(days=2), home, away, 0, 9))
+    games.sort(key=lambda game: game[0])
+    return games
+
+
+def _pairings(groups):
+    pairs = []
+    leftover = []
+    for group in groups:
+        group = group[:]
+        rng.shuffle(group)
+        if len(group) % 2:
+            leftover.append(group.pop())
+        pairs.extend(zip(group[::2], group[1::2]))
+    rng.shuffle(leftover)
+    pairs.extend(zip(leftover[::2], leftover[1::2]))
+    return [(a, b) if rng.random() < 0.5 else (b, a) for a, b in pairs]
+
+
+# -- Season environment ----------------------------------------------------------------------------
+
+def _environment(division, year):
+    scale = DIVISION_RUN_ENVIRONMENT[division] * rng.gauss(1, 0.02)
+    re = [[value * scale for value in row] for row in RUN_EXPECTANCY]
+    weights = tuple(weight * rng.gauss(1, 0.01) for weight in WOBA_WEIGHTS)
+    return {
+        'division': division,
+        'year': year,
+        'rates': tuple(rate * mult * rng.gauss(1, 0.015)
+                       for rate, mult in zip(BASE_RATES, DIVISION_RATES[division])),
+        'weights': weights,
+        'woba': {'bb': weights[0], 'hbp': weights[1], '1b': weights[2], '2b': weights[3], '3b': weights[4],
+                 'hr': weights[5], 'k': 0.0, 'out': 0.0, 'dp': 0.0, 'roe': 0.0, 'sf': 0.0, 'sac': None},
+        'woba_scale': WOBA_SCALE * rng.gauss(1, 0.01),
+        're': re,
+        'scoring': [[min(p * scale ** 0.5, 0.95) for p in row] for row in SCORING_PROBABILITY],
+        'rpi': re[0][0],
+        'var_pi': 2.5 * re[0][0],
+    }
+
+
+def _expected_runs_rows(env):
+    rows = []
+    for mask, bases in enumerate(BASE_STATES):
+        row = {'year': env['year'], 'division': env['division'], 'bases': bases}
+        for outs in range(3):
+            row[f'erv_{outs}'] = round(env['re'][outs][mask], 3)
+            row[f'prob_{outs}'] = round(env['scoring'][outs][mask], 3)
+        rows.append(row)
+    return rows
+
+
+def _home_win_prob(env, innings, inning, top, outs, mask, diff):
+    """(home win probability, leverage index) for a base-out-score state; outs == 3 ends the half."""
+    if outs >= 3:
+        if top:
+            if inning >= innings and diff > 0:
+                return 1.0, 0.0
+            top = False
+        else:
+            if inning >= innings and diff != 0:
+                return (1.0 if diff > 0 else 0.0), 0.0
+            inning += 1
+            top = True
+        outs = 0
+        mask = 0
+    elif not top and inning >= innings and diff > 0:
+        return 1.0, 0.0
+
+    rpi = env['rpi']
+    state = env['re'][outs][mask]
+    later = max(innings - inning, 0)
+    if top:
+        mean = diff + (later + 1) * rpi - state - later * rpi
+        halves = state / rpi + 2 * later + 1
+    else:
+        mean = diff + state
+        halves = state / rpi + 2 * later
+    sd = math.sqrt(env['var_pi'] * halves + TIE_VARIANCE)
+    z = (mean + HOME_EDGE) / sd
+    p = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+    li = math.exp(-0.5 * z * z) / sd / LI_NORM
+    return min(max(p, 0.001), 0.999), min(max(li, 0.05), 8.0)
+
+
+# -- Games -----------------------------------------------------------------------------------------
+
+def _stats(season, kind, player, team):
+    states = season[kind]
+    state = states.get(player['player_id'])
+    if state is None:
+        state = states[player['player_id']] = {
+            'player': player,
+            'team': team,
+            'c': defaultdict(float),
+            'lines': {},
+            'bip': [0] * 10,
+            'last_game': None,
+        }
+    return state
+
+
+def _line(state, name):
+    line = state['lines'].get(name)
+    if line is None:
+        line = state['lines'][name] = [0.0] * 8
+    return line
+
+
+def _count(kind):
+    """('b-s SEQ' text, pitches) for a plate appearance ending in kind."""
+    if kind == 'k':
+        balls, strikes = rng.randint(0, 3), 2
+    elif kind == 'bb':
+        balls, strikes = 3, rng.randint(0, 2)
+    else:
+        balls, strikes = rng.randint(0, 3), rng.randint(0, 2)
+    seq = ['B'] * balls + [rng.choice('KSF') for _ in range(strikes)]
+    rng.shuffle(seq)
+    if strikes == 2:
+        seq.extend('F' * int(rng.expovariate(1.5)))
+    if kind == 'k':
+        seq.append(rng.choice('KS'))
+    elif kind == 'bb':
+        seq.append('B')
+    pitches = len(seq) + (kind not in ('k', 'bb'))
+    return f"{balls}-{strikes} {''.join(seq)}".strip(), pitches
+
+
+class _Game:
+    """One game in progress: score, lineups, pitchers and the pbp rows it writes."""
+
+    def __init__(self, contest_id, env, season, game_date, home, away, neutral, innings, rolling):
+        self.contest_id = contest_id
+        self.env = env
+        self.season = season
+        self.date = game_date.strftime('%m/%d/%Y')
+        self.teams = (away, home)
+        self.park = (1.0,) * 7 if neutral else home['park_rates']
+        self.innings = innings
+        self.rolling = rolling
+        self.rows = []
+        self.score = [0, 0]
+        self.inning = 1
+        self.play_id = 0
+        self.lead = 0
+        self.go_ahead = None
+        self.lineups = [self._lineup(team) for team in self.teams]
+        self.spots = [0, 0]
+        self.pitchers = [None, None]
+        self.pitch_counts = [0, 0]
+        self.limits = [0, 0]
+        self.runs_allowed = [0, 0]
+        self.bullpens = [team['bullpen'][:] for team in self.teams]
+        for pen in self.bullpens:
+            rng.shuffle(pen)
+        self.closer_used = [False, False]
+
+    def _lineup(self, team):
+        order = sorted(team['hitters'], key=lambda p: p['quality'] + rng.gauss(0, 0.02), reverse=True)[:9]
+        # Best hitter bats third
+        order.insert(2, order.pop(0))
+        return [(player, _stats(self.season, 'bat', player, team)) for player in order]
+
+    def _enter(self, side, pitcher, starter, outs=0, bases=(None, None, None)):
+        team = self.teams[side]
+        state = _stats(self.season, 'pit', pitcher, team)
+        c = state['c']
+        c['app'] += 1
+        if starter:
+            c['gs'] += 1
+            self.limits[side] = max(rng.gauss(88 + 12 * pitcher['stamina'], 12), 50)
+        else:
+            self.limits[side] = max(rng.gauss(28, 10), 10)
+            on_base = sum(runner is not None for runner in bases)
+            c['inh_run'] += on_base
+            batting = 1 - side
+            _, li = _home_win_prob(self.env, self.innings, self.inning, batting == 0, outs,
+                                   _mask(bases), self.score[1] - self.score[0])
+            c['relief_li'] += li
+            c['relief_apps'] += 1
+        self.pitchers[side] = (pitcher, state)
+        self.pitch_counts[side] = 0
+        self.runs_allowed[side] = 0
+
+    def _maybe_change(self, side, outs, bases):
+        if (self.pitch_counts[side] < self.limits[side] and self.runs_allowed[side] < 7):
+            return
+        if self.bullpens[side]:
+            self._enter(side, self.bullpens[side].pop(), False, outs, bases)
+
+    def _maybe_close(self, side):
+        lead = self.score[side] - self.score[1 - side]
+        closer = self.teams[side]['closer']
+        if (self.inning >= self.innings and 1 <= lead <= 3 and closer is not None
+                and not self.closer_used[side] and self.pitchers[side][0] is not closer):
+            self.closer_used[side] = True
+            self._enter(side, closer, False)
+
+    def play(self, start_index):
+        self._enter(0, self.teams[0]['rotation'][start_index % len(self.teams[0]['rotation'])], True)
+        self._enter(1, self.teams[1]['rotation'][start_index % len(self.teams[1]['rotation'])], True)
+        while True:
+            self._half_inning(0)
+            if self.inning >= self.innings and self.score[1] > self.score[0]:
+                break
+            self._half_inning(1)
+            if self.inning >= self.innings and self.score[0] != self.score[1]:
+                break
+            if self.inning >= self.innings + EXTRA_INNINGS_CAP:
+                break
+            self.inning += 1
+
+        if self.lead:
+            winner = 1 if self.lead > 0 else 0
+            w, l = self.go_ahead
+            w[1]['c']['w'] += 1
+            l[1]['c']['l'] += 1
+            finisher = self.pitchers[winner]
+            if finisher[0] is not w[0] and abs(self.score[1] - self.score[0]) <= 3:
+                finisher[1]['c']['sv'] += 1
+        return self.rows
+
+    def _half_inning(self, batting):
+        fielding = 1 - batting
+        top = batting == 0
+        outs = 0
+        bases = [None, None, None]
+        self._maybe_close(fielding)
+        while outs < 3:
+            self._maybe_change(fielding, outs, bases)
+            lineup = self.lineups[batting]
+            batter = lineup[self.spots[batting]]
+
+            runner = bases[0]
+            if runner is not None and bases[1] is None and outs < 2:
+                runner_state = self.season['bat'][runner[0]['player_id']]
+                runner_state['c']['sb_opps'] += 1
+                if rng.random() < 0.07 * runner[0]['talent']['speed']:
+                    outs = self._steal(batting, outs, bases, runner_state)
+                    if outs >= 3:
+                        break
+
+            outs = self._plate_appearance(batting, outs, bases, batter)
+            self.spots[batting] = (self.spots[batting] + 1) % len(lineup)
+            if not top and self.inning >= self.innings and self.score[1] > self.score[0]:
+                break
+
+    def _record(self, batting, outs, mask, outs_after, mask_after, runs, batter_id, description, woba):
+        env = self.env
+        top = batting == 0
+        score = self.score
+        home_before, away_before = score[1], score[0]
+        before, li = _home_win_prob(env, self.innings, self.inning, top, outs, mask, home_before - away_before)
+        score[batting] += runs
+        diff = score[1] - score[0]
+        after, _ = _home_win_prob(env, self.innings, self.inning, top, outs_after, mask_after, diff)
+        wpa = after - before if batting == 1 else before - after
+        re_after = 0.0 if outs_after >= 3 else env['re'][outs_after][mask_after]
+        re24 = re_after - env['re'][outs][mask] + runs
+
+        lead = (diff > 0) - (diff < 0)
+        if lead != self.lead:
+            self.lead = lead
+            if lead:
+                winner = 1 if lead > 0 else 0
+                self.go_ahead = (self.pitchers[winner], self.pitchers[1 - winner])
+
+        self.play_id += 1
+        home, away = self.teams[1], self.teams[0]
+        self.rows.append((
+            self.contest_id, self.play_id, env['year'], env['division'], self.date,
+            home['team_name'], away['team_name'], home_before, away_before, self.inning, int(top),
+            description, round(before, 4), round(after, 4), round(wpa, 4), round(re24, 3),
+            batter_id, self.pitchers[1 - batting][0]['player_id'], round(li, 2), score[1], score[0], woba,
+        ))
+        return wpa, li, re24
+
+    def _steal(self, batting, outs, bases, runner_state):
+        runner = bases[0]
+        name = runner[0]['player_name']
+        mask = _mask(bases)
+        c = runner_state['c']
+        pitcher_state = self.pitchers[1 - batting][1]
+        if rng.random() < 0.74:
+            bases[0], bases[1] = None, runner
+            c['sb'] += 1
+            description = f"{name} stole second."
+            outs_after = outs
+        else:
+            bases[0] = None
+            c['cs'] += 1
+            outs_after = outs + 1
+            pitcher_state['c']['outs'] += 1
+            if rng.random() < 0.15:
+                c['picked'] += 1
+                description = f"{name} picked off, caught stealing."
+            else:
+                description = f"{name} caught stealing."
+        wpa, li, re24 = self._record(batting, outs, mask, outs_after, _mask(bases), 0,
+                                     runner[0]['player_id'], description, None)
+        c['wpa'] += wpa
+        c['wpa_li'] += wpa / li if li else 0.0
+        c['rea'] += re24
+        return outs_after
+
+    def _plate_appearance(self, batting, outs, bases, batter):
+        random_ = rng.random
+        env = self.env
+        fielding = 1 - batting
+        batter_player, bstate = batter
+        pitcher_player, pstate = self.pitchers[fielding]
+        bc, pc = bstate['c'], pstate['c']
+        if bstate['last_game'] != self.contest_id:
+            bstate['last_game'] = self.contest_id
+            bc['gp'] += 1
+            bc['gs'] += 1
+
+        hand = pitcher_player['throws']
+        side = batter_player['bats'] if batter_player['bats'] != 'S' else ('L' if hand == 'R' else 'R')
+        mask = _mask(bases)
+        me = (batter_player, pitcher_player, True)
+        if bases[0] is not None and bases[1] is None and outs < 2:
+            bc['gdp_opps'] += 1
+
+        # Choose the outcome
+        kind = None
+        if outs == 0 and mask in (1, 2, 3) and random_() < batter_player['bunt']:
+            kind = 'sac'
+        else:
+            x = random_()
+            acc = 0.0
+            brates = batter_player['rates'][hand]
+            prates = pitcher_player['rates']
+            park = self.park
+            for event in range(7):
+                acc += brates[event] * prates[event] * park[event]
+                if x < acc:
+                    kind = ('k', 'bb', 'hbp', '1b', '2b', '3b', 'hr')[event]
+                    break
+            else:
+                kind = 'out'
+
+        # Field side and trajectory for balls in play
+        traj = direction = field = None
+        if kind not in ('k', 'bb', 'hbp', 'sac'):
+            pull = batter_player['pull']
+            x = random_()
+            direction = 'pull' if x < pull else ('oppo' if x < pull + (1 - pull) * 0.42 else 'middle')
+            if direction == 'middle':
+                field = 'middle'
+            else:
+                field = 'left' if (direction == 'pull') == (side == 'R') else 'right'
+            x = random_()
+            if kind == 'hr':
+                traj = 'fb'
+            elif kind == '3b':
+                traj = 'ld' if x < 0.4 else 'fb'
+            elif kind == '2b':
+                traj = 'gb' if x < 0.12 else ('ld' if x < 0.6 else 'fb')
+            elif kind == '1b':
+                traj = 'gb' if x < 0.45 else ('ld' if x < 0.87 else 'fb')
+            else:
+                gb = batter_player['gb']
+                traj = 'gb' if x < gb else ('ld' if x < gb + 0.14 else ('pop' if x < gb + 0.25 else 'fb'))
+                if traj == 'gb':
+                    y = random_()
+                    if bases[0] is not None and outs < 2 and y < 0.22:
+                        kind = 'dp'
+                    elif y > 0.965:
+                        kind = 'roe'
+                elif traj == 'fb' and bases[2] is not None and outs < 2 and random_() < 0.55:
+                    kind = 'sf'
+
+        # Move the runners: (origin, runner, destination) with 3 = scored and -1 = out
+        b0, b1, b2 = bases
+        moves = []
+        batter_dest = None
+        outs_added = 0
+        earned = True
+        if kind == 'k':
+            outs_added = 1
+            main = 'struck out looking' if random_() < 0.3 else 'struck out swinging'
+            moves = [(i, r, i) for i, r in ((2, b2), (1, b1), (0, b0)) if r is not None]
+        elif kind in ('bb', 'hbp', 'roe'):
+            if kind == 'roe':
+                main = f"reached on error by {rng.choice(INFIELD[field])}"
+                earned = False
+            else:
+                main = 'walked' if kind == 'bb' else 'hit by pitch'
+            batter_dest = 0
+            forced = b0 is not None
+            if b2 is not None:
+                moves.append((2, b2, 3 if forced and b1 is not None else 2))
+            if b1 is not None:
+                moves.append((1, b1, 2 if forced else 1))
+            if b0 is not None:
+                moves.append((0, b0, 1))
+        elif kind == '1b':
+            main = rng.choice((GROUND_SINGLES if traj == 'gb' else AIR_SINGLES)[field])
+            batter_dest = 0
+            third_open = True
+            if b2 is not None:
+                moves.append((2, b2, 3))
+            if b1 is not None:
+                bc_runner = self.season['bat'][b1[0]['player_id']]['c']
+                bc_runner['ebt_opps'] += 1
+                if random_() < 0.55 * b1[0]['talent']['speed'] ** 0.5:
+                    if random_() < 0.07:
+                        moves.append((1, b1, -1))
+                        bc_runner['outs_ob'] += 1
+                    else:
+                        moves.append((1, b1, 3))
+                        bc_runner['ebt'] += 1
+                else:
+                    moves.append((1, b1, 2))
+                    third_open = False
+            if b0 is not None:
+                if third_open:
+                    bc_runner = self.season['bat'][b0[0]['player_id']]['c']
+                    bc_runner['ebt_opps'] += 1
+                    if random_() < 0.3 * b0[0]['talent']['speed'] ** 0.5:
+                        moves.append((0, b0, 2))
+                        bc_runner['ebt'] += 1
+                    else:
+                        moves.append((0, b0, 1))
+                else:
+                    moves.append((0, b0, 1))
+        elif kind == '2b':
+            main = rng.choice((GROUND_DOUBLES if traj == 'gb' else AIR_DOUBLES)[field])
+            batter_dest = 1
+            if b2 is not None:
+                moves.append((2, b2, 3))
+            if b1 is not None:
+                moves.append((1, b1, 3))
+            if b0 is not None:
+                bc_runner = self.season['bat'][b0[0]['player_id']]['c']
+                bc_runner['ebt_opps'] += 1
+                if random_() < 0.4 * b0[0]['talent']['speed'] ** 0.5:
+                    if random_() < 0.08:
+                        moves.append((0, b0, -1))
+                        bc_runner['outs_ob'] += 1
+                    else:
+                        moves.append((0, b0, 3))
+                        bc_runner['ebt'] += 1
+                else:
+                    moves.append((0, b0, 2))
+        elif kind in ('3b', 'hr'):
+            main = rng.choice((TRIPLES if kind == '3b' else HOMERS)[field])
+            batter_dest = 2 if kind == '3b' else 3
+            moves = [(i, r, 3) for i, r in ((2, b2), (1, b1), (0, b0)) if r is not None]
+        elif kind == 'dp':
+            main = rng.choice(DOUBLE_PLAYS[field])
+            outs_added = 2
+            if outs + 2 < 3:
+                if b2 is not None:
+                    moves.append((2, b2, 3 if random_() < 0.5 else 2))
+                if b1 is not None:
+                    moves.append((1, b1, 2 if b2 is None else 1))
+            moves.append((0, b0, -1))
+        elif kind == 'sf':
+            main = f"hit a sacrifice fly to {OUTFIELD[field]}"
+            outs_added = 1
+            moves.append((2, b2, 3))
+            if b1 is not None:
+                moves.append((1, b1, 2 if random_() < 0.3 else 1))
+            if b0 is not None:
+                moves.append((0, b0, 0))
+        elif kind == 'sac':
+            main = f"grounded out to {rng.choice(['p', '3b', '1b'])}, SAC, bunt"
+            outs_added = 1
+            moves = [(i, r, i + 1) for i, r in ((2, b2), (1, b1), (0, b0)) if r is not None]
+        else:
+            main = rng.choice(OUTS[traj][field])
+            outs_added = 1
+            advance = traj == 'gb' or traj == 'fb' and random_() < 0.3
+            if outs + 1 < 3 and advance:
+                if b2 is not None:
+                    moves.append((2, b2, 3 if traj == 'gb' and random_() < 0.45 else 2))
+                if b1 is not None:
+                    moves.append((1, b1, 2 if b2 is None or moves[-1][2] == 3 else 1))
+                if b0 is not None:
+                    moves.append((0, b0, 1 if b1 is None and traj == 'gb' else 0))
+            else:
+                moves = [(i, r, i) for i, r in ((2, b2), (1, b1), (0, b0)) if r is not None]
+
+        new = [None, None, None]
+        scored = []
+        tails = []
+        for origin, runner, dest in moves:
+            name = runner[0]['player_name']
+            if dest == 3:
+                scored.append(runner)
+                tails.append(f"{name} scored")
+            elif dest == -1:
+                outs_added += 1
+                tails.append(f"{name} out at {'home' if origin >= 1 else 'third'}")
+            else:
+                new[dest] = runner
+                if dest != origin:
+                    tails.append(f"{name} advanced to {BASE_NAMES[dest]}")
+        if batter_dest is not None:
+            if batter_dest == 3:
+                scored.append(me)
+            else:
+                new[batter_dest] = (batter_player, pitcher_player, earned)
+
+        outs_after = min(outs + outs_added, 3)
+        if outs_after >= 3:
+            new = [None, None, None]
+        runs = len(scored)
+        rbi = runs if kind not in ('dp', 'roe') else 0
+
+        count_text, pitches = _count(kind)
+        description = f"{batter_player['player_name']} {main}"
+        if rbi:
+            description += ', RBI' if rbi == 1 else f', {rbi} RBI'
+        description += f" ({count_text})"
+        if tails:
+            description += '; 3a ' + '; '.join(tails)
+        description += '.'
+
+        woba = env['woba'][kind]
+        wpa, li, re24 = self._record(batting, outs, mask, outs_after, _mask(new), runs,
+                                     batter_player['player_id'], description, woba)
+        bases[:] = new
+
+        # Runs: batter/runner scored, charged to the pitcher responsible for the runner
+        for runner in scored:
+            self.season['bat'][runner[0]['player_id']]['c']['r'] += 1
+            responsible = self.season['pit'][runner[1]['player_id']]['c']
+            responsible['r'] += 1
+            if runner[2] and earned:
+                responsible['er'] += 1
+            if runner[1] is not pitcher_player:
+                pc['inh_run_score'] += 1
+        self.runs_allowed[fielding] += runs
+        self.pitch_counts[fielding] += pitches
+
+        # Batter and pitcher lines
+        ab, h, tb, ob, obd = OUTCOMES[kind]
+        risp = mask & 6
+        leverage = 'high_leverage' if li >= HIGH_LEVERAGE else ('low_leverage' if li < LOW_LEVERAGE else None)
+        woba_value = woba or 0.0
+        bc['pa'] += 1
+        bc['ab'] += ab
+        bc['h'] += h
+        bc['tb'] += tb
+        bc['rbi'] += rbi
+        bc[kind] += 1
+        bc['woba_sum'] += woba_value
+        bc['woba_den'] += obd
+        bc['wpa'] += wpa
+        bc['wpa_li'] += wpa / li
+        bc['li'] += li
+        bc['rea'] += re24
+        pc['bf'] += 1
+        pc['outs'] += outs_after - outs
+        pc['pitches'] += pitches
+        pc['h'] += h
+        pc[kind] += 1
+        pc['pwpa'] -= wpa
+        pc['pwpa_li'] -= wpa / li
+        pc['li'] += li
+        pc['prea'] -= re24
+        pc['woba_sum'] += woba_value
+        pc['woba_den'] += obd
+        if traj is not None:
+            if traj == 'gb' and h == 0:
+                pc['go'] += 1
+            elif h == 0:
+                pc['fo'] += 1
+            if traj == 'fb':
+                pc['fb'] += 1
+
+        batter_lines = ('overall', 'vs_rhp' if hand == 'R' else 'vs_lhp', 'risp' if risp else None, leverage)
+        pitcher_lines = ('overall', 'vs_rhh' if side == 'R' else 'vs_lhh', 'risp' if risp else None, leverage)
+        for state, names, sign in ((bstate, batter_lines, 1), (pstate, pitcher_lines, -1)):
+            for name in names:
+                if name is None:
+                    continue
+                line = _line(state, name)
+                line[LINE_PA] += 1
+                line[LINE_AB] += ab
+                line[LINE_H] += h
+                line[LINE_TB] += tb
+                line[LINE_OB] += ob
+                line[LINE_OBD] += obd
+                line[LINE_WOBA] += woba_value
+                line[LINE_RE] += sign * re24
+
+        if traj is not None:
+            bip = bstate['bip']
+            bip[BIP_COUNT] += 1
+            bip[{'pull': BIP_PULL, 'oppo': BIP_OPPO, 'middle': BIP_MIDDLE}[direction]] += 1
+            bip[{'gb': BIP_GB, 'fb': BIP_FB, 'ld': BIP_LD, 'pop': BIP_POP}[traj]] += 1
+            if direction == 'pull' and traj in ('fb', 'ld'):
+                bip[BIP_PULL_AIR] += 1
+            if direction == 'oppo' and traj == 'gb':
+                bip[BIP_OPPO_GB] += 1
+
+        if woba is not None:
+            for key in (('batter', batter_player['player_id']), ('pitcher', pitcher_player['player_id'])):
+                values = self.rolling[key]
+                values.append(woba)
+                if len(values) > 4 * WINDOWS[-1]:
+                    del values[:-2 * WINDOWS[-1]]
+        return outs_after
+
+
+def _mask(bases):
+    return (bases[0] is not None) | ((bases[1] is not None) << 1) | ((bases[2] is not None) << 2)
+
+
+# -- Season tables ---------------------------------------------------------------------------------
+
+def _ratio(numerator, denominator, digits=3, scale=1.0):
+    return round(scale * numerator / denominator, digits) if denominator else None
+
+
+def _sum_counters(states):
+    total = defaultdict(float)
+    for state in states:
+        for key, value in state['c'].items():
+            total[key] += value
+    return total
+
+
+def _league(env, bat_states, pit_states, team_games):
+    """League totals and guts constants for a division-year."""
+    b = _sum_counters(bat_states)
+    p = _sum_counters(pit_states)
+    h = b['1b'] + b['2b'] + b['3b'] + b['hr']
+    runs = b['r']
+    ip = p['outs'] / 3
+    runs_out = runs / p['outs']
+    runs_per_inning = runs / ip
+    runs_cs = -(2 * runs_out + 0.075)
+    era = 9 * p['er'] / ip
+    weights = env['weights']
+    lg = {
+        'woba': b['woba_sum'] / b['woba_den'],
+        'woba_scale': env['woba_scale'],
+        'obp': (h + b['bb'] + b['hbp']) / (b['ab'] + b['bb'] + b['hbp'] + b['sf']),
+        'slg': b['tb'] / b['ab'],
+        'runs_pa': runs / b['pa'],
+        'runs_out': runs_out,
+        'runs_win': 9 * runs_per_inning * 1.5 + 3,
+        'runs_sb': RUNS_SB,
+        'runs_cs': runs_cs,
+        'cs_rate': b['cs'] / (b['sb'] + b['cs']) if b['sb'] + b['cs'] else 0.0,
+        'era': era,
+        'ra9': 9 * runs / ip,
+        'cfip': era - (13 * p['hr'] + 3 * (p['bb'] + p['hbp']) - 2 * p['k']) / ip,
+        'hr_fb': p['hr'] / p['fb'] if p['fb'] else 0.0,
+        'wsb_rate': (b['sb'] * RUNS_SB + b['cs'] * runs_cs) / b['sb_opps'] if b['sb_opps'] else 0.0,
+        'gdp_rate': b['dp'] / b['gdp_opps'] if b['gdp_opps'] else 0.0,
+        'wteb_rate': (EBT_RUNS * b['ebt'] + OOB_RUNS * b['outs_ob']) / b['ebt_opps'] if b['ebt_opps'] else 0.0,
+        'spot_pa': b['pa'] / (team_games * 9),
+    }
+    guts = {
+        'year': env['year'], 'division': env['division'],
+        'woba': round(lg['woba'], 3), 'woba_scale': round(lg['woba_scale'], 3),
+        'wbb': round(weights[0], 3), 'whbp': round(weights[1], 3), 'w1b': round(weights[2], 3),
+        'w2b': round(weights[3], 3), 'w3b': round(weights[4], 3), 'whr': round(weights[5], 3),
+        'runs_sb': RUNS_SB, 'runs_cs': round(runs_cs, 3), 'runs_out': round(runs_out, 3),
+        'runs_pa': round(lg['runs_pa'], 3), 'runs_win': round(lg['runs_win'], 3),
+        'cs_rate': round(lg['cs_rate'], 3), 'cfip': round(lg['cfip'], 3),
+    }
+    return lg, guts
+
+
+def _batting_row(c, lg, pf):
+    pa = c['pa']
+    h = c['1b'] + c['2b'] + c['3b'] + c['hr']
+    obd = c['ab'] + c['bb'] + c['hbp'] + c['sf']
+    woba = c['woba_sum'] / c['woba_den'] if c['woba_den'] else lg['woba']
+    wraa = (woba - lg['woba']) / lg['woba_scale'] * c['woba_den']
+    batting = wraa + (1 - pf / 100) * lg['runs_pa'] * pa / 2
+    ba = h / c['ab'] if c['ab'] else 0.0
+    obp = (h + c['bb'] + c['hbp']) / obd if obd else 0.0
+    slg = c['tb'] / c['ab'] if c['ab'] else 0.0
+    wsb = c['sb'] * lg['runs_sb'] + c['cs'] * lg['runs_cs'] - lg['wsb_rate'] * c['sb_opps']
+    wgdp = (lg['gdp_rate'] * c['gdp_opps'] - c['dp']) * GDP_RUNS
+    wteb = EBT_RUNS * c['ebt'] + OOB_RUNS * c['outs_ob'] - lg['wteb_rate'] * c['ebt_opps']
+    avg_li = c['li'] / pa if pa else 0.0
+    return {
+        'gp': int(c['gp']), 'gs': int(c['gs']), 'pa': int(pa), 'ab': int(c['ab']), 'h': int(h),
+        '2b': int(c['2b']), '3b': int(c['3b']), 'hr': int(c['hr']), 'r': int(c['r']), 'rbi': int(c['rbi']),
+        'bb': int(c['bb']), 'hbp': int(c['hbp']), 'k': int(c['k']), 'sf': int(c['sf']), 'sac': int(c['sac']),
+        'sb': int(c['sb']), 'cs': int(c['cs']), 'picked': int(c['picked']), 'gdp': int(c['dp']),
+        'gdp_opps': int(c['gdp_opps']),
+        'ba': round(ba, 3), 'ob_pct': round(obp, 3), 'slg_pct': round(slg, 3), 'iso': round(slg - ba, 3),
+        'woba': round(woba, 3),
+        'wrc': round(wraa + lg['runs_pa'] * pa, 1),
+        'wrc_plus': round(100 * (batting / pa + lg['runs_pa']) / lg['runs_pa']) if pa else None,
+        'ops_plus': round(100 * (obp / lg['obp'] + slg / lg['slg'] - 1)),
+        'r_div_pa': _ratio(c['r'], pa),
+        'k_pct': _ratio(c['k'], pa, 1, 100), 'bb_pct': _ratio(c['bb'], pa, 1, 100),
+        'sb_pct': _ratio(c['sb'], c['sb'] + c['cs'], 1, 100),
+        'batting': round(batting, 2), 'baserunning': round(wsb + wgdp + wteb, 2),
+        'wpa': round(c['wpa'], 3), 'wpa_li': round(c['wpa_li'], 3), 'rea': round(c['rea'], 2),
+        'clutch': round(c['wpa'] / avg_li - c['wpa_li'], 3) if avg_li else None,
+        'wsb': round(wsb, 2), 'wgdp': round(wgdp, 2), 'wteb': round(wteb, 2),
+        'ebt': int(c['ebt']), 'outs_ob': int(c['outs_ob']),
+    }
+
+
+def _pitching_row(c, lg):
+    outs = c['outs']
+    ip = outs / 3
+    bf = c['bf']
+    hr = c['hr']
+    fip = (13 * hr + 3 * (c['bb'] + c['hbp']) - 2 * c['k']) / ip + lg['cfip'] if ip else None
+    xfip = (13 * c['fb'] * lg['hr_fb'] + 3 * (c['bb'] + c['hbp']) - 2 * c['k']) / ip + lg['cfip'] if ip else None
+    era = 9 * c['er'] / ip if ip else None
+    avg_li = c['li'] / bf if bf else 0.0
+    war = None
+    if fip is not None:
+        fip_r9 = fip + lg['ra9'] - lg['era']
+        war = ((lg['ra9'] - fip_r9) / 9 * ip + REPLACEMENT_RUNS_PER_IP * ip) / lg['runs_win']
+    return {
+        'app': int(c['app']), 'gs': int(c['gs']), 'w': int(c['w']), 'l': int(c['l']), 'sv': int(c['sv']),
+        'ip': outs // 3 + (outs % 3) / 10, 'bf': int(bf), 'pitches': int(c['pitches']), 'h': int(c['h']),
+        '2b_a': int(c['2b']), '3b_a': int(c['3b']), 'hr_a': int(hr), 'r': int(c['r']), 'er': int(c['er']),
+        'bb': int(c['bb']), 'hbp': int(c['hbp']), 'so': int(c['k']), 'go': int(c['go']), 'fo': int(c['fo']),
+        'inh_run': int(c['inh_run']), 'inh_run_score': int(c['inh_run_score']),
+        'ir_a_pct': _ratio(c['inh_run_score'], c['inh_run'], 1, 100),
+        'era': round(era, 2) if era is not None else None,
+        'era+': round(100 * lg['era'] / era) if era else None,
+        'fip': round(fip, 2) if fip is not None else None,
+        'xfip': round(xfip, 2) if xfip is not None else None,
+        'ra9': _ratio(c['r'], ip, 2, 9), 'h9': _ratio(c['h'], ip, 2, 9), 'bb9': _ratio(c['bb'], ip, 2, 9),
+        'k9': _ratio(c['k'], ip, 2, 9), 'hr9': _ratio(hr, ip, 2, 9),
+        'k_pct': _ratio(c['k'], bf, 1, 100), 'bb_pct': _ratio(c['bb'], bf, 1, 100),
+        'k_minus_bb_pct': _ratio(c['k'] - c['bb'], bf, 1, 100),
+        'hr_div_fb': _ratio(hr, c['fb'], 1, 100),
+        'gmli': _ratio(c['relief_li'], c['relief_apps'], 2),
+        'war': round(war, 2) if war is not None else None,
+        'pwpa': round(c['pwpa'], 3), 'pwpa_li': round(c['pwpa_li'], 3), 'prea': round(c['prea'], 2),
+        'clutch': round(c['pwpa'] / avg_li - c['pwpa_li'], 3) if avg_li else None,
+    }
+
+
+def _line_stats(line, prefix, suffix):
+    if line is None:
+        return {f'{prefix}{stat}{suffix}': (0 if stat == 'pa' else None) for stat in ('pa', 'ba', 'ob_pct', 'slg_pct', 'woba', 're24')}
+    return {
+        f'pa{suffix}': int(line[LINE_PA]),
+        f'ba{suffix}': _ratio(line[LINE_H], line[LINE_AB]),
+        f'ob_pct{suffix}': _ratio(line[LINE_OB], line[LINE_OBD]),
+        f'slg_pct{suffix}': _ratio(line[LINE_TB], line[LINE_AB]),
+        f'woba{suffix}': _ratio(line[LINE_WOBA], line[LINE_OBD]),
+        f're24{suffix}': round(line[LINE_RE], 2),
+    }
+
+
+def _season_tables(env, season, teams, lg):
+    """Rows for every per-season table from the simulated division-year."""
+    tables = defaultdict(list)
+    year = env['year']
+    by_team = defaultdict(lambda: {'bat': [], 'pit': []})
+
+    for state in season['bat'].values():
+        if not state['c']['pa']:
+            continue
+        player, team = state['player'], state['team']
+        keys = {'player_id': player['player_id'], 'player_name': player['player_name'],
+                'team_name': team['team_name'], 'conference': team['conference'],
+                'division': env['division'], 'year': year}
+        row = _batting_row(state['c'], lg, team['park']['pf'])
+        pa = state['c']['pa']
+        row['adjustment'] = round(POSITION_RUNS.get(player['position'], 0.0) * pa / lg['spot_pa'] / 48, 2)
+        war = (row['batting'] + row['baserunning'] + row['adjustment'] + REPLACEMENT_RUNS_PER_PA * pa) / lg['runs_win']
+        row['war'] = round(war, 2)
+        row['sos_adj_war'] = round(war * team['sos'], 2)
+        tables['batting'].append({**keys, 'class': player['class'], 'bats': player['bats'],
+                                  'throws': player['throws'], **row})
+        by_team[team['org_id']]['bat'].append((state, row))
+
+        tables['baserunning'].append({**keys, **{k: row[k] for k in ('baserunning', 'wsb', 'wgdp', 'wteb', 'picked',
+                                                                     'sb', 'cs', 'sb_pct', 'outs_ob', 'ebt')},
+                                      'opportunities': int(state['c']['sb_opps'])})
+
+        situational = {**keys, 'clutch': row['clutch']}
+        for name in SITUATIONS:
+            stats = _line_stats(state['lines'].get(name), '', f'_{name}')
+            situational.update({k: v for k, v in stats.items() if k.split('_')[0] in ('pa', 'ba', 'woba', 're24')})
+        tables['situational_batting'].append(situational)
+
+        splits = dict(keys)
+        for name in SPLITS['splits_batting']:
+            splits.update(_line_stats(state['lines'].get(name), '', f'_{name}'))
+        tables['splits_batting'].append(splits)
+
+        bip = state['bip']
+        if bip[BIP_COUNT]:
+            count = bip[BIP_COUNT]
+            tables['batted_ball'].append({
+                **keys, 'count': count, 'batter_hand': player['bats'],
+                'pull_pct': _ratio(bip[BIP_PULL], count, 1, 100), 'oppo_pct': _ratio(bip[BIP_OPPO], count, 1, 100),
+                'middle_pct': _ratio(bip[BIP_MIDDLE], count, 1, 100), 'gb_pct': _ratio(bip[BIP_GB], count, 1, 100),
+                'fb_pct': _ratio(bip[BIP_FB], count, 1, 100), 'ld_pct': _ratio(bip[BIP_LD], count, 1, 100),
+                'pop_pct': _ratio(bip[BIP_POP], count, 1, 100),
+                'pull_air_pct': _ratio(bip[BIP_PULL_AIR], count, 1, 100),
+                'oppo_gb_pct': _ratio(bip[BIP_OPPO_GB], count, 1, 100),
+            })
+
+    for state in season['pit'].values():
+        if not state['c']['bf']:
+            continue
+        player, team = state['player'], state['team']
+        keys = {'player_id': player['player_id'], 'player_name': player['player_name'],
+                'team_name': team['team_name'], 'conference': team['conference'],
+                'division': env['division'], 'year': year}
+        row = _pitching_row(state['c'], lg)
+        row['sos_adj_war'] = round(row['war'] * team['sos'], 2) if row['war'] is not None else None
+        tables['pitching'].append({**keys, 'class': player['class'], 'throws': player['throws'], **row})
+        by_team[team['org_id']]['pit'].append((state, row))
+
+        situational = {**keys, 'clutch': row['clutch']}
+        for name in SITUATIONS:
+            stats = _line_stats(state['lines'].get(name), '', f'_{name}')
+            situational.update({k: v for k, v in stats.items() if k.split('_')[0] in ('pa', 'ba', 'woba', 're24')})
+        tables['situational_pitching'].append(situational)
+
+        splits = dict(keys)
+        for name in SPLITS['splits_pitching']:
+            splits.update(_line_stats(state['lines'].get(name), '', f'_{name}'))
+        tables['splits_pitching'].append(splits)
+
+    for team in teams:
+        keys = {'team_name': team['team_name'], 'conference': team['conference'],
+                'division': env['division'], 'year': year}
+        games = season['records'][team['org_id']]
+        hitters = by_team[team['org_id']]['bat']
+        if hitters:
+            row = _batting_row(_sum_counters(state for state, _ in hitters), lg, team['park']['pf'])
+            row.update({key: round(sum(r[key] for _, r in hitters), 2) for key in BATTING_SUMMED})
+            row['gp'] = row['gs'] = sum(games)
+            tables['batting_team'].append({**keys, **row})
+        pitchers = by_team[team['org_id']]['pit']
+        if pitchers:
+            row = _pitching_row(_sum_counters(state for state, _ in pitchers), lg)
+            row.update({key: round(sum(r[key] or 0 for _, r in pitchers), 2) for key in PITCHING_SUMMED})
+            tables['pitching_team'].append({**keys, **row})
+    return tables
+
+
+def _rolling_rows(rolling, player_type):
+    rows = []
+    for (kind, player_id), values in rolling.items():
+        if kind != player_type or len(values) < 2 * WINDOWS[0]:
+            continue
+        row = [player_id]
+        for window in WINDOWS:
+            if len(values) >= 2 * window:
+                now = sum(values[-window:]) / window
+                then = sum(values[-2 * window:-window]) / window
+                row += [round(now, 3), round(then, 3), round(now - then, 3)]
+            else:
+                row += [None, None, None]
+        rows.append(tuple(row))
+    return rows
+
+
+# -- Driver ----------------------------------------------------------------------------------------
+
+def generate(conn, divisions, years, scale):
+    """Simulate every division-year into conn. Returns {table: rows written}."""
+    _create_tables(conn)
+    league = _build_league(divisions, scale)
+    rolling = defaultdict(lambda: array('f'))
+    contest_id = 5000000
+    team_id = 550000
+    for year in years:
+        for division in divisions:
+            start = time.perf_counter()
+            teams = league[division]
+            env = _environment(division, year)
+            _advance_rosters(teams, year)
+            for team in teams:
+                _season_rates(team, env)
+                _insert(conn, 'rosters', _roster_rows(team, year))
+                team_id += 1
+                team['team_id'] = team_id
+            _insert(conn, 'expected_runs', _expected_runs_rows(env))
+
+            season = {'bat': {}, 'pit': {}, 'records': {team['org_id']: [0, 0, 0] for team in teams}}
+            pbp_rows = []
+            schedule_rows = []
+            plays = 0
+            games = _schedule(teams, year)
+            for game_date, home, away, neutral, innings in games:
+                contest_id += 1
+                # Weekend games go to starters 1-3, midweek games to the fourth
+                start_index = 3 if game_date.weekday() < 4 else game_date.weekday() - 4
+                game = _Game(contest_id, env, season, game_date, home, away, neutral, innings, rolling)
+                pbp_rows.extend(game.play(start_index))
+                away_score, home_score = game.score
+                for team, score, other in ((home, home_score, away_score), (away, away_score, home_score)):
+                    record = season['records'][team['org_id']]
+                    record[0 if score > other else (1 if score < other else 2)] += 1
+                attendance = None if rng.random() < 0.1 else \
+                    int(rng.lognormvariate(math.log({1: 900, 2: 350, 3: 150}[division]), 0.6))
+                schedule_rows.append((contest_id, year, division, game.date, home['team_name'], home['team_id'],
+                                      away['team_name'], away['team_id'], home_score, away_score,
+                                      game.inning, attendance, neutral))
+                if len(pbp_rows) >= PBP_BATCH_SIZE:
+                    plays += len(pbp_rows)
+                    _insert(conn, 'pbp', pbp_rows)
+                    pbp_rows = []
+            plays += len(pbp_rows)
+            _insert(conn, 'pbp', pbp_rows)
+            _insert(conn, 'schedules', schedule_rows)
+
+            lg, guts = _league(env, season['bat'].values(), season['pit'].values(), len(games) * 2)
+            _insert(conn, 'guts_constants', [guts])
+            for table, rows in _season_tables(env, season, teams, lg).items():
+                _insert(conn, table, rows)
+            _insert(conn, 'team_history', [{
+                'org_id': team['org_id'], 'team_id': team['team_id'], 'division': str(division), 'season': year,
+                'team_name': team['team_name'], 'conference': team['conference'],
+                'wins': season['records'][team['org_id']][0], 'losses': season['records'][team['org_id']][1],
+                'ties': season['records'][team['org_id']][2],
+            } for team in teams])
+            conn.commit()
+            logger.info(f"Simulated {year} D{division}: {len(teams)} teams, {len(games)} games, "
+                        f"{plays} plays in {time.perf_counter() - start:.1f}s")
+
+    for division, teams in league.items():
+        _insert(conn, 'team_information', teams)
+        _insert(conn, 'park_factors', [{
+            'team_name': team['team_name'], 'division': division, 'reg_factor': team['reg_factor'],
+            **{key: round(value, 1) for key, value in team['park'].items()},
+        } for team in teams])
+    _insert(conn, 'rolling_batting', _rolling_rows(rolling, 'batter'))
+    _insert(conn, 'rolling_pitching', _rolling_rows(rolling, 'pitcher'))
+    conn.commit()
+
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in SCHEMA}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic ncaa.db for local benchmarks")
+    parser.add_argument("--db", default="synthetic.db", help="Output path (default: synthetic.db)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Teams per division relative to a real season, e.g. 1, 5 or 20 (default: 1)")
+    parser.add_argument("--years", nargs="+", type=int, default=[MAX_YEAR - 1, MAX_YEAR])
+    parser.add_argument("--divisions", nargs="+", type=int, choices=[1, 2, 3], default=[1, 2, 3])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--migrate", action="store_true",
+                        help="Apply schema migrations (indexes, derived tables, ANALYZE) afterwards")
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing --db")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if os.path.exists(args.db):
+        if not args.force:
+            parser.error(f"{args.db} already exists; pass --force to overwrite it")
+        os.remove(args.db)
+
+    rng.seed(args.seed)
+    start = time.perf_counter()
+    conn = sqlite3.connect(args.db)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        counts = generate(conn, sorted(args.divisions), sorted(args.years), args.scale)
+        if args.migrate:
+            migrate(conn)
+    finally:
+        conn.close()
+
+    for table, count in counts.items():
+        print(f"{table:<24} {count:>10}")
+    print(f"Generated {args.db} in {time.perf_counter() - start:.1f}s")
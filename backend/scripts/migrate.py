@@ -0,0 +1,42 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH
+from migrations import LATEST_VERSION, migrate, schema_problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply schema migrations (indexes, derived tables, ANALYZE) to ncaa.db")
+    parser.add_argument("--db", default=DB_PATH, help=f"Path to the SQLite database (default: {DB_PATH})")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report what is missing; exit 1 if the database isn't fully migrated")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not args.check:
+        start = time.perf_counter()
+        conn = sqlite3.connect(args.db)
+        try:
+            applied = migrate(conn)
+        finally:
+            conn.close()
+        if applied:
+            print(f"Applied {', '.join(applied)} in {time.perf_counter() - start:.1f}s")
+        else:
+            print(f"Already at schema version {LATEST_VERSION}")
+
+    problems = schema_problems(args.db)
+    for problem in problems:
+        print(f"Schema problem: {problem}")
+    if problems:
+        sys.exit(1)
+    if args.check:
+        print(f"Schema version {LATEST_VERSION}, all expected indexes and derived tables present")
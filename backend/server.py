@@ -11,21 +11,29 @@ load_dotenv()
 
 ENV = os.getenv('FLASK_ENV', 'production')
 IS_DEV = ENV == 'development'
+# Refuse to start on a database that scripts/migrate.py hasn't fully migrated
+STRICT_SCHEMA = os.getenv('STRICT_SCHEMA', '0') == '1'
 
 from routes.batting import bp as batting_bp
 from routes.pitching import bp as pitching_bp
 from routes.conferences import bp as conferences_bp
 from routes.logo import bp as logo_bp
-from routes.leaderboards import bp as leaderboards_bp
+from routes.leaderboards import bp as leaderboards_bp, player_bp as player_leaderboards_bp
 from routes.uploads import bp as uploads_bp
 from routes.team_data import bp as team_data_bp
 from routes.player_data import bp as player_data_bp
 from routes.guts import bp as guts_bp
 from routes.games import bp as games_bp
 from routes.api_keys import bp as api_keys_bp
+from routes.exports import bp as exports_bp
+from routes.batch import bp as batch_bp
+from json_provider import FastJSONProvider
+from config import DB_PATH
+from migrations import schema_problems
 
 
 app = Flask(__name__, static_folder='../frontend/build/', static_url_path='/')
+app.json = FastJSONProvider(app)
 
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max upload
 
@@ -123,17 +131,26 @@ CORS(app, resources={
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+schema_issues = schema_problems(DB_PATH)
+for issue in schema_issues:
+    logger.warning(f"{DB_PATH}: {issue} (run scripts/migrate.py)")
+if schema_issues and STRICT_SCHEMA:
+    raise RuntimeError(f"{DB_PATH} is not fully migrated: {'; '.join(schema_issues)}")
+
 app.register_blueprint(batting_bp)
 app.register_blueprint(pitching_bp)
 app.register_blueprint(conferences_bp)
 app.register_blueprint(logo_bp)
 app.register_blueprint(leaderboards_bp)
+app.register_blueprint(player_leaderboards_bp)
 app.register_blueprint(uploads_bp)
 app.register_blueprint(team_data_bp)
 app.register_blueprint(player_data_bp)
 app.register_blueprint(guts_bp)
 app.register_blueprint(games_bp)
 app.register_blueprint(api_keys_bp)
+app.register_blueprint(exports_bp)
+app.register_blueprint(batch_bp)
 
 @app.get("/api/health")
 def api_health():
@@ -0,0 +1,33 @@
+"""
+In-memory team/org dimension, loaded once per data version.
+
+Maps org_id to its team_information row, so routes resolve logo slugs and
+colors with dict lookups instead of a query per request.
+"""
+from db import get_db_connection, cached_per_data_version
+
+
+@cached_per_data_version
+def _dimension():
+    conn = get_db_connection()
+    try:
+        orgs = {}
+        for row in conn.execute("SELECT org_id, ncaa_slug, colors_hex, conference FROM team_information"):
+            orgs.setdefault(row['org_id'], dict(row))
+        return orgs
+    finally:
+        conn.close()
+
+
+def org_info(org_id):
+    """{org_id, ncaa_slug, colors_hex, conference} for an org, or None."""
+    return _dimension().get(org_id)
+
+
+def parse_colors(colors_hex):
+    """{'primary', 'secondary'} from a team_information colors_hex string."""
+    parts = [c.strip() for c in (colors_hex or '').split(';') if c.strip()]
+    return {
+        'primary': parts[0] if len(parts) > 0 else None,
+        'secondary': parts[1] if len(parts) > 1 else None,
+    }